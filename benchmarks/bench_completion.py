@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Compare completing tags with `wallabag tags`, used before by the zsh
+completion, and with the completion cache (`wallabag _complete tags`).
+
+    PYTHONPATH=src python benchmarks/bench_completion.py [CALLS]
+
+`tags` asks a local mock server. The cache is filled once from the
+mock server, which is then stopped: the completion answers without it.
+A bare interpreter start is reported as the floor.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_daemon import write_config
+from mock_server import MockWallabag, make_entry
+
+CLIENT_CODE = "from wallabag.client import main; main()"
+
+
+def measure(name, args, env, calls):
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        result = subprocess.run(
+                [sys.executable] + args, env=env, capture_output=True,
+                text=True, check=True)
+        times.append(time.perf_counter() - start)
+    print(f'{name:<16} median={statistics.median(times) * 1000:.1f} ms '
+          f'min={min(times) * 1000:.1f} ms')
+    return statistics.median(times), result.stdout
+
+
+def main(calls):
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, XDG_CACHE_HOME=directory,
+                   XDG_RUNTIME_DIR=directory, WALLABAG_NO_DAEMON='1')
+        complete = ['-c', CLIENT_CODE, '--config',
+                    os.path.join(directory, 'config.ini'), '_complete', 'tags']
+        with MockWallabag([make_entry(i) for i in range(1, 101)]) as mock:
+            config = write_config(directory, mock.url)
+            before, _ = measure(
+                    'tags (server)', ['-c', CLIENT_CODE, '--config', config,
+                                      '--no-spinner', 'tags'], env, calls)
+            subprocess.run([sys.executable] + complete, env=env)
+            path = os.path.join(directory, 'wallabag-cli')
+            while not any(name.startswith('completion-')
+                          and not name.endswith('.lock')
+                          for name in os.listdir(path)):
+                time.sleep(0.05)
+
+        print(f'calls: {calls}')
+        measure('python', ['-c', 'pass'], env, calls)
+        after, output = measure('complete (cache)', complete, env, calls)
+        assert output == 'tag\n', output
+        print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
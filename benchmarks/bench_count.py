@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Compare `list --count` implementations against a local mock server.
+
+    PYTHONPATH=src python benchmarks/bench_count.py [ENTRIES]
+"""
+
+import sys
+import time
+
+from mock_server import MockWallabag, make_entry
+
+from wallabag.api.get_list_entries import GetListEntries, Params
+from wallabag.commands.list import CountCommand, ListParams
+from wallabag.entry import Entry
+
+
+def count_full_list(config):
+    response = GetListEntries(config, {
+        Params.COUNT: sys.maxsize
+    }).request().response
+    return sum(1 for _ in Entry.create_list(
+            response['_embedded']['items']))
+
+
+def count_server_side(config):
+    return CountCommand(config, ListParams()).execute()[1]
+
+
+def count_untagged(config):
+    return CountCommand(config, ListParams(untagged=True)).execute()[1]
+
+
+def measure(mock, name, func):
+    mock.reset_stats()
+    start = time.perf_counter()
+    result = func(mock.config())
+    elapsed = time.perf_counter() - start
+    print(f'{name:<22} count={result:<8} requests={mock.requests:<5} '
+          f'bytes={mock.bytes_sent:<12} time={elapsed * 1000:.1f} ms')
+
+
+def main(size):
+    entries = [make_entry(i) for i in range(1, size + 1)]
+    with MockWallabag(entries) as mock:
+        measure(mock, 'full list (before)', count_full_list)
+        measure(mock, 'total field', count_server_side)
+        measure(mock, 'streaming untagged', count_untagged)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40000)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Compare a script calling `wallabag read ID` in a loop with and without
+a running `wallabag daemon`.
+
+    PYTHONPATH=src python benchmarks/bench_daemon.py [CALLS]
+
+Every call is a new `wallabag` process talking to a local mock server,
+so the times are the client side cost: interpreter start, imports,
+config and token loading, connections. A bare interpreter start is
+reported as the floor.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_server import MockWallabag, make_entry
+
+CLIENT_CODE = "from wallabag.client import main; main()"
+DAEMON_CODE = "from wallabag.wallabag import cli; cli(['daemon'])"
+
+
+def write_config(directory, url):
+    path = os.path.join(directory, 'config.ini')
+    with open(path, 'w') as file:
+        file.write(f"[api]\nserverurl = {url}\nusername = user\n"
+                   "password = pass\n[oauth2]\nclient = 1\nsecret = 1\n")
+    with open(os.path.join(directory, 'config.token'), 'w') as file:
+        json.dump({"access_token": "token", "expires": 99999999999}, file)
+    return path
+
+
+def measure(name, args, env, calls):
+    times = []
+    for entry_id in range(1, calls + 1):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args(entry_id), env=env,
+                       check=True, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    print(f'{name:<16} median={statistics.median(times) * 1000:.1f} ms '
+          f'min={min(times) * 1000:.1f} ms')
+    return statistics.median(times)
+
+
+def main(calls):
+    with MockWallabag([make_entry(i) for i in range(1, calls + 1)]) as mock, \
+            tempfile.TemporaryDirectory() as directory:
+        config = write_config(directory, mock.url)
+        env = dict(os.environ, XDG_RUNTIME_DIR=directory)
+
+        def read(entry_id):
+            return ['-c', CLIENT_CODE, '--config', config,
+                    'read', str(entry_id), '-q']
+
+        print(f'calls: {calls}')
+        measure('python', lambda entry_id: ['-c', 'pass'], env, calls)
+        before = measure(
+                'read (process)', read,
+                dict(env, WALLABAG_NO_DAEMON='1'), calls)
+
+        daemon = subprocess.Popen([sys.executable, '-c', DAEMON_CODE],
+                                  env=env)
+        socket = os.path.join(directory, 'wallabag-cli', 'daemon.sock')
+        while not os.path.exists(socket):
+            time.sleep(0.01)
+        try:
+            after = measure('read (daemon)', read, env, calls)
+        finally:
+            subprocess.run([sys.executable, '-c', CLIENT_CODE, 'daemon',
+                            '--stop'], env=env)
+            daemon.wait()
+        print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Compare creating entries with the previous eager Entry, which parsed the
+title and the creation date of every item up front.
+
+    PYTHONPATH=src python benchmarks/bench_entry.py [COUNT]
+
+`create` only builds the entries, `list` also reads what the `list`
+command shows (ID, title, read and starred status, tags, annotations).
+Memory is the size of the entry objects, the items not included. The
+previous Entry parsed dates with delorean, which has to be installed.
+"""
+
+import datetime
+import sys
+import time
+import tracemalloc
+
+from wallabag.entry import Entry
+
+
+class LegacyEntry:
+    entry_id = 0
+    title = ""
+    content = ""
+    url = ""
+    read = False
+    starred = False
+    created_at = None
+    updated_at = None
+    reading_time = None
+    preview_picture = None
+    published_by = []
+    tags = []
+    annotations = []
+
+    def __init__(self, item):
+        self.entry_id = item['id']
+
+        title = item['title']
+        title = title.replace("\n", "")
+        title = " ".join(title.split())
+        self.title = title
+
+        self.content = item['content']
+        self.url = item['url']
+        self.read = item['is_archived'] == 1
+        self.starred = item['is_starred'] == 1
+        if 'created_at' in item:
+            import delorean
+
+            try:
+                self.created_at = datetime.datetime.fromisoformat(
+                        item['created_at'])
+                self.created_at = delorean.Delorean(datetime=self.created_at)
+            except ValueError:
+                self.created_at = delorean.parse(item['created_at'])
+        if 'updated_at' in item:
+            self.updated_at = item['updated_at']
+        if 'reading_time' in item:
+            self.reading_time = item['reading_time']
+        if 'preview_picture' in item:
+            self.preview_picture = item['preview_picture']
+        if 'published_by' in item:
+            self.published_by = item['published_by']
+        if 'tags' in item:
+            self.tags = item['tags']
+        if 'annotations' in item:
+            self.annotations = item['annotations']
+
+
+def make_items(count):
+    return [{
+        "id": entry_id, "title": f"Entry\n number   {entry_id}",
+        "content": "<p>content</p>", "url": f"https://site/{entry_id}",
+        "is_archived": entry_id % 2, "is_starred": entry_id % 3 == 0,
+        "created_at": "2020-11-11T05:02:11+0000",
+        "updated_at": "2020-11-12T05:02:11+0000",
+        "reading_time": 3, "preview_picture": None, "published_by": [],
+        "tags": [], "annotations": []} for entry_id in range(count)]
+
+
+def create(cls, items):
+    return [cls(item) for item in items]
+
+
+def list_fields(cls, items):
+    return [(entry.entry_id, entry.title, entry.read, entry.starred,
+             bool(entry.tags), bool(entry.annotations))
+            for entry in map(cls, items)]
+
+
+def measure(name, function, cls, items, runs=3):
+    elapsed = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(cls, items)
+        run_time = time.perf_counter() - start
+        elapsed = run_time if elapsed is None else min(elapsed, run_time)
+
+    tracemalloc.start()
+    entries = create(cls, items)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entries
+    print(f'{name:<16} time={elapsed * 1000:.1f} ms '
+          f'memory={size / 1024 / 1024:.1f} MB')
+    return elapsed
+
+
+def main(count):
+    items = make_items(count)
+    import delorean  # noqa: F401, imported once, outside the measurement
+
+    print(f'entries: {count}')
+    for name, function in (('create', create), ('list', list_fields)):
+        before = measure(f'{name} (before)', function, LegacyEntry, items)
+        after = measure(f'{name} (after)', function, Entry, items)
+        print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the CLI startup cost and fail when it regresses.
+
+    PYTHONPATH=src python benchmarks/bench_import.py [THRESHOLD_MS]
+
+The import of `wallabag.wallabag` is measured with `python -X importtime`,
+the wall time of `wallabag --version` is reported next to a bare
+interpreter start. The script exits with status 1 if the import takes
+longer than THRESHOLD_MS (default 100) or pulls in one of the heavy
+modules which are expected to be loaded only by the commands using them.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 7
+THRESHOLD_MS = 100
+
+HEAVY_MODULES = (
+        'bs4', 'click_repl', 'Crypto', 'delorean', 'humanize', 'lxml',
+        'markdownify', 'packaging', 'prompt_toolkit', 'requests',
+        'tabulate', 'urllib3', 'yaspin')
+
+VERSION_CODE = "from wallabag.wallabag import cli; cli(['--version'])"
+MODULES_CODE = ("import sys, wallabag.wallabag; "
+                "print(' '.join(sorted(sys.modules)))")
+
+
+def run(args, check=True):
+    return subprocess.run(
+            [sys.executable] + args, env=os.environ,
+            capture_output=True, text=True, check=check)
+
+
+def import_time():
+    result = run(['-X', 'importtime', '-c', 'import wallabag.wallabag'])
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == 'wallabag.wallabag':
+            return int(fields[1]) / 1000
+    raise RuntimeError('wallabag.wallabag not found in importtime output')
+
+
+def wall_time(code):
+    start = time.perf_counter()
+    # --version fails without installed package metadata, the time of
+    # getting there is still representative
+    run(['-c', code], check=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def heavy_modules():
+    loaded = run(['-c', MODULES_CODE]).stdout.split()
+    return sorted({
+        name.split('.')[0] for name in loaded
+        if name.split('.')[0] in HEAVY_MODULES})
+
+
+def main(threshold):
+    imports = statistics.median(import_time() for _ in range(RUNS))
+    version = statistics.median(wall_time(VERSION_CODE) for _ in range(RUNS))
+    python = statistics.median(wall_time('pass') for _ in range(RUNS))
+    heavy = heavy_modules()
+
+    print(f'import wallabag.wallabag   {imports:.1f} ms '
+          f'(threshold {threshold} ms)')
+    print(f'wallabag --version         {version:.1f} ms')
+    print(f'python -c pass             {python:.1f} ms')
+    print(f'heavy modules on startup   {", ".join(heavy) or "none"}')
+
+    if imports > threshold or heavy:
+        print('startup time regression')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else THRESHOLD_MS))
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the terminal renderer of `show` with the previous BeautifulSoup
+based implementation on a long-read article.
+
+    PYTHONPATH=src python benchmarks/bench_render.py [SIZE_KB] [ANNOTATIONS]
+"""
+
+import random
+import sys
+import time
+
+from colorama import Back, Fore
+
+from wallabag.commands.show import ShowCommandParams
+from wallabag.entry import Entry
+from wallabag.export.export import Export
+from wallabag.export.export_cli import ExportCli
+
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do '
+         'eiusmod tempor incididunt ut labore et dolore magna aliqua').split()
+
+
+class LegacyExportCli(Export):
+    """
+    The renderer before the single pass rewrite: html.parser, a reparse
+    with lxml for annotations, one findAll pass per style and a text
+    replace per annotation.
+    """
+
+    def __init__(self, entry, params, width):
+        Export.__init__(self, entry)
+        self.params = params
+        self.width = width
+
+    def run(self):
+        soup = self.mark_annotations(self.entry.content)
+        self.color_headers(soup)
+        self.color_bold(soup)
+        self.make_hr(soup)
+        self.replace_images(soup)
+        for p in soup.find_all('p'):
+            p.insert_before(self.new_line_tag(soup, times=2))
+        result = self.make_annotations(soup).replace('\n\n\n', '\n\n')
+        return f"{self.entry.title}\n{''.ljust(self.width, '=')}\n{result}"
+
+    def mark_annotations(self, html):
+        from bs4 import BeautifulSoup
+        from lxml import etree
+
+        soup = BeautifulSoup(html, "html.parser")
+        if self.entry.annotations:
+            dom = etree.HTML(str(soup))
+            for anno in self.entry.annotations:
+                anno_id = f"__anno-{anno['id']}__"
+                start = int(anno['ranges'][0]['startOffset'])
+                end = int(anno['ranges'][0]['endOffset'])
+                el_start = dom.xpath('/' + anno['ranges'][0]['start'])[0]
+                el_end = dom.xpath('/' + anno['ranges'][0]['end'])[0]
+                el_start.text = "".join([
+                        el_start.text[:start], f'{anno_id}_start',
+                        el_start.text[start:]])
+                if el_start == el_end:
+                    end += len(f'{anno_id}_start')
+                el_end.text = "".join([
+                        el_end.text[:end], f'{anno_id}_end',
+                        el_end.text[end:]])
+            return BeautifulSoup(
+                    etree.tostring(dom, method='html'), "html.parser")
+        return soup
+
+    def make_annotations(self, soup):
+        text = soup.text
+        for anno in self.entry.annotations:
+            anno_id = f"__anno-{anno['id']}__"
+            text = text.replace(
+                    f'{anno_id}_start', Back.CYAN).replace(
+                            f'{anno_id}_end', f'{Back.RESET} [{anno["id"]}]')
+        return text
+
+    def color_headers(self, soup):
+        for header in ['h1', 'h2', 'h3']:
+            for h in soup.find_all(header):
+                h.string = f"{Fore.BLUE}{h.string}{Fore.RESET}"
+                h.insert_before(self.new_line_tag(soup, 2))
+                h.insert_after(self.new_line_tag(soup))
+                h.unwrap()
+
+    def new_line_tag(self, soup, times=1):
+        span = soup.new_tag('span')
+        span.string = "\n" * times
+        return span
+
+    def color_bold(self, soup):
+        for b in soup.find_all(['b', 'strong']):
+            b.string = f"{Fore.RED}{b.string}{Fore.RESET}"
+
+    def make_hr(self, soup):
+        for hr in soup.find_all('hr'):
+            replace = soup.new_tag('p')
+            replace.string = "".ljust(self.width, '-')
+            hr.insert_after(replace)
+            hr.unwrap()
+
+    def replace_images(self, soup):
+        for img in soup.find_all('img'):
+            replace = soup.new_tag('span')
+            alt = f" \"{img['alt']}\"" if 'alt' in img.attrs else ""
+            replace.string = f" [IMAGE{alt}]\n"
+            img.insert_after(replace)
+            img.unwrap()
+
+
+def sentence(rand, words):
+    return " ".join(rand.choice(WORDS) for _ in range(words))
+
+
+def make_article(size, rand):
+    parts = []
+    length = 0
+    index = 0
+    while length < size:
+        index += 1
+        if index % 20 == 0:
+            part = f'<h2>{sentence(rand, 5)}</h2>'
+        elif index % 50 == 0:
+            part = '<hr/>'
+        elif index % 15 == 0:
+            part = (f'<p>{sentence(rand, 10)}'
+                    f'<img src="https://imag.es/{index}.jpg" alt="image"/>'
+                    f'</p>')
+        else:
+            part = (f'<p>{sentence(rand, 30)} <b>{sentence(rand, 3)}</b> '
+                    f'<a href="https://link/{index}">{sentence(rand, 4)}</a> '
+                    f'{sentence(rand, 40)}</p>')
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def make_annotations(count, rand):
+    annotations = []
+    for anno_id in range(1, count + 1):
+        paragraph = f'/p[{anno_id * 7}]'
+        annotations.append({
+            'id': anno_id, 'text': 'note', 'quote': 'quote',
+            'ranges': [{
+                'start': paragraph, 'startOffset': str(rand.randint(0, 20)),
+                'end': paragraph, 'endOffset': str(rand.randint(30, 60))}]})
+    return annotations
+
+
+def measure(name, renderer, entry, params, runs=3):
+    best = output = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = renderer(entry, params, 80).run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{name:<16} time={best * 1000:.1f} ms output={len(output)} chars')
+    return best, output
+
+
+def main(size_kb, annotations):
+    rand = random.Random(1)
+    entry = Entry({
+        'id': 1, 'title': 'long read', 'url': 'url',
+        'content': make_article(size_kb * 1024, rand),
+        'is_archived': 0, 'is_starred': 0,
+        'annotations': make_annotations(annotations, rand)})
+    params = ShowCommandParams(1)
+    print(f'article: {len(entry.content)} bytes, '
+          f'annotations: {len(entry.annotations)}')
+
+    before, expected = measure(
+            'bs4 (before)', LegacyExportCli, entry, params)
+    after, output = measure('lxml (after)', ExportCli, entry, params)
+    print(f'speedup: {before / after:.1f}x, '
+          f'same output: {"yes" if output == expected else "no"}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Compare building a `Response` from a large JSON list response with the
+previous implementation, which decoded `requests`' text (with charset
+detection), parsed it with `json` and encoded it back to bytes.
+
+    PYTHONPATH=src python benchmarks/bench_response.py [SIZE_MB]
+
+Time is the best of a few runs, memory the peak traced by tracemalloc
+while building the response, the body itself not included.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+import requests
+
+from wallabag import jsonlib
+from wallabag.api.api import Response
+
+RUNS = 3
+
+
+def legacy_response(result):
+    text = result.text
+    response = json.loads(text)
+    content = bytes(text, 'utf-8')
+    return response, content
+
+
+def current_response(result):
+    response = Response.from_headers(
+            result.status_code, None, result.content, result.headers)
+    return response.response, response.content
+
+
+def make_result(size):
+    entries = []
+    length = 0
+    while length < size:
+        entry = {
+            "id": len(entries) + 1, "title": f"Long read № {len(entries)}",
+            "url": f"https://example.com/{len(entries)}",
+            "content": "<p>" + "lorem ipsum dolor sit amet " * 120 + "</p>",
+            "is_archived": 0, "is_starred": 1, "tags": [],
+            "updated_at": "2020-11-11T05:02:11+0000"}
+        entries.append(entry)
+        length += len(entry["content"]) + 200
+    result = requests.models.Response()
+    result.status_code = 200
+    result.headers['Content-Type'] = 'application/json'
+    result._content = json.dumps(
+            {"_embedded": {"items": entries}},
+            ensure_ascii=False).encode('utf-8')
+    return result
+
+
+def measure(name, build, result):
+    best = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        output = build(result)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del output
+
+    tracemalloc.start()
+    output = build(result)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del output
+    print(f'{name:<10} time={best * 1000:.1f} ms '
+          f'peak={peak / 1024 / 1024:.1f} MB')
+    return best, peak
+
+
+def main(size_mb):
+    result = make_result(size_mb * 1024 * 1024)
+    backend = 'orjson' if jsonlib.orjson else 'json'
+    print(f'body: {len(result.content) / 1024 / 1024:.1f} MB, '
+          f'backend: {backend}')
+
+    before = measure('before', legacy_response, result)
+    after = measure('after', current_response, result)
+    print(f'speedup: {before[0] / after[0]:.1f}x, '
+          f'memory saved: {(before[1] - after[1]) / 1024 / 1024:.1f} MB')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
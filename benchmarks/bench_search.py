@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Measure full-text search over a synthetic mirror.
+
+    PYTHONPATH=src python benchmarks/bench_search.py [ENTRIES]
+"""
+
+import itertools
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from wallabag.mirror import Mirror
+
+KEYWORDS = ("python wallabag article reading later search index query "
+            "network latency sqlite cache terminal render annotation "
+            "session token export markdown html epub pdf mirror sync").split()
+# Zipf-like vocabulary: a few very common words and a long tail.
+WORDS = KEYWORDS + [f"word{i}" for i in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(
+        1 / (rank + 1) for rank in range(len(WORDS))))
+
+
+def words(rnd, count):
+    return " ".join(rnd.choices(WORDS, cum_weights=CUM_WEIGHTS, k=count))
+
+
+def make_item(entry_id, rnd):
+    paragraphs = "".join(
+            "<p>" + words(rnd, 80) + "</p>" for _ in range(20))
+    return {
+        "id": entry_id, "title": words(rnd, 6),
+        "url": f"https://example.com/{entry_id}", "content": paragraphs,
+        "is_archived": 0, "is_starred": 0,
+        "created_at": "2020-11-04T11:37:45+0000",
+        "updated_at": "2020-11-04T11:37:45+0000",
+        "tags": [{"id": 1, "label": rnd.choice(KEYWORDS), "slug": "tag"}]
+    }
+
+
+def main(size):
+    rnd = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        mirror = Mirror(Path(directory) / "mirror.sqlite")
+        start = time.perf_counter()
+        for offset in range(0, size, 1000):
+            mirror.store_entries(
+                    make_item(i, rnd) for i in range(
+                        offset + 1, min(offset + 1000, size) + 1))
+        print(f'indexed {size} entries in '
+              f'{time.perf_counter() - start:.1f} s')
+
+        for query in ('word5000', 'word700 AND word900', '"word42 word43"',
+                      'sync', 'markdown NOT pdf', 'nonexistent'):
+            start = time.perf_counter()
+            results = mirror.search(query, 20)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f'{query:<20} results={len(results):<3} '
+                  f'time={elapsed:.1f} ms')
+        mirror.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the dates of `wallabag.wtime` with delorean and humanize, used
+before for `Entry.created_at`, `info` and the annotation ages of `anno`.
+
+    PYTHONPATH=src python benchmarks/bench_time.py [COUNT]
+
+delorean and humanize are no longer dependencies, install them to run
+the comparison. `import` is measured in a fresh interpreter.
+"""
+
+import datetime
+import subprocess
+import sys
+import time
+
+from wallabag import wtime
+
+RUNS = 3
+
+
+def import_time(module):
+    code = ('import time; start = time.perf_counter(); '
+            f'import {module}; print(time.perf_counter() - start)')
+    return float(subprocess.check_output([sys.executable, '-c', code]))
+
+
+def make_values(count, distinct):
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    return [(start + datetime.timedelta(minutes=index % distinct)).strftime(
+                '%Y-%m-%dT%H:%M:%S+0000') for index in range(count)]
+
+
+def legacy_info(value):
+    import delorean
+
+    try:
+        date = delorean.Delorean(
+                datetime=datetime.datetime.fromisoformat(value))
+    except ValueError:
+        date = delorean.parse(value)
+    return date.format_datetime()
+
+
+def legacy_age(value):
+    import delorean
+    import humanize
+
+    return humanize.naturaltime(delorean.utcnow() - delorean.parse(value))
+
+
+def current_info(value):
+    return wtime.format_datetime(wtime.parse(value))
+
+
+def current_age(value):
+    return wtime.naturaltime(wtime.parse(value))
+
+
+def measure(name, function, values):
+    best = None
+    for _ in range(RUNS):
+        wtime.parse.cache_clear()
+        start = time.perf_counter()
+        for value in values:
+            function(value)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{name:<14} time={best * 1000:.1f} ms')
+    return best
+
+
+def main(count):
+    before = import_time('delorean, humanize')
+    after = import_time('wallabag.wtime')
+    print(f'import (before) time={before * 1000:.1f} ms')
+    print(f'import (after)  time={after * 1000:.1f} ms')
+
+    # annotations of an entry mostly share a few timestamps
+    values = make_values(count, 100)
+    print(f'dates: {count}')
+    for name, legacy, current in (
+            ('info', legacy_info, current_info),
+            ('age', legacy_age, current_age)):
+        before = measure(f'{name} (before)', legacy, values)
+        after = measure(f'{name} (after)', current, values)
+        print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from wallabag.config import Configs
+
+
+def make_entry(entry_id, tags=True):
+    return {
+        "id": entry_id,
+        "title": f"Entry number {entry_id}\n with a   long enough title",
+        "url": f"https://example.com/articles/{entry_id}",
+        "content": "",
+        "is_archived": entry_id % 2,
+        "is_starred": int(entry_id % 7 == 0),
+        "created_at": "2020-11-04T11:37:45+0000",
+        "updated_at": "2020-11-04T11:37:45+0000",
+        "reading_time": 5,
+        "domain_name": "example.com",
+        "preview_picture": None,
+        "published_by": None,
+        "annotations": [],
+        "tags": [
+            {"id": 1, "label": "tag", "slug": "tag"}
+        ] if tags and entry_id % 3 else []
+    }
+
+
+class MockWallabag():
+    """
+    Minimal wallabag API served from memory. Counts the requests and
+    the payload bytes sent to the client.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(
+                ('127.0.0.1', 0), self.__make_handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_port}'
+
+    def config(self):
+        config = Configs("/tmp/wallabag-benchmark-config")
+        config.config.read_string(f"""
+                [api]
+                serverurl = {self.url}
+                [token]
+                access_token = token
+                expires = 99999999999
+                """)
+        return config
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def list_entries(self, query):
+        per_page = int(query.get('perPage', ['30'])[0])
+        page = int(query.get('page', ['1'])[0])
+        total = len(self.entries)
+        per_page = max(min(per_page, total), 1)
+        pages = max(math.ceil(total / per_page), 1)
+        start = (page - 1) * per_page
+        return {
+            "page": page,
+            "limit": per_page,
+            "pages": pages,
+            "total": total,
+            "_links": {},
+            "_embedded": {
+                "items": self.entries[start:start + per_page]
+            }
+        }
+
+    def __make_handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if parsed.path == '/api/entries':
+                    self.__send(mock.list_entries(query))
+                elif parsed.path.startswith('/api/entries/'):
+                    entry_id = int(parsed.path.split('/')[3])
+                    self.__send(mock.entries[entry_id - 1])
+                elif parsed.path == '/api/tags':
+                    self.__send([{"id": 1, "label": "tag", "slug": "tag"}])
+                elif parsed.path == '/api/version':
+                    self.__send("2.4.0")
+                else:
+                    self.__send({"error": "not found"}, 404)
+
+            def do_PATCH(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                entry_id = int(urlparse(self.path).path.split('/')[3])
+                entry = mock.entries[entry_id - 1]
+                if 'archive' in form:
+                    entry['is_archived'] = int(form['archive'][0])
+                if 'starred' in form:
+                    entry['is_starred'] = int(form['starred'][0])
+                self.__send(entry)
+
+            def __send(self, data, status=200):
+                body = json.dumps(data).encode('utf-8')
+                with mock.lock:
+                    mock.requests += 1
+                    mock.bytes_sent += len(body)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.entry import Entry
+
+
+@pytest.mark.benchmark(group='entry')
+def bench_create_list(benchmark, list_items):
+    """
+    Entries of a list response with the fields the `list` command reads.
+    """
+    def create():
+        return [(entry.entry_id, entry.title, entry.read, entry.starred,
+                 entry.tags, entry.annotations)
+                for entry in Entry.create_list(list_items)]
+
+    assert len(benchmark(create)) == len(list_items)
+
+
+@pytest.mark.benchmark(group='entry')
+def bench_created_at(benchmark, list_items):
+    def parse():
+        return [entry.created_at for entry in Entry.create_list(list_items)]
+
+    assert all(benchmark(parse))
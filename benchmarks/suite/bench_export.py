@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.commands.show import ShowCommandParams
+from wallabag.entry import Entry
+from wallabag.export.export_cli import ExportCli
+from wallabag.export.export_md import ExportMd
+
+
+@pytest.mark.benchmark(group='export')
+def bench_export_cli(benchmark, article):
+    params = ShowCommandParams(1)
+    output = benchmark(lambda: ExportCli(Entry(article), params, 80).run())
+    assert output
+
+
+@pytest.mark.benchmark(group='export')
+def bench_export_md(benchmark, article):
+    output = benchmark(lambda: ExportMd(Entry(article)).run())
+    assert output
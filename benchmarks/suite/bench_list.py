@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.commands.list import ListCommand, ListParams
+from wallabag.entry import Entry
+
+
+@pytest.mark.benchmark(group='list')
+@pytest.mark.parametrize('trim', [True, False], ids=['trim', 'no-trim'])
+def bench_print_entries(benchmark, config, list_items, trim):
+    command = ListCommand(config, ListParams(trim=trim))
+
+    def print_entries():
+        return command._print_entries(list(Entry.create_list(list_items)))
+
+    output = benchmark(print_entries)
+    assert output.count('\n') >= len(list_items)
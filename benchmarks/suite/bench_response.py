@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.api.api import Response
+
+
+@pytest.mark.benchmark(group='response')
+def bench_list_response(benchmark, list_response):
+    response = benchmark(Response, 200, content=list_response)
+    assert not response.has_error()
+    assert response.response['_embedded']['items']
+
+
+@pytest.mark.benchmark(group='response')
+def bench_tags_response(benchmark, tags_response):
+    response = benchmark(Response, 200, content=tags_response)
+    assert len(response.response) > 1000
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.commands.show import ShowCommand, ShowCommandParams
+from wallabag.entry import Entry
+from wallabag.export.export_cli import ExportCli
+from wallabag.format_type import Alignment
+
+
+@pytest.mark.benchmark(group='show')
+@pytest.mark.parametrize('align', [Alignment.LEFT, Alignment.CENTER],
+                         ids=['left', 'center'])
+def bench_format_output(benchmark, config, article, align):
+    params = ShowCommandParams(1)
+    params.align = align
+    command = ShowCommand(config, params)
+    command._ShowCommand__calculate_alignment()
+    rendered = ExportCli(Entry(article), params, command.width).run()
+
+    output = benchmark(command._ShowCommand__format_output, rendered)
+    assert len(output) >= len(rendered)
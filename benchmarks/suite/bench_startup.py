@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Start-up of the `wallabag` script in a fresh interpreter, without the
+daemon: the cost every command pays before doing any work.
+
+The XDG directories point to a temporary directory, so the user's
+config is never read and no server is contacted. The completion cache
+is filled beforehand: a missing one would be refreshed by a background
+process.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import TAGS, make_list, make_tags
+from wallabag.completion import Completion
+
+SRC = Path(__file__).resolve().parents[2] / 'src'
+ROUNDS = 10
+
+
+@pytest.fixture
+def run(monkeypatch, tmp_path):
+    for name in ('XDG_CONFIG_HOME', 'XDG_CACHE_HOME', 'XDG_DATA_HOME',
+                 'XDG_RUNTIME_DIR'):
+        monkeypatch.setenv(name, str(tmp_path / name.lower()))
+    monkeypatch.setenv('PYTHONPATH', str(SRC))
+    monkeypatch.setenv('WALLABAG_NO_DAEMON', '1')
+
+    completion = Completion()
+    os.makedirs(os.path.dirname(completion.path))
+    with open(completion.path, 'w', encoding='utf-8') as file:
+        json.dump({
+            'time': time.time(), 'ttl': 24 * 60 * 60,
+            'tags': [tag['label'] for tag in make_tags(TAGS)],
+            'entries': [[item['id'], item['title']]
+                        for item in make_list(500)]}, file)
+    env = dict(os.environ)
+
+    def run(code, *args):
+        subprocess.run(
+                [sys.executable, '-c', code, *args], env=env, check=True,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return run
+
+
+@pytest.mark.benchmark(group='startup')
+@pytest.mark.parametrize('code, args', [
+    ('from wallabag.client import main; main()', ('--help',)),
+    ('from wallabag.client import main; main()', ('_complete', 'tags')),
+    ('import wallabag.wallabag', ())], ids=['help', 'complete', 'import'])
+def bench_startup(benchmark, run, code, args, tmp_path):
+    benchmark.pedantic(run, args=(code, *args), rounds=ROUNDS)
+    # answered from the cache, no refresh started
+    assert not list(tmp_path.glob('xdg_cache_home/wallabag-cli/*.lock'))
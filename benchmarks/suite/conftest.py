@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic wallabag data for the benchmarks: list responses of 1k, 10k
+and 100k entries, articles of 100 KB to 5 MB with dozens of annotations
+and wide tag sets. Everything is generated from a fixed seed, so runs of
+different revisions measure the same input.
+"""
+
+import json
+import random
+
+import pytest
+
+from wallabag import wclick
+from wallabag.config import Configs
+
+SEED = 1
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do '
+         'eiusmod tempor incididunt ut labore et dolore magna aliqua '
+         'Überschrift naïve café').split()
+
+LIST_SIZES = {'1k': 1000, '10k': 10000, '100k': 100000}
+ARTICLE_SIZES = {'100KB': 100 * 1024, '1MB': 1024 * 1024,
+                 '5MB': 5 * 1024 * 1024}
+ANNOTATIONS = 40
+TAGS = 5000
+TAGS_PER_ENTRY = 50
+
+
+def sentence(rand, words):
+    return " ".join(rand.choice(WORDS) for _ in range(words))
+
+
+def make_tags(count):
+    return [{'id': tag_id, 'label': f'tag {tag_id}', 'slug': f'tag-{tag_id}'}
+            for tag_id in range(1, count + 1)]
+
+
+def make_item(entry_id, rand, tags=(), annotations=(), content=""):
+    day = entry_id % 28 + 1
+    return {
+        'id': entry_id,
+        'title': f'{sentence(rand, 8)}\n {entry_id}',
+        'url': f'https://example.com/{entry_id}',
+        'content': content,
+        'is_archived': int(entry_id % 3 == 0),
+        'is_starred': int(entry_id % 7 == 0),
+        'created_at': f'2020-11-{day:02d}T11:37:45+0000',
+        'updated_at': f'2020-11-{day:02d}T12:00:00+0000',
+        'reading_time': entry_id % 40,
+        'tags': list(tags),
+        'annotations': list(annotations)}
+
+
+def make_article(size, rand):
+    parts = []
+    length = 0
+    index = 0
+    while length < size:
+        index += 1
+        if index % 20 == 0:
+            part = f'<h2>{sentence(rand, 5)}</h2>'
+        elif index % 50 == 0:
+            part = '<hr/>'
+        elif index % 15 == 0:
+            part = (f'<p>{sentence(rand, 10)}'
+                    f'<img src="https://imag.es/{index}.jpg" alt="image"/>'
+                    f'</p>')
+        else:
+            part = (f'<p>{sentence(rand, 30)} <b>{sentence(rand, 3)}</b> '
+                    f'<a href="https://link/{index}">{sentence(rand, 4)}</a> '
+                    f'{sentence(rand, 40)}</p>')
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def make_annotations(count, rand):
+    annotations = []
+    for anno_id in range(1, count + 1):
+        paragraph = f'/p[{anno_id * 7}]'
+        annotations.append({
+            'id': anno_id, 'text': sentence(rand, 12), 'quote': 'quote',
+            'created_at': '2020-11-04T11:37:45+0000',
+            'updated_at': '2020-11-04T11:37:45+0000',
+            'ranges': [{
+                'start': paragraph, 'startOffset': str(rand.randint(0, 20)),
+                'end': paragraph, 'endOffset': str(rand.randint(30, 60))}]})
+    return annotations
+
+
+def make_list(count):
+    """
+    Items of a list response: every tenth entry is annotated, every
+    fifth has a wide tag set.
+    """
+    rand = random.Random(SEED)
+    tags = make_tags(TAGS)
+    annotations = make_annotations(3, rand)
+    return [make_item(
+                entry_id, rand,
+                tags=rand.sample(tags, TAGS_PER_ENTRY)
+                if entry_id % 5 == 0 else (),
+                annotations=annotations if entry_id % 10 == 0 else ())
+            for entry_id in range(1, count + 1)]
+
+
+def list_body(items):
+    return json.dumps({
+        'page': 1, 'limit': len(items), 'pages': 1, 'total': len(items),
+        '_embedded': {'items': items}}, ensure_ascii=False).encode('utf-8')
+
+
+@pytest.fixture(scope='session', params=list(LIST_SIZES))
+def list_items(request):
+    return make_list(LIST_SIZES[request.param])
+
+
+@pytest.fixture(scope='session')
+def list_response(list_items):
+    return list_body(list_items)
+
+
+@pytest.fixture(scope='session')
+def tags_response():
+    return json.dumps(make_tags(TAGS)).encode('utf-8')
+
+
+@pytest.fixture(scope='session', params=list(ARTICLE_SIZES))
+def article(request):
+    rand = random.Random(SEED)
+    return make_item(
+            1, rand, tags=make_tags(TAGS)[:TAGS_PER_ENTRY],
+            annotations=make_annotations(ANNOTATIONS, rand),
+            content=make_article(ARTICLE_SIZES[request.param], rand))
+
+
+@pytest.fixture
+def config():
+    config = Configs("/tmp/config")
+    config.config.read_string("""
+            [api]
+            serverurl = https://server
+            username = user
+            password = pass
+            [oauth2]
+            client = 100
+            secret = 100
+            """)
+    return config
+
+
+@pytest.fixture(autouse=True)
+def terminal(monkeypatch):
+    # output independent of the terminal running the benchmarks
+    monkeypatch.setattr(wclick, 'TERMINAL_SIZE', (160, 50))
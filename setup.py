@@ -36,20 +36,21 @@ setup(
         'click_repl>=0.2.0',
         'pyxdg',
         'colorama>=0.4.3',
-        'delorean',
         'humanize',
         'lxml',
-        'tzlocal',
         'tabulate',
         'packaging',
         'markdownify',
     ],
     extras_require={
-        "test": ["pytest"],
+        "async": ["aiohttp>=3.8"],
+        "orjson": ["orjson"],
+        "test": ["pytest", "aiohttp>=3.8"],
+        "benchmark": ["pytest", "pytest-benchmark"],
     },
 
     entry_points='''
         [console_scripts]
-        wallabag=wallabag.wallabag:cli
+        wallabag=wallabag.client:main
     '''
 )
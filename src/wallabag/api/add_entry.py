@@ -23,10 +23,11 @@ class AddEntry(Api):
         ARCHIVE = "archive"
         TAGS = "tags"
 
-    def __init__(self, config, url, params):
+    def __init__(self, config, url, params, probe=True):
         Api.__init__(self, config)
         self.url = url
         self.params = params
+        self.probe = probe
 
     def _make_request(self, request):
         return self._request_post(request)
@@ -1,16 +1,19 @@
 import re
-import json
 import logging
+import threading
+import time
 
 from abc import ABC, abstractmethod
 from enum import auto, Enum
+from urllib.parse import urlsplit
+from wallabag import jsonlib
 from wallabag.config import Options, Sections
 
-import requests
-
-from packaging import version
-
 MINIMUM_API_VERSION = "2.1.1"
+PROBE_TTL = 600
+PROBE_TIMEOUT = 5
+RESPONSE_TTL = 300
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class ApiException(Exception):
@@ -43,6 +46,15 @@ class RequestException(ApiException):
         self.response = response
 
 
+class ConnectionException(RequestException):
+    """
+    The server couldn't be reached: no response was received.
+    """
+
+    def __init__(self, error=None):
+        RequestException.__init__(self, 'Connection error', error)
+
+
 class ValueException(ApiException):
     pass
 
@@ -95,31 +107,39 @@ class Verbs(Enum):
 
 
 class Response:
+    """
+    Result of a request. A JSON body is decoded straight from the bytes,
+    `content` keeps the bytes as received (or encodes `text` on first
+    use), no other copy of the body is made.
+    """
+
+    status_code = None
     error = Error.UNDEFINED
     error_text = ""
     error_description = ""
     content_type = None
 
     response = None
-    content = None
     filename = None
 
     def __init__(
             self, status_code, text=None,
             content=None, content_type='application/json',
             content_disposition=None):
+        self.status_code = status_code
         self.content_type = content_type
         self.content_disposition = content_disposition
+        self.__text = text
+        self.__content = content or None
         if self.content_type == 'application/json':
-            if text:
+            body = content or text
+            if body:
                 try:
-                    self.response = json.loads(text)
-                    self.content = bytes(text, 'utf-8')
-                except json.decoder.JSONDecodeError as err:
+                    self.response = jsonlib.loads(body)
+                except jsonlib.JSONDecodeError as err:
                     self.error_text = str(err)
-                    self.response = text
-        elif content:
-            self.content = content
+                    self.response = text if text else content.decode(
+                            'utf-8', 'replace')
         if self.content_disposition:
             match = re.match(
                     'attachment; filename="(.*)"',
@@ -154,6 +174,23 @@ class Response:
         elif result[1]:
             (self.error_text, self.error_description) = result[1]()
 
+    @property
+    def content(self):
+        if (self.__content is None and self.__text
+                and self.content_type == 'application/json'):
+            self.__content = bytes(self.__text, 'utf-8')
+        return self.__content
+
+    @content.setter
+    def content(self, content):
+        self.__content = content
+
+    def from_headers(status_code, text, content, headers):
+        return Response(
+                status_code, text, content,
+                headers.get('Content-Type'),
+                headers.get('Content-Disposition'))
+
     def has_error(self):
         return self.error != Error.OK
 
@@ -163,19 +200,87 @@ class Response:
                 if 'error_description' in self.response else None)
 
 
+class ProbeCache():
+    """
+    Reachability of sites (scheme and host) probed in the last `ttl`
+    seconds, shared by all requests of the process.
+    """
+
+    def __init__(self, ttl=PROBE_TTL):
+        self.lock = threading.Lock()
+        self.ttl = ttl
+        self.sites = {}
+
+    def site(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def get(self, url):
+        with self.lock:
+            result = self.sites.get(ProbeCache.site(url))
+            if result and time.monotonic() - result[1] < self.ttl:
+                return result[0]
+            return None
+
+    def put(self, url, valid):
+        with self.lock:
+            self.sites[ProbeCache.site(url)] = (valid, time.monotonic())
+
+    def clear(self):
+        with self.lock:
+            self.sites.clear()
+
+
+PROBES = ProbeCache()
+
+
+class ResponseCache():
+    """
+    Responses of cacheable requests (entries and tags) received in the
+    last `ttl` seconds. Disabled unless a long-lived session (the repl)
+    enables it; any other request than GET and HEAD clears it, as the
+    responses may be stale after a change.
+    """
+
+    def __init__(self, ttl=RESPONSE_TTL):
+        self.lock = threading.Lock()
+        self.ttl = ttl
+        self.enabled = False
+        self.responses = {}
+
+    def key(request):
+        params = request.api_params or {}
+        # the token tells the accounts on the same server apart
+        return (request.url, (request.headers or {}).get('Authorization'),
+                tuple(sorted((key, str(value))
+                             for key, value in params.items())))
+
+    def get(self, request):
+        with self.lock:
+            result = self.responses.get(ResponseCache.key(request))
+            if result and time.monotonic() - result[1] < self.ttl:
+                return result[0]
+            return None
+
+    def put(self, request, response):
+        with self.lock:
+            self.responses[ResponseCache.key(request)] = (
+                    response, time.monotonic())
+
+    def clear(self):
+        with self.lock:
+            self.responses.clear()
+
+
+RESPONSES = ResponseCache()
+
+
 class Api(ABC):
 
     VERSION_RE = re.compile('\\d+\\.\\d+\\.\\d+')
     URL_RE = re.compile("(?i)https?:\\/\\/.+")
     HEAD_UA = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 \
     (KHTML, like Gecko) Chrome/83.0.4103.61 Safari/537.36'
-    REQUEST_METHODS = {
-        Verbs.GET: requests.get,
-        Verbs.DELETE: requests.delete,
-        Verbs.POST: requests.post,
-        Verbs.PATCH: requests.patch,
-        Verbs.HEAD: requests.head
-    }
 
     class Request:
         type = None
@@ -183,8 +288,17 @@ class Api(ABC):
         api_params = None
         headers = None
         data = None
+        timeout = None
+        output = None
+        progress = None
+        probe = False
 
     skip_auth = False
+    probe = True
+    cacheable = False
+    # number of responses received in the process: the server is reachable
+    received = 0
+    __prepare_only = False
 
     def __init__(self, config):
         self.log = logging.getLogger('wallabag.api')
@@ -192,15 +306,24 @@ class Api(ABC):
 
     def request(self):
         self.log.debug('making api request: %s', self.__class__.__name__)
-        request = Api.Request()
-        request.url = self._get_api_url()
-        if not self.skip_auth:
-            request.headers = self._get_authorization_header()
-        request.api_params = self._get_params()
-        request.data = self._get_data()
-        return self._make_request(request)
+        return self._make_request(self.__build_request())
+
+    def prepare(self):
+        """
+        Build the request with its verb without sending it, for clients
+        other than the requests session.
+        """
+        request = self.__build_request()
+        self.__prepare_only = True
+        try:
+            self._make_request(request)
+        finally:
+            self.__prepare_only = False
+        return request
 
     def is_minimum_version(version_response):
+        from packaging import version
+
         versionstring = version_response.response
 
         if not Api.VERSION_RE.match(versionstring):
@@ -220,60 +343,66 @@ class Api(ABC):
 
     def _request_delete(self, request):
         request.type = Verbs.DELETE
-        return self.__make_request(request)
+        return self.__send(request)
 
     def _request_head(self, request):
         request.type = Verbs.HEAD
-        return self.__make_request(request)
+        return self.__send(request)
 
     def _request_get(self, request):
         request.type = Verbs.GET
-        return self.__make_request(request)
+        return self.__send(request)
 
     def _request_post(self, request):
         request.type = Verbs.POST
-        return self.__make_request(request)
+        return self.__send(request)
 
     def _request_patch(self, request):
         request.type = Verbs.PATCH
-        return self.__make_request(request)
+        return self.__send(request)
 
     def _is_valid_url(self, url):
-        try_method_get = False
-        while True:
-            request = Api.Request()
-            request.url = url
-            request.headers = {'user-agent': Api.HEAD_UA}
-            if not try_method_get:
-                try:
-                    result = self._request_head(request)
-                    if result.error == Error.METHOD_NOT_ALLOWED:
-                        try_method_get = True
-                        continue
-                except RequestException:
-                    self.log.error(
-                            "couldn't check url because of RequestException")
-                    return True
-            else:
-                result = self._request_get(request)
-            break
-        return not result.has_error()
+        request = Api.Request()
+        request.url = url
+        request.headers = {'user-agent': Api.HEAD_UA}
+        request.probe = True
+        request.timeout = self.config.getfloat(
+                Sections.HTTP, Options.PROBE_TIMEOUT, PROBE_TIMEOUT)
+        try:
+            self._request_head(request)
+        except RequestException as error:
+            if not error.response or (
+                    error.response.error != Error.METHOD_NOT_ALLOWED):
+                self.log.debug("couldn't reach %s: %s", url, error)
+                return False
+            try:
+                self._request_get(request)
+            except RequestException as error:
+                self.log.debug("couldn't reach %s: %s", url, error)
+                return False
+        return True
 
     def _validate_url(self, url):
+        """
+        Complete a url without a scheme: https if the site answers over
+        https, otherwise http if it answers over http. Both are probed
+        concurrently and the result is cached per site. Urls with a
+        scheme are passed to the server as they are.
+        """
         if not url:
             raise ValueException("Invalid url")
-        if not Api.URL_RE.match(url):
-            for protocol in "https://", "http://":
-                if self._is_valid_url(f"{protocol}{url}"):
-                    url = f"{protocol}{url}"
-                    valid_url = True
-                    break
-        else:
-            valid_url = self._is_valid_url(url)
-
+        if Api.URL_RE.match(url):
+            return url
+        candidates = [
+                f"{protocol}{url}" for protocol in ("https://", "http://")]
+        if not self.probe or not self.config.getboolean(
+                Sections.HTTP, Options.PROBE, True):
+            return candidates[0]
+        valid_url = self.__probe(candidates)
         if not valid_url:
-            raise ValueException("Invalid url")
-        return url
+            self.log.warning("couldn't reach %s, using https", url)
+            return candidates[0]
+        return valid_url
 
     def _validate_identificator(self, entry_id):
         if not entry_id:
@@ -314,32 +443,119 @@ class Api(ABC):
         token = TokenConfigurator(self.config).get_token()
         return {'Authorization': f"Bearer {token}"}
 
+    def __probe(self, urls):
+        """
+        The first url in `urls` the site answers: an url is returned as
+        soon as its probe succeeds and every url before it failed.
+        """
+        from concurrent.futures import (
+                FIRST_COMPLETED, ThreadPoolExecutor, wait)
+
+        results = {url: PROBES.get(url) for url in urls}
+        futures = {}
+        pending = [url for url in urls if results[url] is None]
+        if pending:
+            executor = ThreadPoolExecutor(len(pending))
+            for url in pending:
+                futures[executor.submit(self.__probe_url, url)] = url
+            executor.shutdown(wait=False)
+        while True:
+            for url in urls:
+                if results[url] is None:
+                    break
+                if results[url]:
+                    return url
+            else:
+                return None
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures.pop(future)] = future.result()
+
+    def __probe_url(self, url):
+        valid = self._is_valid_url(url)
+        PROBES.put(url, valid)
+        return valid
+
+    def __build_request(self):
+        request = Api.Request()
+        request.url = self._get_api_url()
+        if not self.skip_auth:
+            request.headers = self._get_authorization_header()
+        request.api_params = self._get_params()
+        request.data = self._get_data()
+        return request
+
+    def __send(self, request):
+        if self.__prepare_only:
+            return None
+        if request.type not in (Verbs.GET, Verbs.HEAD):
+            try:
+                return self.__make_request(request)
+            finally:
+                RESPONSES.clear()
+        if not (self.cacheable and RESPONSES.enabled):
+            return self.__make_request(request)
+        response = RESPONSES.get(request)
+        if response is None:
+            response = self.__make_request(request)
+            RESPONSES.put(request, response)
+        else:
+            self.log.debug('cached response: %s', request.url)
+        return response
+
     def __make_request(self, request):
+        import requests
+        from wallabag.api.session import HttpSession, STATS
+
         try:
             self.log.debug('request data: %s', request.__dict__)
 
-            result = Api.REQUEST_METHODS[request.type](
+            session = HttpSession.probe if request.probe else (
+                    HttpSession.get)
+            result = session(self.config).request(
+                    request.type.name,
                     request.url, headers=request.headers,
                     params=request.api_params, data=request.data,
-                    allow_redirects=True)
-            content_type = None
-            content_disposition = None
-            if 'Content-Type' in result.headers:
-                content_type = result.headers['Content-Type']
-            if 'Content-Disposition' in result.headers:
-                content_disposition = result.headers['Content-Disposition']
-            response = Response(
-                    result.status_code, result.text,
-                    result.content, content_type, content_disposition)
+                    timeout=request.timeout, allow_redirects=True,
+                    stream=request.output is not None)
+            if request.output is not None and result.status_code == 200:
+                self.__stream(result, request)
+                response = Response.from_headers(
+                        result.status_code, None, None, result.headers)
+            else:
+                # JSON is decoded from the bytes, requests' text would
+                # detect the charset of the whole body first
+                response = Response.from_headers(
+                        result.status_code, None,
+                        result.content, result.headers)
+        except requests.exceptions.MissingSchema as error:
+            # a server url without a scheme: the config is wrong, the
+            # server isn't unreachable
+            self.log.exception('request exception')
+            raise RequestException('Invalid url', str(error))
         except (
                 requests.exceptions.ConnectionError,
-                requests.exceptions.MissingSchema) as error:
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout) as error:
             self.log.exception('request exception')
-            raise RequestException('Connection error', error)
+            raise ConnectionException(error)
 
+        Api.received += 1
+        self.log.debug('http connections: %s', STATS)
         self.log.debug('response headers: %s', result.headers)
         self.log.debug('response result: %s', response.__dict__)
 
         if response.has_error():
             raise RequestException(response=response)
         return response
+
+    def __stream(self, result, request):
+        total = int(result.headers.get('Content-Length') or 0)
+        received = 0
+        with result:
+            for chunk in result.iter_content(STREAM_CHUNK_SIZE):
+                request.output.write(chunk)
+                received += len(chunk)
+                if request.progress:
+                    request.progress(received, total)
+        self.log.debug('streamed %d bytes', received)
@@ -7,9 +7,10 @@ from wallabag.config import Options, Sections
 
 class ApiToken(Api):
 
-    def __init__(self, config):
+    def __init__(self, config, refresh_token=None):
         Api.__init__(self, config)
         self.skip_auth = True
+        self.refresh_token = refresh_token
 
     def _get_api_url(self):
         return self._build_url(ApiMethod.TOKEN)
@@ -18,6 +19,14 @@ class ApiToken(Api):
         return self._request_get(request)
 
     def _get_params(self):
+        if self.refresh_token:
+            return {
+                'grant_type': "refresh_token",
+                'client_id': self.config.get(Sections.OAUTH2, Options.CLIENT),
+                'client_secret': self.config.get(
+                    Sections.OAUTH2, Options.SECRET),
+                'refresh_token': self.refresh_token
+            }
         return {
             'grant_type': "password",
             'client_id': self.config.get(Sections.OAUTH2, Options.CLIENT),
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import logging
+
+from wallabag.api.api import ConnectionException, RequestException, Response
+from wallabag.api.session import DEFAULT_POOL_SIZE
+from wallabag.config import Options, Sections
+
+DEFAULT_TIMEOUT = 60
+
+
+class AsyncClient():
+    """
+    Send the requests of `Api` objects on an asyncio event loop with
+    aiohttp (`pip install wallabag-client[async]`).
+
+        async with AsyncClient(config) as client:
+            responses = await client.gather(
+                    GetEntry(config, entry_id) for entry_id in ids)
+
+    URLs, parameters and data come from the same `Api` classes as for
+    the synchronous requests, responses and errors are the same
+    `Response` and `RequestException`. At most `limit` connections are
+    open at the same time, `pool_size` of the `http` section by default.
+    """
+
+    def __init__(self, config, limit=None, timeout=DEFAULT_TIMEOUT):
+        self.log = logging.getLogger('wallabag.api')
+        self.config = config
+        self.limit = limit or config.getint(
+                Sections.HTTP, Options.POOL_SIZE, DEFAULT_POOL_SIZE)
+        self.timeout = timeout
+        self.session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self.log.debug('creating async http session: limit %d', self.limit)
+        self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *args):
+        await self.session.close()
+        self.session = None
+
+    async def request(self, api):
+        """
+        Send the request of `api` and return its `Response`, raise
+        `RequestException` like `Api.request`.
+        """
+        import aiohttp
+
+        # building a request may read the token or probe an url, both
+        # blocking, so it runs outside of the event loop
+        request = await asyncio.get_running_loop().run_in_executor(
+                None, api.prepare)
+        self.log.debug('making async api request: %s %s',
+                       api.__class__.__name__, request.type.name)
+        try:
+            async with self.session.request(
+                    request.type.name, request.url,
+                    headers=request.headers,
+                    params=AsyncClient.__fields(request.api_params),
+                    data=AsyncClient.__fields(request.data)) as result:
+                content = await result.read()
+                response = Response.from_headers(
+                        result.status, None, content, result.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            self.log.debug('async request exception: %s', error)
+            raise ConnectionException(error)
+
+        if response.has_error():
+            raise RequestException(response=response)
+        return response
+
+    async def gather(self, apis):
+        """
+        Send all requests concurrently, return the responses in order.
+        A failed request gives its exception instead of a response.
+        """
+        return await asyncio.gather(
+                *[self.request(api) for api in apis], return_exceptions=True)
+
+    def __fields(values):
+        """
+        Parameters as requests encodes them: lists repeat the key, None
+        values are left out.
+        """
+        if not values:
+            return None
+        fields = []
+        for key, value in values.items():
+            for item in value if isinstance(value, list) else [value]:
+                if item is not None:
+                    fields.append((key, str(item)))
+        return fields
@@ -1,21 +1,61 @@
 # -*- coding: utf-8 -*-
 
 from enum import Enum
+from urllib.parse import quote
 
 from wallabag.api.api import Api, ApiMethod, ValueException
 
 
 class EntryExists(Api):
+    """
+    Check a single `url` or a list of `urls`.
+
+    For a single url the response is `{"exists": ENTRY_ID or null}`, for a
+    list it maps every url to its entry ID or null.
+    """
 
     API_METHOD = ApiMethod.ENTRY_EXISTS
 
+    MAX_URLS = 100
+    MAX_QUERY_LENGTH = 6000
+
     class ApiParams(Enum):
         URL = "url"
+        URLS = "urls[]"
         RETURN_ID = "return_id"
 
-    def __init__(self, config, url):
+    def __init__(self, config, url=None, urls=None):
         Api.__init__(self, config)
         self.url = url
+        self.urls = urls
+
+    def check(config, urls):
+        """
+        Return {url: ENTRY_ID or None} for all urls, chunked so that a
+        request stays in the limits of the server.
+        """
+        result = {}
+        for chunk in EntryExists.chunks(urls):
+            response = EntryExists(config, urls=chunk).request().response
+            for url in chunk:
+                result[url] = response.get(url) or None
+        return result
+
+    def chunks(urls):
+        chunk = []
+        length = 0
+        for url in urls:
+            url_length = len(quote(EntryExists.ApiParams.URLS.value)) + len(
+                    quote(url, safe='')) + 2
+            if chunk and (len(chunk) >= EntryExists.MAX_URLS or
+                          length + url_length > EntryExists.MAX_QUERY_LENGTH):
+                yield chunk
+                chunk = []
+                length = 0
+            chunk.append(url)
+            length += url_length
+        if chunk:
+            yield chunk
 
     def _make_request(self, request):
         return self._request_get(request)
@@ -24,6 +64,11 @@ class EntryExists(Api):
         return self._build_url(EntryExists.API_METHOD)
 
     def _get_params(self):
+        if self.urls:
+            return {
+                EntryExists.ApiParams.URLS.value: self.urls,
+                EntryExists.ApiParams.RETURN_ID.value: 1,
+            }
         if not self.url:
             raise ValueException("URL is empty")
         return {
@@ -4,11 +4,27 @@ from wallabag.api.api import Api, ApiMethod, ValueException
 
 
 class ExportEntry(Api):
+    """
+    Download an entry in a format. With `request_to` the body is written
+    to a file while it's received instead of being kept in the response.
+    """
 
     def __init__(self, config, entry_id, format):
         Api.__init__(self, config)
         self.entry_id = entry_id
         self.format = format
+        self.output = None
+        self.progress = None
+
+    def request_to(self, output, progress=None):
+        """
+        Stream the export to the binary file `output`, calling
+        `progress(received, total)` per chunk. The total is zero when
+        the server doesn't send Content-Length.
+        """
+        self.output = output
+        self.progress = progress
+        return self.request()
 
     def _get_api_url(self):
         entry_id = self._validate_identificator(self.entry_id)
@@ -20,4 +36,6 @@ class ExportEntry(Api):
         return f'{url}/export.{self.format}'
 
     def _make_request(self, request):
+        request.output = self.output
+        request.progress = self.progress
         return self._request_get(request)
@@ -5,6 +5,8 @@ from wallabag.api.api import Api, ApiMethod
 
 class GetEntry(Api):
 
+    cacheable = True
+
     def __init__(self, config, entry_id):
         Api.__init__(self, config)
         self.entry_id = entry_id
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 from wallabag.api.api import Api, ApiMethod
+from wallabag.entry import Entry
 
 
 class Params(Enum):
@@ -11,19 +13,25 @@ class Params(Enum):
     FILTER_STARRED = "filter_starred"
     OLDEST = "oldest"
     TAGS = "tags"
+    PAGE = "page"
+    SINCE = "since"
+    FULL_DETAIL = "full_detail"
 
 
 class GetListEntries(Api):
 
     API_METHOD = ApiMethod.LIST_ENTRIES
+    PAGE_SIZE = 100
 
     class ApiParams(Enum):
         PER_PAGE = "perPage"
+        PAGE = "page"
         ORDER = "order"
         ARCHIVE = "archive"
         STARRED = "starred"
         TAGS = "tags"
         DETAIL = "detail"
+        SINCE = "since"
 
     class ApiValues():
         class ORDER(Enum):
@@ -40,6 +48,50 @@ class GetListEntries(Api):
     def _make_request(self, request):
         return self._request_get(request)
 
+    def iter_pages(self, page_size=None, prefetch=False):
+        """
+        Walk through all pages of the result set and yield the raw
+        response of every page. With `prefetch` the next page is
+        requested in background while the current one is consumed.
+        """
+        page_size = page_size or GetListEntries.PAGE_SIZE
+        if not prefetch:
+            page = 1
+            while page:
+                response = self.__get_page(page, page_size)
+                page = self.__next_page(response, page)
+                yield response
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = 1
+            future = executor.submit(self.__get_page, page, page_size)
+            while future:
+                response = future.result()
+                page = self.__next_page(response, page)
+                future = executor.submit(
+                        self.__get_page, page, page_size) if page else None
+                yield response
+
+    def iter_entries(self, page_size=None, prefetch=False):
+        for response in self.iter_pages(page_size, prefetch):
+            for item in response['_embedded']['items']:
+                yield Entry(item)
+
+    def __get_page(self, page, page_size):
+        params = dict(self.params)
+        params[Params.PAGE] = page
+        params[Params.COUNT] = page_size
+        return GetListEntries(self.config, params).request().response
+
+    def __next_page(self, response, page):
+        page = response.get('page', page)
+        if 'next' in response.get('_links', {}):
+            return page + 1
+        if page < response.get('pages', page):
+            return page + 1
+        return None
+
     def _get_api_url(self):
         return self._build_url(GetListEntries.API_METHOD)
 
@@ -47,11 +99,21 @@ class GetListEntries(Api):
         ApiParams = self.ApiParams
         ApiValues = self.ApiValues
         count = self.__get_count(self.params[Params.COUNT])
+        detail = ApiValues.DETAIL.META
+        if Params.FULL_DETAIL in self.params and\
+                self.params[Params.FULL_DETAIL]:
+            detail = ApiValues.DETAIL.FULL
         api_params = {
             ApiParams.PER_PAGE.value: count,
-            ApiParams.DETAIL.value: ApiValues.DETAIL.META.value
+            ApiParams.DETAIL.value: detail.value
         }
 
+        if Params.PAGE in self.params and self.params[Params.PAGE]:
+            api_params[ApiParams.PAGE.value] = self.params[Params.PAGE]
+
+        if Params.SINCE in self.params and self.params[Params.SINCE]:
+            api_params[ApiParams.SINCE.value] = self.params[Params.SINCE]
+
         if Params.OLDEST in self.params and self.params[Params.OLDEST]:
             api_params[ApiParams.ORDER.value] = ApiValues.ORDER.ASC.value
 
@@ -5,6 +5,8 @@ from wallabag.api.api import Api, ApiMethod
 
 class GetTags(Api):
 
+    cacheable = True
+
     def __init__(self, config):
         Api.__init__(self, config)
 
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from wallabag.config import Options, Sections
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.3
+RETRY_STATUSES = (502, 503, 504)
+
+
+class ConnectionStats():
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.opened = 0
+
+    def request_sent(self):
+        with self.lock:
+            self.requests += 1
+
+    def connection_opened(self):
+        with self.lock:
+            self.opened += 1
+
+    def reused(self):
+        return max(self.requests - self.opened, 0)
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.opened = 0
+
+    def __str__(self):
+        return (f'requests: {self.requests}, '
+                f'connections opened: {self.opened}, '
+                f'reused: {self.reused()}')
+
+
+STATS = ConnectionStats()
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+
+    def _new_conn(self):
+        STATS.connection_opened()
+        return super()._new_conn()
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+
+    def _new_conn(self):
+        STATS.connection_opened()
+        return super()._new_conn()
+
+
+class CountingAdapter(HTTPAdapter):
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+    def send(self, request, *args, **kwargs):
+        STATS.request_sent()
+        return super().send(request, *args, **kwargs)
+
+
+class HttpSession():
+
+    __session = None
+    __probe_session = None
+    __lock = threading.Lock()
+
+    def get(config):
+        with HttpSession.__lock:
+            if not HttpSession.__session:
+                HttpSession.__session = HttpSession.create(config)
+            return HttpSession.__session
+
+    def probe(config):
+        """
+        The session of the url probes. A probe isn't retried: an
+        unreachable site costs a single timeout.
+        """
+        with HttpSession.__lock:
+            if not HttpSession.__probe_session:
+                HttpSession.__probe_session = HttpSession.create(
+                        config, retries=0)
+            return HttpSession.__probe_session
+
+    def create(config, retries=None):
+        log = logging.getLogger('wallabag.api')
+        pool_size = config.getint(
+                Sections.HTTP, Options.POOL_SIZE, DEFAULT_POOL_SIZE)
+        if retries is None:
+            retries = config.getint(
+                    Sections.HTTP, Options.RETRIES, DEFAULT_RETRIES)
+        log.debug('creating http session: pool size %d, retries %d',
+                  pool_size, retries)
+
+        adapter = CountingAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(
+                    total=retries,
+                    backoff_factor=DEFAULT_BACKOFF,
+                    status_forcelist=RETRY_STATUSES,
+                    raise_on_status=False) if retries else 0)
+        session = requests.Session()
+        session.headers['Connection'] = 'keep-alive'
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close():
+        with HttpSession.__lock:
+            if HttpSession.__session:
+                HttpSession.__session.close()
+                HttpSession.__session = None
+            if HttpSession.__probe_session:
+                HttpSession.__probe_session.close()
+                HttpSession.__probe_session = None
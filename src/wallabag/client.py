@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Entry point of the `wallabag` script.
+
+Commands are sent to the daemon (`wallabag daemon`) when one is running,
+otherwise they run in this process. Only the standard library is
+imported here, socket only when a command is sent, so that talking to
+the daemon and completing stay cheap.
+"""
+
+import json
+import os
+import sys
+
+SOCKET_DIRECTORY = "wallabag-cli"
+SOCKET_NAME = "daemon.sock"
+NO_DAEMON = "WALLABAG_NO_DAEMON"
+
+COMPLETE_COMMAND = "_complete"
+# commands using the terminal or the desktop of the client
+LOCAL_COMMANDS = ('config', 'daemon', 'open', 'repl', COMPLETE_COMMAND)
+LOCAL_OPTIONS = ('--debug21',)
+VALUE_OPTIONS = ('--config', '--debug-level')
+
+BUFFER_SIZE = 64 * 1024
+
+
+def get_socket_path():
+    directory = (os.environ.get('XDG_RUNTIME_DIR')
+                 or os.environ.get('XDG_CACHE_HOME')
+                 or os.path.expanduser(os.path.join('~', '.cache')))
+    return os.path.join(directory, SOCKET_DIRECTORY, SOCKET_NAME)
+
+
+def find_command(args):
+    """
+    Index of the command in `args`, after the global options.
+    """
+    for index, arg in enumerate(args):
+        if not arg.startswith('-') and not (
+                index and args[index - 1] in VALUE_OPTIONS):
+            return index
+    return None
+
+
+def get_option(args, name):
+    for index, arg in enumerate(args):
+        if arg == name and index + 1 < len(args):
+            return args[index + 1]
+        if arg.startswith(name + '='):
+            return arg[len(name) + 1:]
+    return None
+
+
+def receive(sock):
+    data = bytearray()
+    while True:
+        chunk = sock.recv(BUFFER_SIZE)
+        if not chunk:
+            return bytes(data)
+        data += chunk
+
+
+class DaemonError(Exception):
+    pass
+
+
+class Client():
+
+    def __init__(self, path=None):
+        self.path = path or get_socket_path()
+
+    def run(self, args):
+        """
+        Run the command line `args` on the daemon, print its output and
+        return the exit status. None if the command has to run in this
+        process: no daemon, a local command or an interactive one.
+        """
+        if os.environ.get(NO_DAEMON) or not Client.is_remote(args):
+            return None
+        try:
+            response = self.send({
+                'args': args,
+                'cwd': os.getcwd(),
+                'color': sys.stdout.isatty(),
+                'terminal': Client.__terminal_size()})
+        except DaemonError as error:
+            sys.stderr.write(f'wallabag daemon: {error}\n')
+            return 1
+        if response is None or response.get('fallback'):
+            return None
+        sys.stdout.write(response['stdout'])
+        sys.stderr.write(response['stderr'])
+        return response['code']
+
+    def stop(self):
+        """
+        Ask the daemon to stop, False if none is running.
+        """
+        try:
+            return self.send({'stop': True}) is not None
+        except DaemonError:
+            return True
+
+    def send(self, request):
+        """
+        Response of the daemon to `request`, None if no daemon listens.
+        Errors after the request was sent raise `DaemonError`: the
+        command may have run, so it can't be repeated in this process.
+        """
+        import socket
+
+        if not hasattr(socket, 'AF_UNIX'):
+            return None
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.path)
+            except OSError:
+                return None
+            try:
+                sock.sendall(json.dumps(request).encode('utf-8'))
+                sock.shutdown(socket.SHUT_WR)
+                return json.loads(receive(sock))
+            except (OSError, ValueError) as error:
+                raise DaemonError(f'connection lost: {error}')
+
+    def is_remote(args):
+        index = find_command(args)
+        options = args[:index] if index is not None else args
+        if any(arg.split('=')[0] in LOCAL_OPTIONS for arg in options):
+            return False
+        return index is None or args[index] not in LOCAL_COMMANDS
+
+    def __terminal_size():
+        try:
+            return list(os.get_terminal_size())
+        except OSError:
+            return []
+
+
+def main():
+    args = sys.argv[1:]
+    index = find_command(args)
+    if index is not None and args[index] == COMPLETE_COMMAND:
+        # answered from the cache, without click and the config
+        from wallabag import completion
+
+        sys.exit(completion.main(
+                get_option(args[:index], '--config'), args[index + 1:]))
+    code = Client().run(args)
+    if code is None:
+        from wallabag.wallabag import cli
+
+        cli(prog_name='wallabag')
+    sys.exit(code)
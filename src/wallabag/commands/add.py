@@ -4,11 +4,16 @@ from colorama import Fore
 
 from wallabag.api.add_entry import AddEntry, ApiMethod
 from wallabag.api.add_entry import Params as AddEntryParams
+from wallabag.api.api import ApiException
 from wallabag.api.entry_exists import EntryExists
+from wallabag.commands.bulk import BulkExecutor
 from wallabag.commands.command import Command
 from wallabag.commands.tags_param import TagsParam
 from wallabag.commands.params import Params
 from wallabag.entry import Entry
+from wallabag.journal import Journal
+from wallabag.known_urls import KnownUrls
+from wallabag import wclick
 
 
 class AddCommandParams(Params, TagsParam):
@@ -18,6 +23,7 @@ class AddCommandParams(Params, TagsParam):
     read = None
     tags = None
     return_url = None
+    probe = True
 
     def __init__(
         self,
@@ -27,6 +33,7 @@ class AddCommandParams(Params, TagsParam):
         read=None,
         tags=None,
         return_url=None,
+        probe=True,
     ):
         self.target_url = target_url
         self.title = title
@@ -34,6 +41,7 @@ class AddCommandParams(Params, TagsParam):
         self.read = read
         self.tags = tags
         self.return_url = return_url
+        self.probe = probe
 
     def validate(self):
         return self._validate_tags()
@@ -41,6 +49,8 @@ class AddCommandParams(Params, TagsParam):
 
 class AddCommand(Command):
 
+    journaled = True
+
     def __init__(self, config, params=None):
         Command.__init__(self)
         self.config = config
@@ -49,10 +59,16 @@ class AddCommand(Command):
     def _run(self):
         params = self.params
         api = EntryExists(self.config, params.target_url)
-        response = api.request().response
-        if "exists" in response and response["exists"] is not None:
+        known = KnownUrls.create(self.config)
+        entry_id = known.get(params.target_url) if known else None
+        if not entry_id:
+            entry_id = api.request().response.get("exists")
+            if entry_id and known:
+                known.add(params.target_url, entry_id)
+                known.save()
+        if entry_id:
             if self.params.return_url:
-                return True, api._build_url(ApiMethod.VIEW).format(response["exists"])
+                return True, api._build_url(ApiMethod.VIEW).format(entry_id)
             return True, "The url was already saved."
 
         entry = Entry(AddEntry(self.config, params.target_url, {
@@ -60,9 +76,173 @@ class AddCommand(Command):
             AddEntryParams.READ: params.read,
             AddEntryParams.STARRED: params.starred,
             AddEntryParams.TAGS: params.tags
-        }).request().response)
+        }, params.probe).request().response)
+        if known:
+            known.add(params.target_url, entry.entry_id)
+            known.save()
         if self.params.return_url:
             return True, api._build_url(ApiMethod.VIEW).format(entry.entry_id)
         return True, (
                 "Entry successfully added:\n\n"
                 f"\t{Fore.GREEN}{entry.entry_id}. {entry.title}{Fore.RESET}\n")
+
+    def _offline(self, journal):
+        params = self.params
+        return self._queue(
+                journal, f'add {params.target_url}', Journal.ADD,
+                url=params.target_url, title=params.title or None,
+                read=params.read, starred=params.starred, tags=params.tags)
+
+
+class AddItem(TagsParam):
+    """
+    A single line of a batch: URL[<TAB>TITLE[<TAB>TAGS]].
+    """
+
+    entry_id = None
+    status = None
+    checked = False
+
+    def __init__(self, url, title=None, tags=None):
+        self.url = url
+        self.title = title or None
+        self.tags = tags or None
+        if not self._validate_tags()[0]:
+            self.tags = None
+
+    def parse(line):
+        fields = [field.strip() for field in line.rstrip('\n').split('\t')]
+        if not fields[0] or fields[0].startswith('#'):
+            return None
+        return AddItem(*fields[:3])
+
+
+class AddBatchParams(Params, TagsParam):
+    source = None
+    title = None
+    starred = None
+    read = None
+    tags = None
+    jobs = BulkExecutor.DEFAULT_JOBS
+    quiet = False
+    probe = True
+
+    def __init__(self, source, title=None, starred=None, read=None,
+                 tags=None, jobs=BulkExecutor.DEFAULT_JOBS, quiet=False,
+                 probe=True):
+        self.source = source
+        self.title = title
+        self.starred = starred
+        self.read = read
+        self.tags = tags
+        self.jobs = jobs
+        self.quiet = quiet
+        self.probe = probe
+
+    def validate(self):
+        return self._validate_tags()
+
+
+class AddBatchCommand(Command):
+    """
+    Add the URLs read from a file, one result line per URL:
+
+        added|exists|failed <TAB> URL <TAB> ENTRY_ID or error
+
+    Duplicate URLs are skipped. URLs saved before are looked up in the
+    known URLs, the rest is checked with one request per chunk of URLs,
+    only new URLs are added concurrently. Per-line title and tags take
+    precedence over the command options.
+    """
+
+    ADDED = 'added'
+    EXISTS = 'exists'
+    FAILED = 'failed'
+
+    def __init__(self, config, params):
+        Command.__init__(self)
+        self.config = config
+        self.params = params
+
+    def _run(self):
+        items, duplicates = self.__read_items()
+        self.known = KnownUrls.create(self.config)
+        self.__check(items)
+        executor = BulkExecutor(self.params.jobs, quiet=self.params.quiet)
+        result = executor.run(items, self.__add, report=self.__report)
+        if self.known:
+            self.known.save()
+
+        added = sum(
+                1 for item in items if item.status == AddBatchCommand.ADDED)
+        return not result.failed, (
+                f'Added: {added}, '
+                f'exists: {len(result.succeeded) - added}, '
+                f'failed: {len(result.failed)}, '
+                f'duplicates: {duplicates}')
+
+    def __read_items(self):
+        items = []
+        urls = set()
+        duplicates = 0
+        for line in self.params.source:
+            item = AddItem.parse(line)
+            if not item:
+                continue
+            if item.url in urls:
+                duplicates += 1
+                continue
+            urls.add(item.url)
+            items.append(item)
+        return items, duplicates
+
+    def __check(self, items):
+        unknown = []
+        for item in items:
+            item.entry_id = self.known.get(item.url) if self.known else None
+            if item.entry_id:
+                item.checked = True
+            else:
+                unknown.append(item)
+        if not unknown:
+            return
+        try:
+            exists = EntryExists.check(
+                    self.config, [item.url for item in unknown])
+        except ApiException as error:
+            self.log.debug("batched existence check failed: %s", error)
+            return
+        for item in unknown:
+            item.entry_id = exists.get(item.url)
+            item.checked = True
+            if item.entry_id and self.known:
+                self.known.add(item.url, item.entry_id)
+
+    def __add(self, item):
+        if not item.checked:
+            response = EntryExists(self.config, item.url).request().response
+            item.entry_id = response.get("exists")
+        if item.entry_id:
+            item.status = AddBatchCommand.EXISTS
+            return item.status
+
+        params = self.params
+        entry = Entry(AddEntry(self.config, item.url, {
+            AddEntryParams.TITLE: item.title or params.title,
+            AddEntryParams.READ: params.read,
+            AddEntryParams.STARRED: params.starred,
+            AddEntryParams.TAGS: item.tags or params.tags
+        }, params.probe).request().response)
+        item.entry_id = entry.entry_id
+        item.status = AddBatchCommand.ADDED
+        if self.known:
+            self.known.add(item.url, entry.entry_id)
+        return item.status
+
+    def __report(self, item, status, error):
+        if self.params.quiet and not error:
+            return
+        if error:
+            wclick.echo(f'{AddBatchCommand.FAILED}\t{item.url}\t{error}')
+        else:
+            wclick.echo(f'{status}\t{item.url}\t{item.entry_id}')
@@ -1,36 +1,20 @@
 # -*- coding: utf-8 -*-
 
-from enum import Enum, auto
-
-import delorean
-import humanize
-
 from wallabag.commands.command import Command
 from wallabag.commands.params import Params
+from wallabag.commands.subcommands import AnnoSubcommand
 from wallabag.api.get_entry import GetEntry
 from wallabag.api.delete_annotation import DeleteAnnotation
 from wallabag.entry import Entry
-
-
-class AnnoSubcommand(Enum):
-    LIST = auto()
-    REMOVE = auto()
-    SHOW = auto()
-
-    def list():
-        return [c.name for c in AnnoSubcommand]
-
-    def get(name):
-        for command in AnnoSubcommand:
-            if command.name == name.upper():
-                return command
-        return AnnoSubcommand.LIST
+from wallabag.mirror import Mirror
+from wallabag import wtime
 
 
 class AnnoCommandParams(Params):
     command = AnnoSubcommand.LIST
     entry_id = None
     anno_id = None
+    cached = False
 
     def validate(self):
         if self.command in (AnnoSubcommand.LIST, AnnoSubcommand.SHOW):
@@ -57,8 +41,7 @@ class AnnoCommand(Command):
     def _run(self):
         params = self.params
         if params.command in (AnnoSubcommand.LIST, AnnoSubcommand.SHOW):
-            api = GetEntry(self.config, params.entry_id)
-            entry = Entry(api.request().response)
+            entry = self.__get_entry()
             result = []
             for anno in sorted(
                     entry.annotations, key=lambda x: int(x['id'])):
@@ -69,15 +52,26 @@ class AnnoCommand(Command):
             return True, 'Annotation successfully deleted'
         return False, "Unknown command"
 
+    def __get_entry(self):
+        if self.params.cached:
+            return Mirror.create(self.config).get_entry(self.params.entry_id)
+        response = GetEntry(
+                self.config, self.params.entry_id).request().response
+        Mirror.store_if_exists(self.config, [response])
+        return Entry(response)
+
+    def __get_anno_age(self, anno):
+        return wtime.naturaltime(wtime.parse(anno['updated_at']))
+
     def __get_anno_string(self, anno):
-        past = delorean.utcnow() - delorean.parse(anno['updated_at'])
+        age = self.__get_anno_age(anno)
         return (f"{anno['id']}. {anno['quote']} "
-                f"({humanize.naturaltime(past)}) [{len(anno['text'])}]")
+                f"({age}) [{len(anno['text'])}]")
 
     def __get_anno_full(self, anno):
         if self.params.anno_id:
             if self.params.anno_id != int(anno['id']):
                 return ""
-        past = delorean.utcnow() - delorean.parse(anno['updated_at'])
+        age = self.__get_anno_age(anno)
         return (f"{anno['id']}. {anno['quote']} "
-                f"({humanize.naturaltime(past)}):\n\n\t{anno['text']}\n")
+                f"({age}):\n\n\t{anno['text']}\n")
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from colorama import Fore
+
+from wallabag.api.api import Error, RequestException
+from wallabag import wclick
+
+
+class BulkResult():
+
+    def __init__(self):
+        self.succeeded = []
+        self.failed = []
+
+    def summary(self, action, skipped=None):
+        if skipped is None:
+            result = f'{action}: {len(self.succeeded)}, '
+        else:
+            result = (f'{action}: {len(self.succeeded) - skipped}, '
+                      f'skipped: {skipped}, ')
+        result += f'failed: {len(self.failed)}'
+        if self.failed:
+            ids = ", ".join([str(entry_id) for entry_id, _ in self.failed])
+            result += f'\nFailed IDs: {ids}'
+        return result
+
+
+class BulkExecutor():
+    """
+    Run one request per entry with bounded concurrency.
+
+    Requests failing with server errors the session doesn't retry itself
+    are retried with exponential backoff; connection errors and the
+    statuses of the session's retries have been retried already. A
+    failed entry doesn't stop the batch, progress is printed in the
+    order of entries.
+    """
+
+    DEFAULT_JOBS = 4
+    RETRIES = 2
+    BACKOFF = 0.5
+
+    def __init__(self, jobs=DEFAULT_JOBS, quiet=False,
+                 retries=RETRIES, backoff=BACKOFF):
+        self.log = logging.getLogger('wallabag.bulk')
+        self.jobs = max(jobs or 1, 1)
+        self.quiet = quiet
+        self.retries = retries
+        self.backoff = backoff
+
+    def run(self, entries, action, title=None, report=None,
+            deleting=False):
+        """
+        Call `report(entry, value, error)` for every entry in order, by
+        default a progress line with the title is printed. With
+        `deleting`, a retried action failing with 404 succeeded: the
+        failed attempt deleted the entry.
+        """
+        report = report or functools.partial(self.__progress, title)
+        result = BulkResult()
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [
+                    (entry, executor.submit(
+                        self.__retry, action, entry, deleting))
+                    for entry in entries]
+            for entry, future in futures:
+                try:
+                    value = future.result()
+                    result.succeeded.append(entry.entry_id)
+                    report(entry, value, None)
+                except Exception as error:
+                    self.log.debug('bulk request failed: %s', error)
+                    result.failed.append((entry.entry_id, error))
+                    report(entry, None, error)
+        return result
+
+    def __retry(self, action, entry, deleting):
+        attempt = 0
+        while True:
+            try:
+                return action(entry)
+            except RequestException as error:
+                if deleting and attempt and error.response and (
+                        error.response.error == Error.HTTP_NOT_FOUND):
+                    return None
+                if attempt >= self.retries or not self.__retryable(error):
+                    raise
+                delay = self.backoff * (2 ** attempt)
+                self.log.debug(
+                        'retrying entry %s in %s sec', entry.entry_id, delay)
+                time.sleep(delay)
+                attempt += 1
+
+    def __retryable(self, error):
+        from wallabag.api.session import RETRY_STATUSES
+
+        response = error.response
+        if not response:
+            return False
+        return response.error == Error.UNKNOWN_ERROR and (
+                response.status_code not in RETRY_STATUSES)
+
+    def __progress(self, title, entry, value, error):
+        if self.quiet:
+            return
+        if error:
+            status = f'{Fore.RED}{error}{Fore.RESET}'
+        else:
+            status = f'{Fore.GREEN}success{Fore.RESET}'
+        wclick.echo(f'{title}: {entry.title}\t...\t{status}')
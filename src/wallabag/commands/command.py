@@ -2,12 +2,15 @@
 
 import logging
 from abc import ABC, abstractmethod
-from wallabag.api.api import ApiException
+from wallabag.api.api import ApiException, ConnectionException
 
 
 class Command(ABC):
 
     params = None
+    # the changes are queued in the journal when the server is unreachable
+    journaled = False
+    queued = False
 
     def __init__(self):
         self.log = logging.getLogger('wallabag.command')
@@ -20,9 +23,38 @@ class Command(ABC):
             return False, msg
         try:
             return self._run()
+        except ConnectionException as ex:
+            if self.journaled:
+                result = self.__offline()
+                if result:
+                    return result
+            return False, str(ex)
         except ApiException as ex:
             return False, str(ex)
 
+    def _offline(self, journal):
+        """
+        Queue the changes of the command in `journal` with `_queue`, the
+        server being unreachable. Returns the result like `_run`.
+        """
+        return None
+
+    def _queue(self, journal, description, operation, **fields):
+        journal.append(operation, **fields)
+        self.queued = True
+        return True, (
+                f'The server is unreachable, queued: {description}\n'
+                'Run `wallabag flush` to send the queued changes.')
+
+    def __offline(self):
+        from wallabag.journal import Journal
+
+        journal = Journal.create(self.config)
+        if not journal:
+            return None
+        self.log.debug('server unreachable, queueing the changes')
+        return self._offline(journal)
+
     def __validate(self):
         if self.params:
             self.log.debug('validating parameters: %s', self.params.__dict__)
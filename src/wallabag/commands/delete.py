@@ -7,6 +7,9 @@ from wallabag.api.delete_entry import DeleteEntry
 from wallabag.commands.command import Command
 from wallabag.commands.params import Params
 from wallabag.entry import Entry
+from wallabag.journal import Journal
+from wallabag.known_urls import KnownUrls
+from wallabag.mirror import Mirror
 from wallabag import wclick
 
 
@@ -22,6 +25,9 @@ class DeleteCommand(Command):
 
     WARN_MSG = 'You are going to remove the following entry'
 
+    journaled = True
+    confirmed = False
+
     def __init__(self, config, params):
         Command.__init__(self)
         self.config = config
@@ -31,14 +37,33 @@ class DeleteCommand(Command):
         if not self.params.force:
             request = GetEntry(self.config, self.params.entry_id).request()
             entr = Entry(request.response)
-            confirm_msg = (
-                    f"{Back.RED}{DeleteCommand.WARN_MSG}:{Back.RESET}\n\n"
-                    f"\t{entr.title}\n\n"
-                    "Continue?")
-            if not wclick.confirm(confirm_msg):
+            if not self.__confirm(entr.title):
                 return True, 'Cancelling'
 
         request = DeleteEntry(self.config, self.params.entry_id).request()
+        known = KnownUrls.create(self.config)
+        if known:
+            known.forget([self.params.entry_id])
+            known.save()
         if not self.params.quiet:
             return True, "Entry successfully deleted."
         return True, None
+
+    def _offline(self, journal):
+        entry_id = self.params.entry_id
+        entry = Mirror.get_if_exists(self.config, entry_id)
+        if not self.params.force and not self.confirmed:
+            if not self.__confirm(entry.title if entry else f'ID: {entry_id}'):
+                return True, 'Cancelling'
+        return self._queue(
+                journal, f'delete entry {entry_id}', Journal.DELETE,
+                entry_id=int(entry_id),
+                updated_at=entry.updated_at if entry else None)
+
+    def __confirm(self, title):
+        confirm_msg = (
+                f"{Back.RED}{DeleteCommand.WARN_MSG}:{Back.RESET}\n\n"
+                f"\t{title}\n\n"
+                "Continue?")
+        self.confirmed = wclick.confirm(confirm_msg)
+        return self.confirmed
@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 
-from colorama import Fore, Back
+from colorama import Back
 
+from wallabag.commands.bulk import BulkExecutor
 from wallabag.commands.tags_param import TagsParam
 from wallabag.commands.command import Command
 from wallabag.commands.params import Params
 from wallabag.api.get_list_entries import (
         GetListEntries, Params as ListEntriesParams)
 from wallabag.api.delete_entry import DeleteEntry
-from wallabag.entry import Entry
+from wallabag.known_urls import KnownUrls
 from wallabag import wclick
 
 
@@ -16,11 +17,14 @@ class DeleteByTagsParams(Params, TagsParam):
     tags = None
     force = None
     quiet = None
+    jobs = BulkExecutor.DEFAULT_JOBS
 
-    def __init__(self, tags, force=False, quiet=False):
+    def __init__(self, tags, force=False, quiet=False,
+                 jobs=BulkExecutor.DEFAULT_JOBS):
         self.tags = tags
         self.force = force
         self.quiet = quiet
+        self.jobs = jobs
 
     def validate(self):
         return self._validate_tags()
@@ -35,11 +39,9 @@ class DeleteByTags(Command):
 
     def _run(self):
         api = GetListEntries(self.config, {
-            ListEntriesParams.TAGS: self.params.tags,
-            ListEntriesParams.COUNT: 100
+            ListEntriesParams.TAGS: self.params.tags
         })
-        entries = Entry.create_list(
-                api.request().response['_embedded']["items"])
+        entries = list(api.iter_entries(prefetch=True))
         if not self.params.force:
             titles = "\n\t".join([x.title for x in entries])
             confirm_msg = (
@@ -49,11 +51,13 @@ class DeleteByTags(Command):
             if not wclick.confirm(confirm_msg):
                 return True, 'Cancelling'
 
-        for entry in entries:
-            if not self.params.quiet:
-                wclick.echo(f'Deleting entry: {entry.title}', nl=False)
-            DeleteEntry(self.config, entry.entry_id).request()
-            if not self.params.quiet:
-                wclick.echo(f'\t...\t{Fore.GREEN}success{Fore.RESET}')
-
-        return True, None
+        result = BulkExecutor(self.params.jobs, self.params.quiet).run(
+                entries,
+                lambda entry: DeleteEntry(
+                    self.config, entry.entry_id).request(),
+                'Deleting entry', deleting=True)
+        known = KnownUrls.create(self.config)
+        if known:
+            known.forget(result.succeeded)
+            known.save()
+        return not result.failed, result.summary('Deleted')
@@ -1,15 +1,26 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime
+import itertools
+import os
+import sys
+import tempfile
+import threading
 from pathlib import PurePath, Path
 
+from colorama import Fore
+
+from wallabag.commands.bulk import BulkExecutor
 from wallabag.commands.params import Params
 from wallabag.commands.command import Command
+from wallabag.commands.list import ListCommand, ListParams
+from wallabag.api.api import Response
 from wallabag.api.export_entry import ExportEntry
 from wallabag.api.get_entry import GetEntry
 from wallabag.entry import Entry
 from wallabag.format_type import FormatType, ScreenType, format_to_screen
 from wallabag.export.export_factory import ExportFactory
+from wallabag.mirror import Mirror
+from wallabag import wclick, wtime
 
 
 class ExportCommandParams(Params):
@@ -17,6 +28,7 @@ class ExportCommandParams(Params):
     type = None
     output_file = None
     filename_with_id = True
+    cached = False
 
     def __init__(
             self, entry_id, type: FormatType, output_file: PurePath = None):
@@ -43,6 +55,24 @@ class ExportCommandParams(Params):
         return True, None
 
 
+FILE_MODE = None
+FILE_MODE_LOCK = threading.Lock()
+
+
+def _file_mode():
+    """
+    The mode of a file created by open(). The umask can only be read by
+    replacing it, it's read once.
+    """
+    global FILE_MODE
+    with FILE_MODE_LOCK:
+        if FILE_MODE is None:
+            umask = os.umask(0o022)
+            os.umask(umask)
+            FILE_MODE = 0o666 & ~umask
+        return FILE_MODE
+
+
 class ExportCommand(Command):
 
     def __init__(self, config, params):
@@ -52,55 +82,191 @@ class ExportCommand(Command):
 
     def _run(self):
         type = self.params.type
-        output_file = self.params.output_file
         extension = FormatType.extension(type)
-        result = self.__get_result(type, extension)
-        output_file = self.__check_output_file(result, output_file, extension)
-        self.__create_output_path(output_file)
-        self.__fix_file_name(result, extension)
-        output_file = PurePath(
-                f'{Path(output_file).resolve()}/'
-                f'{self.__get_filename(result.filename)}')
-
-        with open(output_file, 'wb') as file:
-            file.write(result.content)
+        output_path, filename = self.__split_output_file(
+                self.params.output_file, extension)
+        self._create_output_path(output_path)
+        output_file = self._export(
+                self.params.entry_id, Path(output_path).resolve(), filename,
+                progress=self.__progress)
         return True, f'Exported to: {output_file}'
 
-    def __get_result(self, type, extension):
+    def _export(self, entry_id, output_path, filename=None, entry=None,
+                progress=None):
+        """
+        Download or render an entry into `output_path` through a temporary
+        file, return the path of the exported file. The name is
+        `filename`, the one sent by the server or the entry title.
+        """
+        extension = FormatType.extension(self.params.type)
+        fd, temp_path = tempfile.mkstemp(
+                dir=output_path, prefix='.', suffix='.part')
+        try:
+            # mkstemp creates the file private to the user
+            os.fchmod(fd, _file_mode())
+            with os.fdopen(fd, 'wb') as file:
+                result = self.__get_result(
+                        entry_id, extension, file, entry, progress)
+            if filename:
+                result.filename = filename
+            self.__fix_file_name(entry_id, result, extension)
+            output_file = PurePath(
+                    output_path, self._get_filename(entry_id, result.filename))
+            os.replace(temp_path, output_file)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return output_file
+
+    def __get_result(self, entry_id, extension, file, entry, progress):
+        type = self.params.type
         if type.name in ScreenType.list():
-            result = GetEntry(
-                        self.config,
-                        self.params.entry_id).request()
-            entry = Entry(result.response)
+            if not entry or not entry.content:
+                entry = self.__get_entry(entry_id)
+            result = Response(200, content_type=None)
             result.filename = f'{entry.title}.{extension}'
-            result.content = bytes(ExportFactory.create(
-                    entry, None, format_to_screen(type), None).run(), 'utf-8')
+            file.write(bytes(ExportFactory.create(
+                    entry, None, format_to_screen(type), None).run(), 'utf-8'))
         else:
             result = ExportEntry(
-                    self.config,
-                    self.params.entry_id,
-                    type.name.lower()).request()
+                    self.config, entry_id,
+                    type.name.lower()).request_to(file, progress)
         return result
 
-    def __check_output_file(self, result, output_file, extension):
+    def __get_entry(self, entry_id):
+        if self.params.cached:
+            mirror = Mirror.create(self.config)
+            try:
+                return mirror.get_entry(entry_id)
+            finally:
+                mirror.close()
+        return Entry(GetEntry(self.config, entry_id).request().response)
+
+    def __progress(self, received, total):
+        from humanize import naturalsize
+
+        if total:
+            wclick.progress(
+                    f'{naturalsize(received)} of {naturalsize(total)} '
+                    f'({received * 100 // total}%)')
+        else:
+            wclick.progress(naturalsize(received))
+
+    def __split_output_file(self, output_file, extension):
         if output_file.name.endswith(f'.{extension}'):
-            result.filename = output_file.name
-            output_file = output_file.parent
-        return output_file
+            return output_file.parent, output_file.name
+        return output_file, None
 
-    def __create_output_path(self, output_file):
+    def _create_output_path(self, output_file):
         if not Path(output_file).exists():
             Path(output_file).mkdir(parents=True)
 
-    def __fix_file_name(self, result, extension):
+    def __fix_file_name(self, entry_id, result, extension):
         if not result.filename or result.filename.startswith('.'):
             entry = Entry(
                 GetEntry(
                     self.config,
-                    self.params.entry_id).request().response)
+                    entry_id).request().response)
             result.filename = f'{entry.title}.{extension}'
 
-    def __get_filename(self, name):
+    def _get_filename(self, entry_id, name):
         if self.params.filename_with_id:
-            return f'{self.params.entry_id}. {name}'
+            return f'{entry_id}. {name}'
         return name
+
+
+class ExportListParams(ListParams):
+    type = None
+    output_file = None
+    filename_with_id = True
+    jobs = BulkExecutor.DEFAULT_JOBS
+    quiet = False
+
+    def __init__(self, type: FormatType, output_file: PurePath = None,
+                 quantity=None, filter_read=None, filter_starred=None,
+                 oldest=False, tags=None, untagged=False,
+                 jobs=BulkExecutor.DEFAULT_JOBS, quiet=False):
+        ListParams.__init__(
+                self, quantity, filter_read, filter_starred, oldest,
+                tags=tags, untagged=untagged)
+        self.type = type
+        self.output_file = output_file
+        self.jobs = jobs
+        self.quiet = quiet
+
+    def validate(self):
+        if not self.type:
+            return False, 'Type not specified'
+
+        if self.type == FormatType.UNSUPPORTED:
+            return False, 'Unsupported type'
+
+        if not self.output_file:
+            self.output_file = Path.cwd()
+        elif self.output_file.name.endswith(
+                f'.{FormatType.extension(self.type)}'):
+            return False, 'Output should be a directory'
+
+        if self.quantity is None:
+            self.quantity = sys.maxsize
+        return ListParams.validate(self)
+
+
+class ExportListCommand(ExportCommand):
+    """
+    Export the entries matching the filters of `list` into a directory,
+    several at a time. Files are named after the entry titles, an entry
+    whose file is newer than its last update is skipped.
+    """
+
+    EXPORTED = 'exported'
+    SKIPPED = 'skipped'
+
+    def _run(self):
+        params = self.params
+        self._create_output_path(params.output_file)
+        self.output_path = Path(params.output_file).resolve()
+        self.extension = FormatType.extension(params.type)
+        self.skipped = 0
+
+        entries = list(itertools.islice(
+                ListCommand(self.config, params).iter_entries(
+                    params.quantity), params.quantity))
+        result = BulkExecutor(params.jobs, params.quiet).run(
+                entries, self.__export, report=self.__report)
+        return not result.failed, result.summary(
+                'Exported', skipped=self.skipped)
+
+    def __export(self, entry):
+        filename = ExportListCommand.__entry_filename(entry, self.extension)
+        output_file = Path(
+                self.output_path,
+                self._get_filename(entry.entry_id, filename))
+        if self.__is_up_to_date(entry, output_file):
+            return ExportListCommand.SKIPPED
+        self._export(entry.entry_id, self.output_path, filename, entry)
+        return ExportListCommand.EXPORTED
+
+    def __report(self, entry, status, error):
+        if status == ExportListCommand.SKIPPED:
+            self.skipped += 1
+        if self.params.quiet:
+            return
+        if error:
+            status = f'{Fore.RED}{error}{Fore.RESET}'
+        else:
+            status = f'{Fore.GREEN}{status}{Fore.RESET}'
+        wclick.echo(f'Exporting entry: {entry.title}\t...\t{status}')
+
+    def __entry_filename(entry, extension):
+        title = entry.title.replace(os.sep, '-')
+        return f'{title}.{extension}'
+
+    def __is_up_to_date(self, entry, output_file):
+        if not entry.updated_at:
+            return False
+        try:
+            modified = os.stat(output_file).st_mtime
+        except OSError:
+            return False
+        return modified > wtime.parse(entry.updated_at).timestamp()
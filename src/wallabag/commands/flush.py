@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+from wallabag.api.add_entry import AddEntry, Params as AddEntryParams
+from wallabag.api.add_tag_to_entry import AddTagToEntry, Params as AddTagParams
+from wallabag.api.api import Error, RequestException, ValueException
+from wallabag.api.delete_entry import DeleteEntry
+from wallabag.api.delete_tag_by_id import DeleteTagsById
+from wallabag.api.delete_tag_from_entry import DeleteTagFromEntry
+from wallabag.api.delete_tags_by_label import DeleteTagsByLabel
+from wallabag.api.entry_exists import EntryExists
+from wallabag.api.get_entry import GetEntry
+from wallabag.api.update_entry import UpdateEntry, Params as UpdateEntryParams
+from wallabag.commands.bulk import BulkExecutor
+from wallabag.commands.command import Command
+from wallabag.commands.params import Params
+from wallabag.entry import Entry
+from wallabag.journal import ConflictException, Journal
+from wallabag.known_urls import KnownUrls
+from wallabag.mirror import Mirror
+from wallabag import wclick, wtime
+
+
+class FlushCommandParams(Params):
+    force = False
+    quiet = False
+    jobs = BulkExecutor.DEFAULT_JOBS
+    # changes found in conflict by an earlier replay stay queued untried
+    skip_conflicts = False
+
+    def __init__(self, force=False, quiet=False,
+                 jobs=BulkExecutor.DEFAULT_JOBS, skip_conflicts=False):
+        self.force = force
+        self.quiet = quiet
+        self.jobs = jobs
+        self.skip_conflicts = skip_conflicts
+
+
+class FlushCommand(Command):
+    """
+    Send the changes queued while the server was unreachable, one result
+    line per merged change:
+
+        replayed|conflict|queued|failed <TAB> CHANGE <TAB> error
+
+    The changes of different entries are sent concurrently. A change of
+    an entry updated on the server since it was queued is a conflict and
+    stays queued unless forced, as do changes failing with connection or
+    server errors. Changes the server rejects, e.g. of deleted entries,
+    are dropped. A change in conflict is marked in the journal, the
+    automatic replay after other commands skips it.
+    """
+
+    REPLAYED = 'replayed'
+    CONFLICT = 'conflict'
+    QUEUED = 'queued'
+    FAILED = 'failed'
+
+    # the entry or the tag is gone, or the change is invalid
+    DROP_ERRORS = (Error.HTTP_BAD_REQUEST, Error.HTTP_NOT_FOUND)
+
+    def __init__(self, config, params=None):
+        Command.__init__(self)
+        self.config = config
+        self.params = params or FlushCommandParams()
+
+    def _run(self):
+        journal = Journal.create(self.config)
+        if not journal:
+            return True, 'The journal is disabled.'
+        with journal.lock():
+            records, size = journal.read()
+            if not records:
+                return True, 'No queued changes.'
+            changes = Journal.coalesce(records)
+            pending = [change for change in changes if not change.is_empty()]
+            self.statuses = {}
+            self.updated = {}
+            replayed = pending
+            if self.params.skip_conflicts:
+                replayed = [change for change in pending
+                            if not change.conflict]
+                for change in pending:
+                    if change.conflict:
+                        self.statuses[id(change)] = FlushCommand.CONFLICT
+            executor = BulkExecutor(self.params.jobs)
+            for phase in FlushCommand.__phases(replayed):
+                executor.run(phase, self.__replay, report=self.__report)
+                if any(self.statuses[id(change)] == FlushCommand.QUEUED
+                       for change in phase):
+                    # the later changes may depend on the ones left
+                    break
+            for change in pending:
+                self.statuses.setdefault(id(change), FlushCommand.QUEUED)
+            journal.replace(self.__kept(records, pending), size)
+
+        counts = {status: 0 for status in (
+            FlushCommand.REPLAYED, FlushCommand.CONFLICT,
+            FlushCommand.QUEUED, FlushCommand.FAILED)}
+        for status in self.statuses.values():
+            counts[status] += 1
+        result = (
+                f'Replayed: {counts[FlushCommand.REPLAYED]}, '
+                f'cancelled out: {len(changes) - len(pending)}, '
+                f'conflicts: {counts[FlushCommand.CONFLICT]}, '
+                f'still queued: {counts[FlushCommand.QUEUED]}, '
+                f'failed: {counts[FlushCommand.FAILED]}')
+        if counts[FlushCommand.CONFLICT]:
+            result += (
+                    '\nEntries changed on the server keep their changes '
+                    'queued, use `flush --force` to apply them anyway.')
+        return counts[FlushCommand.REPLAYED] == len(pending), result
+
+    def __phases(changes):
+        """
+        The changes in runs replayed one after the other: the entry
+        changes between two tag deletions concurrently, a tag deletion
+        on its own.
+        """
+        phase = []
+        for change in changes:
+            if change.operation in (Journal.DELETE_TAGS, Journal.DELETE_TAG):
+                if phase:
+                    yield phase
+                    phase = []
+                yield [change]
+            else:
+                phase.append(change)
+        if phase:
+            yield phase
+
+    def __kept(self, records, changes):
+        """
+        The records of the changes left queued, in their order. A change
+        partly replayed keeps only what is left of it, a change in
+        conflict is marked as such.
+        """
+        kept = {}
+        for change in changes:
+            if self.statuses[id(change)] in (
+                    FlushCommand.CONFLICT, FlushCommand.QUEUED):
+                for record in change.records:
+                    kept[id(record)] = change
+        result = []
+        for record in records:
+            change = kept.get(id(record))
+            if not change:
+                continue
+            if not change.resolved:
+                left = [record]
+            elif record is change.records[0]:
+                left = change.remaining()
+            else:
+                left = []
+            if self.statuses[id(change)] == FlushCommand.CONFLICT:
+                left = [dict(item, conflict=True) for item in left]
+            result.extend(left)
+        return result
+
+    def __replay(self, change):
+        if change.operation == Journal.ADD:
+            return self.__add(change)
+        if change.operation == Journal.DELETE_TAGS:
+            DeleteTagsByLabel(self.config, ",".join(change.labels)).request()
+            Mirror.remove_tags_if_exists(
+                    self.config, labels=change.labels)
+            return None
+        if change.operation == Journal.DELETE_TAG:
+            DeleteTagsById(self.config, change.tag_id).request()
+            Mirror.remove_tags_if_exists(
+                    self.config, tag_ids=[change.tag_id])
+            return None
+
+        if not change.resolved and change.entry_id in self.updated:
+            # changed by an earlier change of this replay
+            change.updated_at = self.updated[change.entry_id]
+        entry = Entry(
+                GetEntry(self.config, change.entry_id).request().response)
+        self.__check_conflict(change, entry)
+        if not change.resolved:
+            change.resolve(entry)
+        if change.deleted:
+            DeleteEntry(self.config, change.entry_id).request()
+            known = KnownUrls.create(self.config)
+            if known:
+                known.forget([change.entry_id])
+                known.save()
+            return None
+
+        response = None
+        if change.title or change.read is not None or (
+                change.starred is not None):
+            response = UpdateEntry(self.config, change.entry_id, {
+                UpdateEntryParams.TITLE: change.title,
+                UpdateEntryParams.STAR: change.starred,
+                UpdateEntryParams.READ: change.read
+            }).request().response
+            change.title = change.read = change.starred = None
+            FlushCommand.__sent(change, response)
+        for tag in entry.tags:
+            if tag['slug'] in change.removed_tags or (
+                    tag['label'] in change.removed_tags):
+                response = DeleteTagFromEntry(
+                        self.config, change.entry_id,
+                        tag['id']).request().response
+                FlushCommand.__sent(change, response)
+        change.removed_tags = []
+        if change.tags:
+            response = AddTagToEntry(self.config, {
+                AddTagParams.ENTRY_ID: change.entry_id,
+                AddTagParams.TAGS: ",".join(change.tags)
+            }).request().response
+            change.tags = []
+            FlushCommand.__sent(change, response)
+        self.updated[change.entry_id] = change.updated_at
+        if response:
+            Mirror.store_if_exists(self.config, [response])
+        return None
+
+    def __sent(change, response):
+        """
+        Follow the update time of the entry changed by a request, so that
+        a resumed replay doesn't see its own changes as a conflict.
+        """
+        if isinstance(response, dict) and response.get('updated_at'):
+            change.updated_at = response['updated_at']
+
+    def __add(self, change):
+        known = KnownUrls.create(self.config)
+        entry_id = known.get(change.url) if known else None
+        if not entry_id:
+            entry_id = EntryExists(
+                    self.config, change.url).request().response.get("exists")
+        if not entry_id:
+            entry = Entry(AddEntry(self.config, change.url, {
+                AddEntryParams.TITLE: change.title,
+                AddEntryParams.READ: change.read,
+                AddEntryParams.STARRED: change.starred,
+                AddEntryParams.TAGS: ",".join(change.tags) or None
+            }).request().response)
+            entry_id = entry.entry_id
+        if known:
+            known.add(change.url, entry_id)
+            known.save()
+        return entry_id
+
+    def __check_conflict(self, change, entry):
+        if self.params.force or not entry.updated_at:
+            return
+        if change.updated_at:
+            conflict = entry.updated_at != change.updated_at
+        else:
+            conflict = wtime.parse(entry.updated_at).timestamp() > change.time
+        if conflict:
+            raise ConflictException(
+                    'The entry changed on the server',
+                    f'updated at {entry.updated_at}')
+
+    def __report(self, change, value, error):
+        if not error:
+            status = FlushCommand.REPLAYED
+        elif isinstance(error, ConflictException):
+            status = FlushCommand.CONFLICT
+        elif isinstance(error, ValueException) or (
+                isinstance(error, RequestException) and error.response
+                and error.response.error in FlushCommand.DROP_ERRORS):
+            status = FlushCommand.FAILED
+        else:
+            status = FlushCommand.QUEUED
+        self.statuses[id(change)] = status
+        if self.params.quiet and not error:
+            return
+        wclick.echo(f'{status}\t{change}\t{error or ""}'.rstrip('\t'))
@@ -5,11 +5,14 @@ from colorama import Fore
 from wallabag.commands.command import Command
 from wallabag.commands.params import Params
 from wallabag.entry import Entry
+from wallabag.mirror import Mirror
 from wallabag.api.get_entry import GetEntry
+from wallabag import wtime
 
 
 class InfoCommandParams(Params):
     entry_id = None
+    cached = False
 
     def __init__(self, entry_id):
         self.entry_id = entry_id
@@ -28,11 +31,17 @@ class InfoCommand(Command):
         self.params = params if params else InfoCommandParams(None)
 
     def _run(self):
-        entry = Entry(
-                GetEntry(
-                    self.config, self.params.entry_id).request().response)
+        entry = self.__get_entry()
         return True, self.__entry_to_string(entry)
 
+    def __get_entry(self):
+        if self.params.cached:
+            return Mirror.create(self.config).get_entry(self.params.entry_id)
+        response = GetEntry(
+                self.config, self.params.entry_id).request().response
+        Mirror.store_if_exists(self.config, [response])
+        return Entry(response)
+
     def __entry_to_string(self, entry):
         f_c = Fore.LIGHTBLUE_EX
         f_rst = Fore.RESET
@@ -66,7 +75,7 @@ class InfoCommand(Command):
                 f'{f_c}Is read{f_rst}: {entry.read}\n'
                 f'{f_c}Is starred{f_rst}: {entry.starred}\n'
                 f'{f_c}Created at{f_rst}: '
-                f'{entry.created_at.format_datetime()}\n'
+                f'{wtime.format_datetime(entry.created_at)}\n'
                 f'{published_by}'
                 f'{f_c}Reading time{f_rst}: {entry.reading_time} min\n'
                 f'{preview_picture}')
@@ -1,11 +1,9 @@
 # -*- coding: utf-8 -*-
 
-import os
+import itertools
 import sys
 import textwrap
 
-import tabulate
-
 from colorama import Fore
 
 from wallabag.api.get_list_entries import (
@@ -13,7 +11,8 @@ from wallabag.api.get_list_entries import (
 from wallabag.commands.command import Command
 from wallabag.commands.params import Params
 from wallabag.commands.tags_param import TagsParam
-from wallabag.entry import Entry
+from wallabag.mirror import Mirror
+from wallabag import wclick
 
 
 class ListParams(Params, TagsParam):
@@ -24,6 +23,7 @@ class ListParams(Params, TagsParam):
     trim = False
     tags = None
     untagged = False
+    cached = False
 
     def __init__(self, quantity=None, filter_read=None, filter_starred=None,
                  oldest=None, trim=None, tags=None, untagged=False):
@@ -54,24 +54,44 @@ class ListCommand(Command):
         self.params = params or ListParams()
 
     def _run(self):
+        quantity = self.__get_quantity()
+        entries = self.iter_entries(quantity)
+        return True, self._print_entries(
+                list(itertools.islice(entries, quantity)))
+
+    def iter_entries(self, quantity):
+        """
+        Entries matching the filters, from the mirror in cached mode.
+        """
+        if self.params.cached:
+            return Mirror.create(self.config).iter_entries(
+                    self.params.filter_read, self.params.filter_starred,
+                    self.params.tags, self.params.oldest,
+                    self.params.untagged, quantity)
+        return self.__request_entries(quantity)
+
+    def __request_entries(self, quantity):
         api = GetListEntries(self.config, {
-            ListEntriesParams.COUNT: self.__get_quantity(),
             ListEntriesParams.FILTER_READ: self.params.filter_read,
             ListEntriesParams.FILTER_STARRED: self.params.filter_starred,
             ListEntriesParams.OLDEST: self.params.oldest,
             ListEntriesParams.TAGS: self.params.tags
         })
-        entries = Entry.create_list(
-                api.request().response['_embedded']["items"])
+        page_size = GetListEntries.PAGE_SIZE
+        if not self.params.untagged and 0 < quantity < page_size:
+            page_size = quantity
+        entries = api.iter_entries(page_size, prefetch=quantity > page_size)
         if self.params.untagged:
-            entries = list(filter(lambda e: not e.tags, entries))
-        return True, self.__print_entries(entries)
+            entries = filter(lambda e: not e.tags, entries)
+        return entries
+
+    def _print_entries(self, entries, snippets=None):
+        from tabulate import tabulate
 
-    def __print_entries(self, entries):
         entry_id_width = self.__entry_id_width(entries)
         maxwidth = self.__get_maxwidth() - entry_id_width - 5
         output = []
-        for item in entries:
+        for index, item in enumerate(entries):
             _maxwidth = maxwidth
             entry_id = str(item.entry_id).rjust(entry_id_width)
 
@@ -85,12 +105,14 @@ class ListCommand(Command):
                     entry_id, status,
                     f"{title}{annotation_mark}{tags_mark}"]
             output.append(entry)
-        return tabulate.tabulate(output)
+            if snippets:
+                output.append(['', '', snippets[index]])
+        return tabulate(output)
 
     def __get_quantity(self):
         if self.params.quantity is None:
             try:
-                return os.get_terminal_size().lines - 3
+                return wclick.terminal_size().lines - 3
             except OSError:
                 return sys.maxsize
         else:
@@ -99,7 +121,7 @@ class ListCommand(Command):
     def __get_maxwidth(self):
         if self.params.trim:
             try:
-                return os.get_terminal_size().columns
+                return wclick.terminal_size().columns
             except OSError:
                 pass
         return sys.maxsize
@@ -127,20 +149,42 @@ class ListCommand(Command):
 
 class CountCommand(Command):
 
+    UNTAGGED_PAGE_SIZE = 100
+
     def __init__(self, config, params=None):
         Command.__init__(self)
         self.config = config
         self.params = params or ListParams()
 
     def _run(self):
-        api = GetListEntries(self.config, {
-            ListEntriesParams.COUNT: sys.maxsize,
+        if self.params.cached:
+            return True, Mirror.create(self.config).count(
+                    self.params.filter_read, self.params.filter_starred,
+                    self.params.tags, self.params.untagged)
+        if self.params.untagged:
+            return True, self.__count_untagged()
+        return True, self.__request(1).response['total']
+
+    def __count_untagged(self):
+        api = GetListEntries(self.config, self.__api_params())
+        count = 0
+        # counting a page takes no time, there is nothing for the
+        # request of the next page to overlap with
+        for response in api.iter_pages(
+                CountCommand.UNTAGGED_PAGE_SIZE, prefetch=False):
+            count += sum(
+                    1 for item in response['_embedded']['items']
+                    if not item.get('tags'))
+        return count
+
+    def __request(self, count):
+        params = self.__api_params()
+        params[ListEntriesParams.COUNT] = count
+        return GetListEntries(self.config, params).request()
+
+    def __api_params(self):
+        return {
             ListEntriesParams.FILTER_READ: self.params.filter_read,
             ListEntriesParams.FILTER_STARRED: self.params.filter_starred,
             ListEntriesParams.TAGS: self.params.tags
-        })
-        entries = Entry.create_list(
-                api.request().response['_embedded']["items"])
-        if self.params.untagged:
-            entries = list(filter(lambda e: not e.tags, entries))
-        return True, len(entries)
+        }
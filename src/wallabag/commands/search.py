@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+from wallabag.commands.list import ListCommand
+from wallabag.commands.params import Params
+from wallabag.mirror import Mirror
+from wallabag import wclick
+
+
+class SearchCommandParams(Params):
+    query = None
+    quantity = None
+    trim = True
+
+    def __init__(self, query, quantity=None, trim=True):
+        self.query = query
+        self.quantity = quantity
+        self.trim = trim
+
+    def validate(self):
+        if not self.query or not self.query.strip():
+            return False, 'Search query is empty'
+        return True, None
+
+
+class SearchCommand(ListCommand):
+
+    def _run(self):
+        results = Mirror.create(self.config).search(
+                self.params.query, self.__get_quantity())
+        if not results:
+            return True, None
+        entries, snippets = zip(*results)
+        return True, self._print_entries(entries, snippets)
+
+    def __get_quantity(self):
+        if self.params.quantity is None:
+            try:
+                return max((wclick.terminal_size().lines - 3) // 2, 1)
+            except OSError:
+                return sys.maxsize
+        return self.params.quantity
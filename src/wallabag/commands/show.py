@@ -1,35 +1,22 @@
 # -*- coding: utf-8 -*-
 
-import os
 import textwrap
-from enum import Enum, auto
 
 from wallabag.api.get_entry import GetEntry
 from wallabag.commands.command import Command
 from wallabag.commands.params import Params
 from wallabag.entry import Entry
+from wallabag.mirror import Mirror
+from wallabag import wclick
+from wallabag.render_cache import RenderCache
 from wallabag.export.export_factory import ExportFactory
-from wallabag.format_type import ScreenType
-
-
-class Alignment(Enum):
-    CENTER = auto()
-    LEFT = auto()
-    RIGHT = auto()
-
-    def list():
-        return [c.name for c in Alignment]
-
-    def get(name):
-        for align in Alignment:
-            if align.name == name.upper():
-                return align
-        return Alignment.CENTER
+from wallabag.format_type import Alignment, ScreenType
 
 
 class ShowCommandParams(Params):
     width = '80%'
     align = Alignment.CENTER
+    cached = False
 
     def __init__(self, entry_id, type=ScreenType.TERM, colors=True,
                  raw=False, image_links=False):
@@ -52,15 +39,43 @@ class ShowCommand(Command):
     def _run(self):
         self.__calculate_alignment()
 
-        api = GetEntry(self.config, self.params.entry_id)
+        entry = self.__get_entry(content=False)
+        cache = RenderCache.create(self.config)
+        key = output = None
+        if cache:
+            key = RenderCache.key(entry, *self.__render_params())
+            output = cache.get(key) if key else None
+        if output is None:
+            if self.params.cached:
+                entry = self.__get_entry()
+            output = self.__render(entry)
+            if key:
+                cache.put(key, output)
+        return True, output
+
+    def __render(self, entry):
         output = ExportFactory.create(
-                Entry(api.request().response),
+                entry,
                 self.params,
                 self.params.type,
                 self.width).run()
         if not self.params.raw:
             output = self.__format_output(output)
-        return True, output
+        return output
+
+    def __render_params(self):
+        return (self.params.type.name, self.width, self.maxcol,
+                self.params.align.name, self.params.colors,
+                self.params.image_links, self.params.raw)
+
+    def __get_entry(self, content=True):
+        if self.params.cached:
+            return Mirror.create(self.config).get_entry(
+                    self.params.entry_id, content)
+        response = GetEntry(
+                self.config, self.params.entry_id).request().response
+        Mirror.store_if_exists(self.config, [response])
+        return Entry(response)
 
     def __indent(self, align):
         if align == Alignment.CENTER:
@@ -79,7 +94,7 @@ class ShowCommand(Command):
 
     def __calculate_alignment(self):
         try:
-            self.maxcol = os.get_terminal_size().columns
+            self.maxcol = wclick.terminal_size().columns
         except OSError:
             self.maxcol = ShowCommand.FAILWIDTH
 
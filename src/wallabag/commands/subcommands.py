@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+from enum import Enum, auto
+
+
+class TagsSubcommand(Enum):
+    LIST = auto()
+    ADD = auto()
+    REMOVE = auto()
+
+    def list():
+        return [c.name for c in TagsSubcommand]
+
+    def get(name):
+        for command in TagsSubcommand:
+            if command.name == name.upper():
+                return command
+        return TagsSubcommand.LIST
+
+
+class AnnoSubcommand(Enum):
+    LIST = auto()
+    REMOVE = auto()
+    SHOW = auto()
+
+    def list():
+        return [c.name for c in AnnoSubcommand]
+
+    def get(name):
+        for command in AnnoSubcommand:
+            if command.name == name.upper():
+                return command
+        return AnnoSubcommand.LIST
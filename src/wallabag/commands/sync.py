@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from pathlib import PurePath
+
+from wallabag.api.get_list_entries import (
+        GetListEntries, Params as ListEntriesParams)
+from wallabag.api.get_tags import GetTags
+from wallabag.commands.command import Command
+from wallabag.commands.params import Params
+from wallabag.known_urls import KnownUrls
+from wallabag.mirror import Mirror
+
+
+class SyncCommandParams(Params):
+    full = False
+
+    def __init__(self, full=False):
+        self.full = full
+
+
+class SyncCommand(Command):
+
+    PAGE_SIZE = 100
+
+    def __init__(self, config, params=None, mirror=None):
+        Command.__init__(self)
+        self.config = config
+        self.params = params or SyncCommandParams()
+        self.mirror = mirror or Mirror.create(self.config)
+
+    def _run(self):
+        if not self.params.full:
+            return self.__sync(self.mirror, self.mirror.get_last_sync())
+
+        # rebuilt aside: the old mirror stays if the download fails
+        path = PurePath(f'{self.mirror.path}.new')
+        if os.path.exists(path):
+            os.remove(path)
+        mirror = Mirror(path)
+        entry_ids = set()
+        try:
+            result = self.__sync(mirror, None, entry_ids)
+            mirror.close()
+            self.mirror.close()
+            os.replace(path, self.mirror.path)
+        except BaseException:
+            mirror.close()
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        # entries deleted with another client
+        known = KnownUrls.create(self.config)
+        if known:
+            known.retain(entry_ids)
+            known.save()
+        return result
+
+    def __sync(self, mirror, since, entry_ids=None):
+        started = time.time()
+        api = GetListEntries(self.config, {
+            ListEntriesParams.SINCE: since,
+            ListEntriesParams.FULL_DETAIL: True
+        })
+        count = 0
+        for response in api.iter_pages(SyncCommand.PAGE_SIZE, prefetch=True):
+            items = response['_embedded']['items']
+            mirror.store_entries(items)
+            count += len(items)
+            if entry_ids is not None:
+                entry_ids.update(item['id'] for item in items)
+        mirror.store_tags(GetTags(self.config).request().response)
+        mirror.set_last_sync(started)
+
+        return True, f'Synchronized entries: {count}'
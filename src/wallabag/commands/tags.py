@@ -15,25 +15,13 @@ from wallabag.api.delete_tags_by_label import DeleteTagsByLabel
 from wallabag.commands.command import Command
 from wallabag.commands.tags_param import TagsParam
 from wallabag.commands.params import Params
+from wallabag.commands.subcommands import TagsSubcommand
 from wallabag.entry import Entry
+from wallabag.journal import Journal
+from wallabag.mirror import Mirror
 from wallabag import wclick
 
 
-class TagsSubcommand(Enum):
-    LIST = auto()
-    ADD = auto()
-    REMOVE = auto()
-
-    def list():
-        return [c.name for c in TagsSubcommand]
-
-    def get(name):
-        for command in TagsSubcommand:
-            if command.name == name.upper():
-                return command
-        return TagsSubcommand.LIST
-
-
 class RemoveSubcommand(Enum):
     FROM_ENTRY = auto()
     BY_TAG_ID = auto()
@@ -49,6 +37,7 @@ class TagsCommandParams(Params, TagsParam):
     validate_tags = False
     validate_entry_id = False
     validate_tag_id = False
+    cached = False
 
     config = {TagsSubcommand.LIST: (False, False, False),
               TagsSubcommand.ADD: (True, True, False),
@@ -99,6 +88,9 @@ class TagsCommandParams(Params, TagsParam):
 
 class TagsCommand(Command):
 
+    journaled = True
+    confirmed = False
+
     def __init__(self, config, params=None):
         Command.__init__(self)
         self.config = config
@@ -114,6 +106,15 @@ class TagsCommand(Command):
         return self.runner[self.params.command]()
 
     def __subcommand_list(self):
+        if self.params.cached:
+            if not self.params.entry_id:
+                return True, self.__parse_tags(
+                        Mirror.create(self.config).tag_counts())
+            # an entry not synchronized yet is asked to the server
+            entry = Mirror.get_if_exists(self.config, self.params.entry_id)
+            if entry:
+                return True, self.__parse_tags(entry.tags)
+
         if self.params.entry_id:
             api = GetTagsForEntry(self.config, self.params.entry_id)
         else:
@@ -122,10 +123,11 @@ class TagsCommand(Command):
         return True, self.__parse_tags(api.request().response)
 
     def __subcommand_add(self):
-        AddTagToEntry(self.config, {
+        response = AddTagToEntry(self.config, {
             AddTagParams.ENTRY_ID: self.params.entry_id,
             AddTagParams.TAGS: self.params.tags
-        }).request()
+        }).request().response
+        Mirror.store_if_exists(self.config, [response])
 
         return True, 'Tags successfully added'
 
@@ -140,37 +142,45 @@ class TagsCommand(Command):
         return remove[self.params.remove_command]()
 
     def __remove_by_tag_id(self):
-        confirm_msg = (
-                f'{Back.RED}You are going to remove tag with id: '
-                f'{Fore.BLUE}{self.params.tag_id}{Fore.RESET}{Back.RESET}'
-                '\n\nContinue?')
-        if not wclick.confirm(confirm_msg):
+        if not self.__confirm_by_tag_id():
             return True, 'Cancelling'
 
         DeleteTagsById(self.config, self.params.tag_id).request()
+        Mirror.remove_tags_if_exists(
+                self.config, tag_ids=[self.params.tag_id])
         return True, None
 
     def __remove_by_tag_name(self):
-        entries = list()
-        for tag in self.params.tags.split(','):
-            api = GetListEntries(self.config, {
-                ListParams.TAGS: tag,
-                ListParams.COUNT: 100
-            })
-            entries.extend(Entry.create_list(
-                    api.request().response['_embedded']["items"]))
-        titles = "\n\t".join([x.title for x in entries])
-        confirm_msg = (
-                f'{Back.RED}You are going to remove tag '
-                f'{Fore.BLUE}{self.params.tags}{Fore.RESET} '
-                f'from this entries:{Back.RESET}\n\n\t{titles}'
-                '\n\nContinue?')
-        if not wclick.confirm(confirm_msg):
+        if not self.__confirm_by_tag_name(self.__tagged_entries()):
             return True, 'Cancelling'
 
         DeleteTagsByLabel(self.config, self.params.tags).request()
+        Mirror.remove_tags_if_exists(self.config, labels=[
+                tag.strip() for tag in self.params.tags.split(',')])
         return True, None
 
+    def __tagged_entries(self):
+        """
+        Entries having any of the tags to remove, read from the tag index
+        of the mirror in cached mode, otherwise asked to the server tag by
+        tag.
+        """
+        if self.params.cached:
+            mirror = Mirror.create(self.config)
+            try:
+                return mirror.tagged_entries(self.params.tags)
+            finally:
+                mirror.close()
+
+        entries = dict()
+        for tag in self.params.tags.split(','):
+            api = GetListEntries(self.config, {
+                ListParams.TAGS: tag
+            })
+            for entry in api.iter_entries(prefetch=True):
+                entries.setdefault(entry.entry_id, entry)
+        return entries.values()
+
     def __remove_from_entry(self):
         api = GetEntry(self.config, self.params.entry_id)
         entry = Entry(api.request().response)
@@ -183,19 +193,80 @@ class TagsCommand(Command):
                     f'in entry:\n\n\t{entry.title}\n')
         tag = tag[0]
 
-        confirm_msg = (
+        if not self.__confirm_from_entry(entry.title):
+            return True, 'Cancelling'
+
+        response = DeleteTagFromEntry(
+                self.config, self.params.entry_id,
+                tag['id']).request().response
+        Mirror.store_if_exists(self.config, [response])
+        return True, None
+
+    def _offline(self, journal):
+        params = self.params
+        if params.command == TagsSubcommand.LIST:
+            return None
+        if params.command == TagsSubcommand.ADD:
+            entry = Mirror.get_if_exists(self.config, params.entry_id)
+            return self._queue(
+                    journal, f'add tags {params.tags} to entry '
+                    f'{params.entry_id}', Journal.ADD_TAGS,
+                    entry_id=int(params.entry_id), tags=params.tags,
+                    updated_at=entry.updated_at if entry else None)
+
+        if params.remove_command == RemoveSubcommand.FROM_ENTRY:
+            entry = Mirror.get_if_exists(self.config, params.entry_id)
+            if not self.confirmed and not self.__confirm_from_entry(
+                    entry.title if entry else f'ID: {params.entry_id}'):
+                return True, 'Cancelling'
+            return self._queue(
+                    journal, f'remove tag {params.tags} from entry '
+                    f'{params.entry_id}', Journal.REMOVE_TAG,
+                    entry_id=int(params.entry_id), tag=params.tags,
+                    updated_at=entry.updated_at if entry else None)
+        if params.remove_command == RemoveSubcommand.BY_TAG_ID:
+            if not self.confirmed and not self.__confirm_by_tag_id():
+                return True, 'Cancelling'
+            return self._queue(
+                    journal, f'delete tag {params.tag_id}', Journal.DELETE_TAG,
+                    tag_id=params.tag_id)
+
+        if not self.confirmed:
+            mirror = Mirror.create(self.config)
+            entries = mirror.tagged_entries(params.tags) if (
+                    mirror.exists()) else []
+            mirror.close()
+            if not self.__confirm_by_tag_name(entries):
+                return True, 'Cancelling'
+        return self._queue(
+                journal, f'delete tags {params.tags}', Journal.DELETE_TAGS,
+                labels=[tag.strip() for tag in params.tags.split(',')])
+
+    def __confirm_by_tag_id(self):
+        return self.__confirm(
+                f'{Back.RED}You are going to remove tag with id: '
+                f'{Fore.BLUE}{self.params.tag_id}{Fore.RESET}{Back.RESET}'
+                '\n\nContinue?')
+
+    def __confirm_by_tag_name(self, entries):
+        titles = "\n\t".join(x.title for x in entries)
+        return self.__confirm(
+                f'{Back.RED}You are going to remove tag '
+                f'{Fore.BLUE}{self.params.tags}{Fore.RESET} '
+                f'from this entries:{Back.RESET}\n\n\t{titles}'
+                '\n\nContinue?')
+
+    def __confirm_from_entry(self, title):
+        return self.__confirm(
                 f'{Back.RED}You are going to remove tag '
                 f'{Fore.BLUE}{self.params.tags}{Fore.RESET} from entry:'
                 f'{Back.RESET}'
-                f'\n\n\t{entry.title}\n\n'
+                f'\n\n\t{title}\n\n'
                 'Continue?')
-        if not wclick.confirm(confirm_msg):
-            return True, 'Cancelling'
 
-        DeleteTagFromEntry(
-                self.config, self.params.entry_id,
-                tag['id']).request()
-        return True, None
+    def __confirm(self, confirm_msg):
+        self.confirmed = wclick.confirm(confirm_msg)
+        return self.confirmed
 
     def __parse_tags(self, response):
         def sort(tag):
@@ -207,4 +278,6 @@ class TagsCommand(Command):
                     sorted(response, key=sort)))
 
     def __tag_format(self, tag):
+        if 'count' in tag:
+            return f"{tag['id']}. {tag['slug']} ({tag['count']})"
         return f"{tag['id']}. {tag['slug']}"
@@ -5,6 +5,8 @@ from wallabag.commands.params import Params
 from wallabag.api.get_entry import GetEntry
 from wallabag.api.update_entry import UpdateEntry, Params as UpdateEntryParams
 from wallabag.entry import Entry
+from wallabag.journal import Journal
+from wallabag.mirror import Mirror
 
 
 class UpdateCommandParams(Params):
@@ -15,6 +17,7 @@ class UpdateCommandParams(Params):
     set_star_state = None
     force = False
     quiet = False
+    jobs = 1
     check_toggle_options = True
 
     def __init__(self, check_toggle_options=True):
@@ -42,6 +45,8 @@ class UpdateCommandParams(Params):
 
 class UpdateCommand(Command):
 
+    journaled = True
+
     def __init__(self, config, entry_id, params):
         Command.__init__(self)
         self.config = config
@@ -69,3 +74,14 @@ class UpdateCommand(Command):
         if not params.quiet:
             return True, "Entry successfully updated."
         return True, None
+
+    def _offline(self, journal):
+        params = self.params
+        entry = Mirror.get_if_exists(self.config, self.entry_id)
+        return self._queue(
+                journal, f'update entry {self.entry_id}', Journal.UPDATE,
+                entry_id=int(self.entry_id), title=params.new_title or None,
+                read=params.set_read_state, starred=params.set_star_state,
+                toggle_read=bool(params.toggle_read),
+                toggle_star=bool(params.toggle_star),
+                updated_at=entry.updated_at if entry else None)
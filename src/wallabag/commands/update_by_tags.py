@@ -1,13 +1,12 @@
 # -*- coding: utf-8 -*-
 
-import click
-from colorama import Fore, Back
+from colorama import Back
 
 from wallabag.api.get_list_entries import GetListEntries, Params as ListParams
+from wallabag.commands.bulk import BulkExecutor
 from wallabag.commands.command import Command
 from wallabag.commands.update import UpdateCommandParams
 from wallabag.api.update_entry import UpdateEntry, Params
-from wallabag.entry import Entry
 from wallabag import wclick
 
 
@@ -19,17 +18,13 @@ class UpdateByTagsCommand(Command):
         self.tags = tags
         self.params = params or UpdateCommandParams(False)
 
-        self.__updating_list = []
-
     def _run(self):
         params = self.params
 
         api = GetListEntries(self.config, {
-            ListParams.TAGS: self.tags,
-            ListParams.COUNT: 100
+            ListParams.TAGS: self.tags
         })
-        entries = Entry.create_list(
-                api.request().response['_embedded']["items"])
+        entries = list(api.iter_entries(prefetch=True))
         if not params.force:
             titles = "\n\t".join([x.title for x in entries])
             confirm_msg = (
@@ -40,15 +35,15 @@ class UpdateByTagsCommand(Command):
             if not wclick.confirm(confirm_msg):
                 return True, 'Cancelling'
 
-        for entry in entries:
-            self.__log(entry.title)
-            UpdateEntry(self.config, entry.entry_id, {
-                Params.STAR: self.params.set_star_state,
-                Params.READ: self.params.set_read_state
-            }).request()
-            self.__log(entry.title)
+        result = BulkExecutor(params.jobs, params.quiet).run(
+                entries, self.__update, 'Updating entry')
+        return not result.failed, result.summary('Updated')
 
-        return True, None
+    def __update(self, entry):
+        return UpdateEntry(self.config, entry.entry_id, {
+            Params.STAR: self.params.set_star_state,
+            Params.READ: self.params.set_read_state
+        }).request()
 
     def __get_update_status(self):
         result = ""
@@ -67,12 +62,3 @@ class UpdateByTagsCommand(Command):
             else:
                 result += "unstarred"
         return result
-
-    def __log(self, title):
-        if self.params.quiet:
-            return
-        if title not in self.__updating_list:
-            click.echo(f'Updating entry: {title}', nl=False)
-            self.__updating_list.append(title)
-        else:
-            click.echo(f'\t...\t{Fore.GREEN}success{Fore.RESET}')
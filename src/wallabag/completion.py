@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Candidates for the shell completion: tags and recent entries.
+
+They are read from a cache file so that completing never waits for the
+server. An outdated or missing cache is refreshed by a background
+process, the candidates at hand are printed right away. Only the
+standard library is imported unless the cache is refreshed.
+"""
+
+import json
+import os
+import sys
+import time
+import zlib
+
+from wallabag.client import COMPLETE_COMMAND
+
+KINDS = ('tags', 'entries')
+
+DEFAULT_TTL = 3600
+RETRY_INTERVAL = 60
+ENTRIES = 500
+
+CACHE_WALLABAG_DIR = "wallabag-cli"
+COMPLETION_PREFIX = "completion-"
+
+
+def get_config_path(path=None):
+    if path:
+        return os.path.abspath(path)
+    directory = (os.environ.get('XDG_CONFIG_HOME')
+                 or os.path.expanduser(os.path.join('~', '.config')))
+    return os.path.join(directory, 'wallabag-cli', 'config.ini')
+
+
+def escape(value):
+    # `_describe` splits candidates and descriptions on colons
+    return value.replace('\\', '\\\\').replace(':', '\\:')
+
+
+class Completion():
+    """
+    Completion cache of a config file: tag labels and the IDs and
+    titles of the newest entries, valid for `completion_ttl` seconds of
+    the `cache` config section (an hour by default).
+    """
+
+    def __init__(self, config_path=None):
+        self.config_path = get_config_path(config_path)
+        # crc32 rather than hashlib, which takes longer to import
+        digest = f"{zlib.crc32(self.config_path.encode('utf-8')):08x}"
+        directory = (os.environ.get('XDG_CACHE_HOME')
+                     or os.path.expanduser(os.path.join('~', '.cache')))
+        self.path = os.path.join(
+                directory, CACHE_WALLABAG_DIR, COMPLETION_PREFIX + digest)
+        self.lock_path = self.path + '.lock'
+
+    def candidates(self, kind):
+        data = self.load()
+        if not data or time.time() - data['time'] > data['ttl']:
+            self.refresh_in_background()
+        if not data:
+            return []
+        if kind == 'tags':
+            return [escape(label) for label in data['tags']]
+        return [f'{entry_id}:{escape(title)}'
+                for entry_id, title in data['entries']]
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def refresh_in_background(self):
+        """
+        Start a refresh unless one started in the last `RETRY_INTERVAL`
+        seconds: a running one, or one that failed, e.g. offline.
+        """
+        import subprocess
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if time.time() - os.stat(self.lock_path).st_mtime < (
+                    RETRY_INTERVAL):
+                return
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
+        try:
+            os.close(os.open(
+                    self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except OSError:
+            return
+        subprocess.Popen(
+                [sys.executable, '-m', 'wallabag.completion',
+                 self.config_path],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, start_new_session=True)
+
+    def refresh(self):
+        import itertools
+        import tempfile
+
+        from wallabag.api.get_list_entries import GetListEntries
+        from wallabag.api.get_tags import GetTags
+        from wallabag.config import Configs, Options, Sections
+
+        config = Configs(self.config_path)
+        tags = GetTags(config).request().response
+        entries = itertools.islice(
+                GetListEntries(config, {}).iter_entries(), ENTRIES)
+        data = {
+            'time': time.time(),
+            'ttl': config.getint(
+                Sections.CACHE, Options.COMPLETION_TTL, DEFAULT_TTL),
+            'tags': sorted(tag['label'] for tag in tags),
+            'entries': [[entry.entry_id, entry.title] for entry in entries]
+        }
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.')
+        try:
+            with os.fdopen(fd, mode='w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+        try:
+            os.remove(self.lock_path)
+        except OSError:
+            pass
+
+
+def main(config_path, args):
+    if len(args) != 1 or args[0] not in KINDS:
+        sys.stderr.write(f'Usage: wallabag {COMPLETE_COMMAND} '
+                         f'{{{"|".join(KINDS)}}}\n')
+        return 2
+    for candidate in Completion(config_path).candidates(args[0]):
+        sys.stdout.write(candidate + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    Completion(sys.argv[1]).refresh()
@@ -2,28 +2,29 @@
 
 import base64
 import configparser
-import getpass
+import hashlib
+import json
 import logging
 import os
-import socket
 import time
 from pathlib import PurePath
 
-from Crypto.Cipher import AES
-from Crypto.Hash import MD5
-
 from xdg.BaseDirectory import xdg_config_home as XDG_CONFIG_HOME
 
 
 CONFIG_DIRECTORY = os.path.expanduser(XDG_CONFIG_HOME)
 CONFIG_WALLABAG_DIR = "wallabag-cli"
 CONFIG_FILENAME = "config.ini"
+TOKEN_SUFFIX = ".token"
 
 
 class Sections():
     API = "api"
     OAUTH2 = "oauth2"
     TOKEN = "token"
+    HTTP = "http"
+    SYNC = "sync"
+    CACHE = "cache"
 
 
 class Options():
@@ -35,8 +36,21 @@ class Options():
     SECRET = "secret"
 
     ACCESS_TOKEN = "access_token"
+    REFRESH_TOKEN = "refresh_token"
     EXPIRES = "expires"
 
+    POOL_SIZE = "pool_size"
+    RETRIES = "retries"
+    PROBE = "probe"
+    PROBE_TIMEOUT = "probe_timeout"
+
+    OFFLINE = "offline"
+    JOURNAL = "journal"
+
+    RENDER_SIZE = "render_size"
+    KNOWN_URLS = "known_urls"
+    COMPLETION_TTL = "completion_ttl"
+
 
 class Configs():
 
@@ -49,10 +63,12 @@ class Configs():
             (Sections.OAUTH2, Options.SECRET)]
 
     custom_path = None
+    __key = None
 
     def __init__(self, path=None):
         self.log = logging.getLogger('wallabag.config')
         self.config = configparser.ConfigParser()
+        self.__decrypted = {}
         self.load(path)
 
     def get_path(self, custom_path=None):
@@ -64,6 +80,19 @@ class Configs():
                         CONFIG_WALLABAG_DIR,
                         CONFIG_FILENAME)
 
+    def get_token_path(self):
+        return self.get_path().with_suffix(TOKEN_SUFFIX)
+
+    def get_account_digest(self):
+        """
+        Short digest of the server and the user, naming the files kept
+        per account.
+        """
+        account = "\n".join([
+            self.get(Sections.API, Options.SERVERURL) or "",
+            self.get(Sections.API, Options.USERNAME) or ""])
+        return hashlib.sha1(account.encode('utf-8')).hexdigest()[:16]
+
     def set(self, section, name, value):
         if not self.config.has_section(section):
             self.config.add_section(section)
@@ -74,7 +103,9 @@ class Configs():
     def get(self, section, name, fallback=None):
         value = self.config.get(section, name, fallback=fallback)
         if value and (section, name) in Configs.ENCRYPT_VALUES:
-            value = self.__decrypt(value)
+            if value not in self.__decrypted:
+                self.__decrypted[value] = self.__decrypt(value)
+            value = self.__decrypted[value]
         return value
 
     def getint(self, section, name, fallback=0):
@@ -83,6 +114,9 @@ class Configs():
     def getfloat(self, section, name, fallback=0):
         return self.config.getfloat(section, name, fallback=fallback)
 
+    def getboolean(self, section, name, fallback=False):
+        return self.config.getboolean(section, name, fallback=fallback)
+
     def is_token_expired(self):
         return self.getfloat('token', 'expires', 0) - time.time() < 0
 
@@ -116,6 +150,71 @@ class Configs():
             self.log.exception("couldn't load config")
             raise ValueError(Configs.LOAD_ERROR)
 
+    def load_token(self):
+        """
+        Read the token from the sidecar file, falling back to the
+        `token` section of configs written by older versions.
+        """
+        path = self.get_token_path()
+        try:
+            with open(path) as file:
+                token = json.load(file)
+            refresh_token = token.get(Options.REFRESH_TOKEN)
+            if refresh_token:
+                # stored in the clear by older versions: dropped, the
+                # next renewal uses the password
+                token[Options.REFRESH_TOKEN] = self.__decrypt(
+                        refresh_token) if '@' in refresh_token else None
+            return token
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            self.log.exception("couldn't load token from: %s", path)
+        return {
+            Options.ACCESS_TOKEN: self.get(
+                Sections.TOKEN, Options.ACCESS_TOKEN),
+            Options.EXPIRES: self.getfloat(Sections.TOKEN, Options.EXPIRES)
+        }
+
+    def save_token(self, token):
+        """
+        Atomically replace the sidecar file, the config stays untouched.
+        The refresh token is encrypted like the password.
+        """
+        import tempfile
+
+        if token.get(Options.REFRESH_TOKEN):
+            token = dict(token)
+            token[Options.REFRESH_TOKEN] = self.__encrypt(
+                    token[Options.REFRESH_TOKEN])
+
+        path = self.get_token_path()
+        if not os.path.exists(path.parents[0]):
+            os.makedirs(path.parents[0])
+        self.log.debug('writing token to: %s', path)
+        fd, temp_path = tempfile.mkstemp(
+                dir=path.parents[0], prefix=f'.{path.name}.')
+        try:
+            with os.fdopen(fd, mode='w') as file:
+                json.dump(token, file)
+            os.replace(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+    def remove_token(self):
+        """
+        Forget the token of the account: the sidecar file and the
+        `token` section of older configs.
+        """
+        self.config.remove_section(Sections.TOKEN)
+        path = self.get_token_path()
+        try:
+            os.remove(path)
+            self.log.debug('removed token: %s', path)
+        except FileNotFoundError:
+            pass
+
     def load_or_create(self, custom_path=None):
         path = self.get_path(custom_path)
 
@@ -128,11 +227,19 @@ class Configs():
             raise ValueError(Configs.LOAD_ERROR)
 
     def __cryptkey(self):
-        s1 = getpass.getuser()
-        s2 = socket.gethostname()
-        return MD5.new((s1 + s2).encode("utf-8")).digest()
+        if not Configs.__key:
+            import getpass
+            import socket
+            from Crypto.Hash import MD5
+
+            s1 = getpass.getuser()
+            s2 = socket.gethostname()
+            Configs.__key = MD5.new((s1 + s2).encode("utf-8")).digest()
+        return Configs.__key
 
     def __encrypt(self, value):
+        from Crypto.Cipher import AES
+
         try:
             cipher = AES.new(self.__cryptkey(), AES.MODE_EAX)
             ciphertext, tag = cipher.encrypt_and_digest(value.encode('utf-8'))
@@ -146,6 +253,8 @@ class Configs():
         return ret
 
     def __decrypt(self, value):
+        from Crypto.Cipher import AES
+
         try:
             nonce, ciphertext, tag = map(
                     lambda v: base64.b64decode(v), value.split('@'))
@@ -155,3 +264,29 @@ class Configs():
             print(e)
             ret = None
         return ret
+
+
+class ConfigsCache():
+    """
+    Configs by path for long-lived processes (the daemon and the repl).
+    The same object is returned while its file is unchanged, so tokens
+    and decrypted values are kept between commands.
+    """
+
+    def __init__(self):
+        self.configs = {}
+
+    def load(self, path=None):
+        path = os.path.abspath(path or os.path.join(
+                CONFIG_DIRECTORY, CONFIG_WALLABAG_DIR, CONFIG_FILENAME))
+        mtime = ConfigsCache.__mtime(path)
+        cached = self.configs.get(path)
+        if not cached or cached[0] != mtime:
+            cached = self.configs[path] = (mtime, Configs(path))
+        return cached[1]
+
+    def __mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
@@ -2,7 +2,9 @@
 
 import logging
 import re
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 
 from wallabag.api.api import (
@@ -29,7 +31,10 @@ class Configurator():
             while not option.setup(self.config):
                 pass
 
+        # the token belongs to the previous account
+        self.config.remove_token()
         self.config.save()
+        TokenConfigurator.clear()
 
 
 class Validator(Command):
@@ -198,27 +203,64 @@ class SecretOption(ConfigOption):
 
 
 class TokenConfigurator():
+    """
+    Provide the access token, requesting a new one when it's about to expire.
+
+    Tokens are kept in memory for the lifetime of the process and stored
+    in a sidecar file next to the config. Renewal uses the refresh token
+    and falls back to the password grant if the server rejects it.
+    """
+
+    REFRESH_MARGIN = 60
+
+    __tokens = weakref.WeakKeyDictionary()
+    __lock = threading.Lock()
 
     def __init__(self, config):
+        self.log = logging.getLogger('wallabag.config')
         self.config = config
 
     def get_token(self, force_creation=False):
-        if self.config.is_token_expired() or force_creation:
-            response = ApiToken(self.config).request()
-            content = response.response
-            self.config.set(
-                    Sections.TOKEN,
-                    Options.ACCESS_TOKEN,
-                    content['access_token'])
-            self.config.set(
-                    Sections.TOKEN,
-                    Options.EXPIRES,
-                    str(time.time() + content['expires_in']))
-            self.config.save()
-            return self.config.get(
-                    Sections.TOKEN,
-                    Options.ACCESS_TOKEN)
-        else:
-            return self.config.get(
-                    Sections.TOKEN,
-                    Options.ACCESS_TOKEN)
+        with TokenConfigurator.__lock:
+            token = TokenConfigurator.__tokens.get(self.config)
+            if token is None:
+                token = self.config.load_token()
+            if force_creation or self.__is_expiring(token):
+                token = self.__renew(token)
+                self.config.save_token(token)
+            TokenConfigurator.__tokens[self.config] = token
+            return token[Options.ACCESS_TOKEN]
+
+    def clear():
+        with TokenConfigurator.__lock:
+            TokenConfigurator.__tokens.clear()
+
+    def __is_expiring(self, token):
+        if not token.get(Options.ACCESS_TOKEN):
+            return True
+        expires = token.get(Options.EXPIRES) or 0
+        return expires - time.time() < TokenConfigurator.REFRESH_MARGIN
+
+    def __renew(self, token):
+        refresh_token = token.get(Options.REFRESH_TOKEN)
+        if refresh_token:
+            try:
+                self.log.debug('refreshing access token')
+                return self.__create(
+                        ApiToken(self.config, refresh_token).request(),
+                        refresh_token)
+            except RequestException as error:
+                if not error.response:
+                    raise
+                self.log.debug('refresh token rejected: %s', error)
+        self.log.debug('requesting access token')
+        return self.__create(ApiToken(self.config).request())
+
+    def __create(self, response, refresh_token=None):
+        content = response.response
+        return {
+            Options.ACCESS_TOKEN: content['access_token'],
+            Options.REFRESH_TOKEN: content.get(
+                'refresh_token', refresh_token),
+            Options.EXPIRES: time.time() + content['expires_in']
+        }
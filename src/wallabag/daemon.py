@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import stat
+import sys
+
+import click
+
+from wallabag import wclick
+from wallabag.client import get_socket_path, receive
+from wallabag.config import ConfigsCache
+
+
+class NotInteractive(BaseException):
+    """
+    The command wants to read the client's terminal: it's run again by
+    the client. A BaseException so that the generic error handling of
+    click and of the commands doesn't turn it into an error message.
+    """
+
+
+class NoInput(io.TextIOBase):
+
+    def read(self, *args):
+        raise NotInteractive()
+
+    def readline(self, *args):
+        raise NotInteractive()
+
+
+class Daemon():
+    """
+    Run the commands of `Client` in one long-lived process.
+
+    The pooled HTTP session, the access token, the decrypted config and
+    the imported modules are kept between commands, so a command only
+    costs its own requests. Configs are loaded again when their file
+    changes. Commands run one at a time, in the working directory of
+    the client; commands reading stdin or asking a question are sent
+    back to the client.
+    """
+
+    def __init__(self, path=None):
+        self.log = logging.getLogger('wallabag.daemon')
+        self.path = path or get_socket_path()
+        self.configs = ConfigsCache()
+        self.running = False
+
+    def serve(self):
+        import socketserver
+
+        from wallabag.api.session import HttpSession
+
+        daemon = self
+
+        class Handler(socketserver.BaseRequestHandler):
+
+            def handle(self):
+                request = json.loads(receive(self.request))
+                response = daemon.handle(request)
+                self.request.sendall(json.dumps(response).encode('utf-8'))
+
+        self.__prepare_path()
+        # whoever connects runs commands as this user
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.UnixStreamServer(self.path, Handler)
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, 0o600)
+        self.log.debug('listening on: %s', self.path)
+        self.running = True
+        try:
+            while self.running:
+                server.handle_request()
+        finally:
+            server.server_close()
+            os.remove(self.path)
+            HttpSession.close()
+
+    def handle(self, request):
+        if request.get('stop'):
+            self.running = False
+            return {'stopped': True}
+        return self.execute(
+                request['args'], request['cwd'], request.get('color'),
+                request.get('terminal'))
+
+    def execute(self, args, cwd, color=False, terminal=None):
+        """
+        Run the command line `args` as if in `cwd`, return the exit code
+        and the output, or `fallback` if the client has to run it.
+        """
+        from wallabag.wallabag import cli
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        directory = os.getcwd()
+        self.log.debug('running: %s', args)
+        try:
+            os.chdir(cwd)
+            with contextlib.redirect_stdout(stdout), \
+                    contextlib.redirect_stderr(stderr), \
+                    Daemon.__stdin(), \
+                    Daemon.__terminal(terminal):
+                try:
+                    code = cli.main(
+                            ['--no-spinner'] + args, prog_name='wallabag',
+                            standalone_mode=False, obj=self.configs,
+                            color=color)
+                except click.ClickException as error:
+                    error.show()
+                    code = error.exit_code
+                except click.Abort:
+                    click.echo('Aborted!', err=True)
+                    code = 1
+                except SystemExit as error:
+                    code = error.code
+        except NotInteractive:
+            self.log.debug('interactive command: %s', args)
+            return {'fallback': True}
+        except Exception as error:
+            self.log.exception('command failed: %s', args)
+            stderr.write(f'Error: {error}\n')
+            code = 1
+        finally:
+            os.chdir(directory)
+        return {
+            'code': code if isinstance(code, int) else int(code is not None),
+            'stdout': stdout.getvalue(),
+            'stderr': stderr.getvalue()}
+
+    def __prepare_path(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # an existing directory, e.g. the ~/.cache fallback, is checked
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise ValueError(
+                    f'The socket directory is not owned by the user: '
+                    f'{directory}')
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            self.log.debug('restricting access to: %s', directory)
+            os.chmod(directory, 0o700)
+        if not os.path.exists(self.path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.path)
+            except OSError:
+                self.log.debug('removing stale socket: %s', self.path)
+                os.remove(self.path)
+                return
+        raise ValueError(f'The daemon is already running: {self.path}')
+
+    @contextlib.contextmanager
+    def __stdin():
+        stdin = sys.stdin
+        sys.stdin = NoInput()
+        try:
+            yield
+        finally:
+            sys.stdin = stdin
+
+    @contextlib.contextmanager
+    def __terminal(size):
+        wclick.TERMINAL_SIZE = tuple(size) if size is not None else ()
+        try:
+            yield
+        finally:
+            wclick.TERMINAL_SIZE = None
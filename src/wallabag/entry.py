@@ -1,51 +1,80 @@
 # -*- coding: utf-8 -*-
 
-import datetime
-import delorean
+from wallabag import wtime
+
+NOT_PARSED = object()
 
 
 class Entry:
-    entry_id = 0
-    title = ""
-    content = ""
-    url = ""
-    read = False
-    starred = False
-    created_at = None
-    reading_time = None
-    preview_picture = None
-    published_by = []
-    tags = []
-    annotations = []
+    """
+    View over an entry item of the API.
+
+    Only the ID is read when the entry is created, the other fields are
+    read from the item when used. The normalized title and the creation
+    date (an aware datetime) are computed on first use and kept.
+    """
+
+    __slots__ = ('item', 'entry_id', '__title', '__created_at')
 
     def __init__(self, item):
+        self.item = item
         self.entry_id = item['id']
+        self.__title = None
+        self.__created_at = NOT_PARSED
+
+    @property
+    def title(self):
+        if self.__title is None:
+            self.__title = " ".join(
+                    self.item['title'].replace("\n", "").split())
+        return self.__title
+
+    @property
+    def content(self):
+        return self.item['content']
+
+    @property
+    def url(self):
+        return self.item['url']
+
+    @property
+    def read(self):
+        return self.item['is_archived'] == 1
+
+    @property
+    def starred(self):
+        return self.item['is_starred'] == 1
 
-        title = item['title']
-        title = title.replace("\n", "")
-        title = " ".join(title.split())
-        self.title = title
-
-        self.content = item['content']
-        self.url = item['url']
-        self.read = item['is_archived'] == 1
-        self.starred = item['is_starred'] == 1
-        if 'created_at' in item:
-            try:
-                self.created_at = datetime.datetime.fromisoformat(item['created_at'])
-                self.created_at = delorean.Delorean(datetime=self.created_at)
-            except ValueError:
-                self.created_at = delorean.parse(item['created_at'])
-        if 'reading_time' in item:
-            self.reading_time = item['reading_time']
-        if 'preview_picture' in item:
-            self.preview_picture = item['preview_picture']
-        if 'published_by' in item:
-            self.published_by = item['published_by']
-        if 'tags' in item:
-            self.tags = item['tags']
-        if 'annotations' in item:
-            self.annotations = item['annotations']
+    @property
+    def created_at(self):
+        if self.__created_at is NOT_PARSED:
+            self.__created_at = Entry.__parse_date(
+                    self.item.get('created_at'))
+        return self.__created_at
+
+    @property
+    def updated_at(self):
+        return self.item.get('updated_at')
+
+    @property
+    def reading_time(self):
+        return self.item.get('reading_time')
+
+    @property
+    def preview_picture(self):
+        return self.item.get('preview_picture')
+
+    @property
+    def published_by(self):
+        return self.item.get('published_by', [])
+
+    @property
+    def tags(self):
+        return self.item.get('tags', [])
+
+    @property
+    def annotations(self):
+        return self.item.get('annotations', [])
 
     def get_tags_string(self):
         if not self.tags:
@@ -60,4 +89,9 @@ class Entry:
                     sorted(self.tags, key=sort)))
 
     def create_list(items):
-        return [Entry(i) for i in items]
+        return (Entry(i) for i in items)
+
+    def __parse_date(value):
+        if value is None:
+            return None
+        return wtime.parse(value)
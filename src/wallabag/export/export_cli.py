@@ -1,14 +1,22 @@
 # -*- coding: utf-8 -*-
 
 from .export import Export
-from bs4 import BeautifulSoup
 
 from colorama import Back, Fore
 
-from lxml import etree
-
 
 class ExportCli(Export):
+    """
+    Render the entry as styled terminal text.
+
+    The content is parsed once with lxml and converted to text in a single
+    walk over the tree. Annotations are inserted by their offsets into the
+    text of the start and end elements while walking.
+    """
+
+    HEADERS = ('h1', 'h2', 'h3')
+    BOLD = ('b', 'strong')
+    SKIP = ('script', 'style', 'template')
 
     def __init__(self, entry, params, width):
         Export.__init__(self, entry)
@@ -16,14 +24,9 @@ class ExportCli(Export):
         self.width = width
 
     def run(self):
-        soup = self.__mark_annotations(self.entry.content)
-        self.__color_headers(soup)
-        self.__color_bold(soup)
-        self.__make_hr(soup)
-        self.__replace_images(soup)
-        self.__break_paragraphs(soup)
-        result = self.__make_annotations(soup).replace('\n\n\n', '\n\n')
-        return self.__output(self.entry.title, result)
+        result = self.__render(self.entry.content)
+        return self.__output(
+                self.entry.title, "".join(result).replace('\n\n\n', '\n\n'))
 
     def __output(self, title, article):
         return (f"{title}\n"
@@ -36,91 +39,143 @@ class ExportCli(Export):
         except OSError:
             return "\n"
 
-    def __break_paragraphs(self, soup):
-        for p in soup.findAll('p'):
-            p.insert_before(self.__get_new_line_tag(soup, times=2))
-
-    def __mark_annotations(self, html):
-        soup = BeautifulSoup(html, "html.parser")
-        if self.entry.annotations:
-            dom = etree.HTML(str(soup))
-            for anno in self.entry.annotations:
-                anno_id = f"__anno-{anno['id']}__"
-                startOffset = int(anno['ranges'][0]['startOffset'])
-                endOffset = int(anno['ranges'][0]['endOffset'])
-                el_start = dom.xpath('/' + anno['ranges'][0]['start'])[0]
-                el_end = dom.xpath('/' + anno['ranges'][0]['end'])[0]
-                el_start.text = "".join([
-                        el_start.text[:startOffset],
-                        f'{anno_id}_start',
-                        el_start.text[startOffset:]])
-                if el_start == el_end:
-                    endOffset += len(f'{anno_id}_start')
-                el_end.text = "".join([
-                        el_end.text[:endOffset],
-                        f'{anno_id}_end',
-                        el_end.text[endOffset:]])
-            return BeautifulSoup(
-                    etree.tostring(dom, method='html'), "html.parser")
-        return soup
-
-    def __make_annotations(self, soup):
-        text = soup.text
-        for anno in self.entry.annotations:
-            anno_id = f"__anno-{anno['id']}__"
-            text = text.replace(
-                    f'{anno_id}_start', Back.CYAN).replace(
-                            f'{anno_id}_end', f'{Back.RESET} [{anno["id"]}]')
-        return text
-
-    def __color_headers(self, soup):
-        if self.params.colors:
-            h1colors = Fore.BLUE
-            h1colore = Fore.RESET
-        else:
-            h1colors = h1colore = ""
-        for header in ['h1', 'h2', 'h3']:
-            for h in soup.findAll(header):
-                h.string = f"{h1colors}{h.string}{h1colore}"
-                h.insert_before(self.__get_new_line_tag(soup, 2))
-                h.insert_after(self.__get_new_line_tag(soup))
-                h.unwrap()
-
-    def __get_new_line_tag(self, soup, times=1):
-        span = soup.new_tag('span')
-        span.string = "\n" * times
-        return span
-
-    def __color_bold(self, soup):
-        if self.params.colors:
-            bcolors = Fore.RED
-            bcolore = Fore.RESET
-            for bold in ['b', 'strong']:
-                for b in soup.findAll('b'):
-                    b.string = f"{bcolors}{b.string}{bcolore}"
-
-    def __make_hr(self, soup):
+    def __hr(self):
         try:
-            print(self.width)
-            hrstring = "".ljust(self.width, '-')
+            return "".ljust(self.width, '-')
         except OSError:
-            hrstring = "-----"
-        for hr in soup.findAll('hr'):
-            replace = soup.new_tag('p')
-            replace.string = hrstring
-            hr.insert_after(replace)
-            hr.unwrap()
-
-    def __replace_images(self, soup):
-        for img in soup.findAll('img'):
-            replace = soup.new_tag('span')
-            try:
-                alt = f" \"{img['alt']}\""
-            except KeyError:
-                alt = ""
-            links = ""
-            if self.params.image_links:
-                links = f" ({img['src']})"
-            replace.string = f" [IMAGE{alt}{links}]\n"
-            img.insert_after(replace)
-            img.unwrap()
+            return "-----"
+
+    def __render(self, html):
+        from lxml import etree
+
+        if not html:
+            return []
+        dom = etree.HTML(
+                html.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+        if dom is None:
+            return []
+
+        self.hr = self.__hr()
+        self.marks = self.__annotation_marks(dom)
+        self.opened = 0
+
+        output = []
+        self.__walk(dom, output)
+        if self.opened:
+            output.append(Back.RESET)
+        return output
+
+    def __annotation_marks(self, dom):
+        """
+        The marks by text node, a node being an element and `text` or
+        `tail`. The offsets of an annotation count the characters of all
+        the text in its start and end elements, as `itertext()` gives it.
+        """
+        marks = {}
+        for anno in self.entry.annotations or []:
+            ranges = anno['ranges'][0]
+            start = dom.xpath('/' + ranges['start'])
+            end = dom.xpath('/' + ranges['end'])
+            if not start or not end:
+                continue
+            node, offset = ExportCli.__text_node(
+                    start[0], int(ranges['startOffset']))
+            marks.setdefault(node, []).append((offset, None))
+            node, offset = ExportCli.__text_node(
+                    end[0], int(ranges['endOffset']))
+            marks.setdefault(node, []).append((offset, anno['id']))
+        for node_marks in marks.values():
+            node_marks.sort(key=lambda mark: mark[0])
+        return marks
+
+    def __text_node(element, offset):
+        """
+        The text node at `offset` in the text of `element` and the
+        offset in it. An offset past the text is the end of the text.
+        """
+        position = 0
+        for node in ExportCli.__text_nodes(element):
+            length = len(getattr(*node) or '')
+            if offset <= position + length:
+                return node, offset - position
+            position += length
+        return node, length
+
+    def __text_nodes(element):
+        yield (element, 'text')
+        for child in element:
+            if isinstance(child.tag, str):
+                yield from ExportCli.__text_nodes(child)
+            yield (child, 'tail')
+
+    def __walk(self, element, output):
+        tag = element.tag
+        if not isinstance(tag, str) or tag in ExportCli.SKIP:
+            return
+
+        if tag in ExportCli.HEADERS:
+            output.append('\n\n')
+            self.__color(element, output, Fore.BLUE)
+            output.append('\n')
+        elif tag in ExportCli.BOLD:
+            self.__color(element, output, Fore.RED)
+        elif tag == 'p':
+            output.append('\n\n')
+            self.__children(element, output)
+        elif tag == 'hr':
+            output.append('\n\n')
+            output.append(self.hr)
+        elif tag == 'img':
+            self.__image(element, output)
+        else:
+            self.__children(element, output)
+
+    def __color(self, element, output, color):
+        if self.params.colors:
+            output.append(color)
+            self.__children(element, output)
+            output.append(Fore.RESET)
+        else:
+            self.__children(element, output)
+
+    def __children(self, element, output):
+        self.__text(element, 'text', output)
+        for child in element:
+            self.__walk(child, output)
+            self.__text(child, 'tail', output)
+
+    def __text(self, element, name, output):
+        text = getattr(element, name) or ''
+        marks = self.marks.get((element, name))
+        if not marks:
+            output.append(text)
+            return
+        position = 0
+        for offset, anno_id in marks:
+            output.append(text[position:offset])
+            self.__mark(anno_id, output)
+            position = offset
+        output.append(text[position:])
+
+    def __mark(self, anno_id, output):
+        """
+        Open the highlight of an annotation, or close it with its ID
+        when `anno_id` is given. Overlapping annotations are highlighted
+        until the last one closes.
+        """
+        if anno_id is None:
+            if not self.opened:
+                output.append(Back.CYAN)
+            self.opened += 1
+            return
+        if self.opened:
+            self.opened -= 1
+            if not self.opened:
+                output.append(Back.RESET)
+        output.append(f' [{anno_id}]')
+
+    def __image(self, element, output):
+        alt = element.get('alt')
+        alt = f" \"{alt}\"" if alt is not None else ""
+        links = f" ({element.get('src')})" if self.params.image_links else ""
+        output.append(f" [IMAGE{alt}{links}]\n")
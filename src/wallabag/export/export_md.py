@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from .export import Export
-from markdownify import markdownify
 
 
 class ExportMd(Export):
@@ -10,6 +9,8 @@ class ExportMd(Export):
         Export.__init__(self, entry)
 
     def run(self):
+        from markdownify import markdownify
+
         return self.__output(
                 self.entry.title,
                 markdownify(self.entry.content, heading_style="ATX"))
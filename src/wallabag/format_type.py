@@ -46,6 +46,22 @@ class ScreenType(Enum):
                 return type
         return ScreenType.TERM
 
+
+class Alignment(Enum):
+    CENTER = auto()
+    LEFT = auto()
+    RIGHT = auto()
+
+    def list():
+        return [c.name for c in Alignment]
+
+    def get(name):
+        for align in Alignment:
+            if align.name == name.upper():
+                return align
+        return Alignment.CENTER
+
+
 def format_to_screen(type):
     if type == FormatType.MARKDOWN:
         return ScreenType.MARKDOWN
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import PurePath
+
+from xdg.BaseDirectory import xdg_data_home as XDG_DATA_HOME
+
+from wallabag.api.api import ApiException
+from wallabag.config import Options, Sections
+
+DATA_DIRECTORY = os.path.expanduser(XDG_DATA_HOME)
+DATA_WALLABAG_DIR = "wallabag-cli"
+JOURNAL_PREFIX = "journal-"
+LOCK_TIMEOUT = 600
+
+
+class JournalException(ApiException):
+    pass
+
+
+class ConflictException(ApiException):
+    pass
+
+
+class Journal():
+    """
+    Changes made while the server was unreachable, replayed by `flush`.
+
+    The journal is kept per server and user as a file of JSON records,
+    one per line, each synced to disk before the command returns. A
+    replay holds a lock file so that only one process sends the changes,
+    records appended meanwhile stay queued.
+    """
+
+    ADD = 'add'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ADD_TAGS = 'add_tags'
+    REMOVE_TAG = 'remove_tag'
+    DELETE_TAGS = 'delete_tags'
+    DELETE_TAG = 'delete_tag'
+
+    def __init__(self, path):
+        self.log = logging.getLogger('wallabag.journal')
+        self.path = PurePath(path)
+        self.lock_path = PurePath(f'{path}.lock')
+
+    def get_path(config):
+        digest = config.get_account_digest()
+        return PurePath(
+                DATA_DIRECTORY, DATA_WALLABAG_DIR, JOURNAL_PREFIX + digest)
+
+    def create(config):
+        """
+        Journal of the configured account, None if disabled with
+        `journal = no` in the `sync` section.
+        """
+        if not config.getboolean(Sections.SYNC, Options.JOURNAL, True):
+            return None
+        return Journal(Journal.get_path(config))
+
+    def append(self, operation, **fields):
+        record = dict(fields, op=operation, time=time.time())
+        os.makedirs(self.path.parents[0], exist_ok=True)
+        with open(self.path, mode='a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self.log.debug('queued: %s', record)
+        return record
+
+    def pending(self):
+        try:
+            return os.path.getsize(self.path) > 0
+        except OSError:
+            return False
+
+    def read(self):
+        """
+        The queued records and the number of bytes they were read from.
+        """
+        try:
+            with open(self.path, mode='rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return [], 0
+        # a line being appended right now is left for the next replay
+        size = data.rfind(b'\n') + 1
+        records = []
+        for line in data[:size].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                self.log.warning('skipping broken record: %s', line)
+        return records, size
+
+    def replace(self, records, size):
+        """
+        Replace the first `size` bytes of the journal with `records`.
+        """
+        try:
+            with open(self.path, mode='rb') as file:
+                file.seek(size)
+                tail = file.read()
+        except FileNotFoundError:
+            tail = b''
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parents[0], prefix='.')
+        try:
+            with os.fdopen(fd, mode='wb') as file:
+                for record in records:
+                    file.write((json.dumps(record) + '\n').encode('utf-8'))
+                file.write(tail)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+    @contextlib.contextmanager
+    def lock(self):
+        os.makedirs(self.path.parents[0], exist_ok=True)
+        try:
+            if time.time() - os.stat(self.lock_path).st_mtime > LOCK_TIMEOUT:
+                self.log.debug('removing stale lock: %s', self.lock_path)
+                os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.close(os.open(
+                    self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            raise JournalException(
+                    'The queued changes are being replayed',
+                    f'Lock file: {self.lock_path}')
+        try:
+            yield
+        finally:
+            os.remove(self.lock_path)
+
+    def coalesce(records):
+        """
+        Merge the records into one `Change` per entry and new URL, in the
+        order of their first record. A tag deletion is a change of its
+        own and starts a new round of merging: the changes before it have
+        to be replayed before it, the ones after it after it.
+        """
+        result = []
+        changes = {}
+        for record in records:
+            if record['op'] in (Journal.DELETE_TAGS, Journal.DELETE_TAG):
+                result.extend(changes.values())
+                changes = {}
+                change = Change(record)
+                change.add(record)
+                result.append(change)
+                continue
+            key = Change.key(record)
+            if key not in changes:
+                changes[key] = Change(record)
+            changes[key].add(record)
+        result.extend(changes.values())
+        return result
+
+
+class Change():
+    """
+    The queued records of one entry, one new URL or one tag deletion,
+    merged: toggles cancelling out are dropped, tags added to an entry
+    are sent at once, a deletion supersedes the other changes.
+
+    `updated_at` is the update time of the entry in the mirror when the
+    first change was queued, `time` the time it was queued: the entry
+    changed on the server since then is a conflict. Once resolved
+    against the entry on the server, `updated_at` follows the requests
+    sent for the change. `conflict` is set once a replay found the
+    entry changed: the change waits for an explicit `flush`.
+    """
+
+    def __init__(self, record):
+        self.operation = record['op']
+        self.entry_id = record.get('entry_id')
+        self.url = record.get('url')
+        self.tag_id = record.get('tag_id')
+        self.updated_at = record.get('updated_at')
+        self.time = record['time']
+        self.records = []
+        self.deleted = False
+        self.title = None
+        self.read = None
+        self.starred = None
+        self.toggle_read = False
+        self.toggle_star = False
+        self.tags = []
+        self.removed_tags = []
+        self.labels = []
+        self.resolved = False
+        self.conflict = False
+
+    def key(record):
+        if record['op'] == Journal.ADD:
+            return (Journal.ADD, record['url'])
+        return ('entry', record['entry_id'])
+
+    def add(self, record):
+        self.records.append(record)
+        self.conflict = self.conflict or bool(record.get('conflict'))
+        operation = record['op']
+        if operation == Journal.DELETE:
+            self.operation = Journal.DELETE
+            self.deleted = True
+        elif operation in (Journal.ADD, Journal.UPDATE):
+            self.title = record.get('title') or self.title
+            self.read, self.toggle_read = Change.__fold(
+                    self.read, self.toggle_read,
+                    record.get('read'), record.get('toggle_read'))
+            self.starred, self.toggle_star = Change.__fold(
+                    self.starred, self.toggle_star,
+                    record.get('starred'), record.get('toggle_star'))
+            if operation == Journal.ADD:
+                Change.__merge(self.tags, record.get('tags'))
+        elif operation == Journal.ADD_TAGS:
+            for tag in Change.__merge(self.tags, record['tags']):
+                if tag in self.removed_tags:
+                    self.removed_tags.remove(tag)
+        elif operation == Journal.REMOVE_TAG:
+            if record['tag'] in self.tags:
+                self.tags.remove(record['tag'])
+            Change.__merge(self.removed_tags, record['tag'])
+        elif operation == Journal.DELETE_TAGS:
+            Change.__merge(self.labels, ",".join(record['labels']))
+
+    def resolve(self, entry):
+        """
+        Turn the toggles into the values they give on `entry`, before the
+        first request: a replay resumed after some of its requests went
+        through must not toggle again.
+        """
+        if self.toggle_read:
+            self.read = not entry.read
+            self.toggle_read = False
+        if self.toggle_star:
+            self.starred = not entry.starred
+            self.toggle_star = False
+        self.updated_at = entry.updated_at
+        self.resolved = True
+
+    def remaining(self):
+        """
+        Records of what is left to send of a resolved change.
+        """
+        fields = dict(entry_id=self.entry_id, updated_at=self.updated_at,
+                      time=self.time)
+        if self.deleted:
+            return [dict(fields, op=Journal.DELETE)]
+        records = []
+        if self.title or self.read is not None or self.starred is not None:
+            records.append(dict(
+                    fields, op=Journal.UPDATE, title=self.title,
+                    read=self.read, starred=self.starred))
+        for tag in self.removed_tags:
+            records.append(dict(fields, op=Journal.REMOVE_TAG, tag=tag))
+        if self.tags:
+            records.append(dict(
+                    fields, op=Journal.ADD_TAGS, tags=",".join(self.tags)))
+        return records
+
+    def is_empty(self):
+        if self.operation in (Journal.UPDATE, Journal.ADD_TAGS,
+                              Journal.REMOVE_TAG):
+            return not (
+                    self.deleted or self.title or self.read is not None
+                    or self.starred is not None or self.toggle_read
+                    or self.toggle_star or self.tags or self.removed_tags)
+        return False
+
+    def __str__(self):
+        if self.operation == Journal.ADD:
+            return f'add {self.url}'
+        if self.operation == Journal.DELETE_TAGS:
+            return f'delete tags {",".join(self.labels)}'
+        if self.operation == Journal.DELETE_TAG:
+            return f'delete tag {self.tag_id}'
+        if self.deleted:
+            return f'delete entry {self.entry_id}'
+        changes = []
+        if self.title:
+            changes.append('title')
+        if self.read is not None or self.toggle_read:
+            changes.append('read')
+        if self.starred is not None or self.toggle_star:
+            changes.append('starred')
+        if self.tags:
+            changes.append(f'+{",".join(self.tags)}')
+        if self.removed_tags:
+            changes.append(f'-{",".join(self.removed_tags)}')
+        return f'update entry {self.entry_id}: {" ".join(changes)}'
+
+    def __fold(value, toggled, new_value, toggle):
+        if new_value is not None:
+            return new_value, False
+        if toggle:
+            if value is not None:
+                return not value, False
+            return None, not toggled
+        return value, toggled
+
+    def __merge(tags, new_tags):
+        """
+        Append the comma separated `new_tags` missing from `tags`.
+        """
+        merged = []
+        for tag in (new_tags or "").split(','):
+            tag = tag.strip()
+            if tag:
+                merged.append(tag)
+                if tag not in tags:
+                    tags.append(tag)
+        return merged
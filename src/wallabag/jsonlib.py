@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+JSON decoding with orjson when it's installed, the json module otherwise.
+Both decode UTF-8 bytes directly, without decoding the text first.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import PurePath
+
+from xdg.BaseDirectory import xdg_cache_home as XDG_CACHE_HOME
+
+from wallabag.config import Options, Sections
+
+CACHE_DIRECTORY = os.path.expanduser(XDG_CACHE_HOME)
+CACHE_WALLABAG_DIR = "wallabag-cli"
+KNOWN_URLS_PREFIX = "known-urls-"
+
+
+class KnownUrls():
+    """
+    URLs known to be saved in the account, so that adding them again
+    doesn't need an existence check on the server.
+
+    The set is kept per server and user as SHA-1 hashes of the URLs
+    mapped to entry IDs. Entries deleted with this client are forgotten,
+    entries deleted elsewhere when `sync --full` doesn't find them.
+    """
+
+    def __init__(self, path):
+        self.log = logging.getLogger('wallabag.cache')
+        self.path = PurePath(path)
+        self.lock = threading.Lock()
+        self.__urls = None
+        self.__changed = False
+
+    def get_path(config):
+        digest = config.get_account_digest()
+        return PurePath(
+                CACHE_DIRECTORY, CACHE_WALLABAG_DIR,
+                KNOWN_URLS_PREFIX + digest)
+
+    def create(config):
+        """
+        Known URLs of the configured account, None if disabled with
+        `known_urls = no` in the `cache` section.
+        """
+        if not config.getboolean(Sections.CACHE, Options.KNOWN_URLS, True):
+            return None
+        return KnownUrls(KnownUrls.get_path(config))
+
+    def hash(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def get(self, url):
+        with self.lock:
+            return self.__load().get(KnownUrls.hash(url))
+
+    def add(self, url, entry_id):
+        with self.lock:
+            urls = self.__load()
+            key = KnownUrls.hash(url)
+            if urls.get(key) != entry_id:
+                urls[key] = entry_id
+                self.__changed = True
+
+    def forget(self, entry_ids):
+        entry_ids = set(int(entry_id) for entry_id in entry_ids)
+        with self.lock:
+            urls = self.__load()
+            for key in [key for key, entry_id in urls.items()
+                        if entry_id in entry_ids]:
+                del urls[key]
+                self.__changed = True
+
+    def retain(self, entry_ids):
+        """
+        Forget the URLs of the entries missing from `entry_ids`.
+        """
+        with self.lock:
+            urls = self.__load()
+            for key in [key for key, entry_id in urls.items()
+                        if entry_id not in entry_ids]:
+                del urls[key]
+                self.__changed = True
+
+    def save(self):
+        with self.lock:
+            if not self.__changed:
+                return
+            try:
+                os.makedirs(self.path.parents[0], exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(
+                        dir=self.path.parents[0], prefix='.')
+                with os.fdopen(fd, mode='w') as file:
+                    for key, entry_id in self.__urls.items():
+                        file.write(f'{key} {entry_id}\n')
+                os.replace(temp_path, self.path)
+                self.__changed = False
+            except OSError:
+                self.log.exception("couldn't save known urls")
+
+    def __load(self):
+        if self.__urls is None:
+            self.__urls = {}
+            try:
+                with open(self.path) as file:
+                    for line in file:
+                        key, _, entry_id = line.partition(' ')
+                        if entry_id.strip().isdigit():
+                            self.__urls[key] = int(entry_id)
+            except OSError:
+                pass
+            self.log.debug('known urls: %d', len(self.__urls))
+        return self.__urls
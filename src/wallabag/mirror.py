@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+
+import html
+import json
+import logging
+import os
+import re
+import sqlite3
+from pathlib import PurePath
+
+from colorama import Fore
+from xdg.BaseDirectory import xdg_data_home as XDG_DATA_HOME
+
+from wallabag.api.api import ApiException
+from wallabag.entry import Entry
+
+
+DATA_DIRECTORY = os.path.expanduser(XDG_DATA_HOME)
+DATA_WALLABAG_DIR = "wallabag-cli"
+MIRROR_PREFIX = "mirror-"
+MIRROR_SUFFIX = ".sqlite"
+
+
+class MirrorException(ApiException):
+    pass
+
+
+class Mirror():
+    """
+    Local SQLite copy of the wallabag entries, tags and annotations, one
+    per server and user.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,
+            updated_at TEXT,
+            created_at TEXT,
+            is_archived INTEGER,
+            is_starred INTEGER,
+            data TEXT,
+            content TEXT
+        );
+        CREATE INDEX IF NOT EXISTS entries_created_at
+            ON entries (created_at);
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY,
+            label TEXT,
+            slug TEXT
+        );
+        CREATE TABLE IF NOT EXISTS entry_tags (
+            entry_id INTEGER,
+            tag_id INTEGER,
+            PRIMARY KEY (entry_id, tag_id)
+        );
+        CREATE INDEX IF NOT EXISTS entry_tags_tag_id
+            ON entry_tags (tag_id);
+        CREATE TABLE IF NOT EXISTS annotations (
+            id INTEGER PRIMARY KEY,
+            entry_id INTEGER,
+            updated_at TEXT,
+            data TEXT
+        );
+        CREATE INDEX IF NOT EXISTS annotations_entry_id
+            ON annotations (entry_id);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE entries_fts USING fts5(
+            title, url, tags, annotations, content,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+    """
+    FTS_WEIGHTS = (10.0, 2.0, 5.0, 3.0, 1.0)
+
+    LAST_SYNC = "last_sync"
+
+    HTML_SKIP_RE = re.compile(
+            r'<(script|style)[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+    HTML_TAG_RE = re.compile(r'<[^>]+>')
+    SPACES_RE = re.compile(r'\s+')
+
+    def __init__(self, path):
+        self.log = logging.getLogger('wallabag.mirror')
+        self.path = PurePath(path)
+        self.__connection = None
+        self.fts_enabled = False
+
+    def get_path(config):
+        digest = config.get_account_digest()
+        return PurePath(
+                DATA_DIRECTORY, DATA_WALLABAG_DIR,
+                MIRROR_PREFIX + digest + MIRROR_SUFFIX)
+
+    def create(config):
+        """
+        Mirror of the configured account.
+        """
+        return Mirror(Mirror.get_path(config))
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    @property
+    def connection(self):
+        if not self.__connection:
+            if not os.path.exists(self.path.parents[0]):
+                os.makedirs(self.path.parents[0])
+            self.log.debug('opening mirror: %s', self.path)
+            self.__connection = sqlite3.connect(str(self.path))
+            self.__connection.executescript(Mirror.SCHEMA)
+            self.__init_fts()
+        return self.__connection
+
+    def close(self):
+        if self.__connection:
+            self.__connection.close()
+            self.__connection = None
+
+    def clear(self):
+        with self.connection as db:
+            for table in ('entries', 'tags', 'entry_tags',
+                          'annotations', 'meta'):
+                db.execute(f'DELETE FROM {table}')
+            if self.fts_enabled:
+                db.execute('DELETE FROM entries_fts')
+
+    def get_meta(self, key, fallback=None):
+        row = self.connection.execute(
+                'SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else fallback
+
+    def set_meta(self, key, value):
+        with self.connection as db:
+            db.execute(
+                    'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                    (key, str(value)))
+
+    def get_last_sync(self):
+        value = self.get_meta(Mirror.LAST_SYNC)
+        return int(value) if value else None
+
+    def set_last_sync(self, timestamp):
+        self.set_meta(Mirror.LAST_SYNC, int(timestamp))
+
+    def store_entries(self, items):
+        with self.connection as db:
+            for item in items:
+                self._store_entry(db, item)
+
+    def store_tags(self, tags):
+        with self.connection as db:
+            db.executemany(
+                    'INSERT OR REPLACE INTO tags (id, label, slug) '
+                    'VALUES (?, ?, ?)',
+                    [(t['id'], t['label'], t['slug']) for t in tags])
+
+    def store_if_exists(config, items):
+        """
+        Keep an existing mirror up to date with freshly fetched entries.
+        The command succeeded on the server, a mirror failing to update
+        is only logged.
+        """
+        mirror = Mirror.create(config)
+        if not mirror.exists():
+            return
+        try:
+            mirror.store_entries(items)
+        except sqlite3.Error as error:
+            mirror.log.warning('mirror not updated: %s', error)
+        finally:
+            mirror.close()
+
+    def get_if_exists(config, entry_id):
+        """
+        Entry without content from an existing mirror, None if missing.
+        """
+        mirror = Mirror.create(config)
+        if not mirror.exists():
+            return None
+        try:
+            return mirror.get_entry(entry_id, content=False)
+        except (MirrorException, sqlite3.Error):
+            return None
+        finally:
+            mirror.close()
+
+    def remove_tags(self, tag_ids=(), labels=()):
+        """
+        Remove tags, given by ID or by label, from the mirror and from
+        the entries having them.
+        """
+        with self.connection as db:
+            tag_ids = set(tag_ids)
+            if labels:
+                marks = ", ".join('?' * len(labels))
+                tag_ids.update(row[0] for row in db.execute(
+                        f'SELECT id FROM tags WHERE label IN ({marks}) '
+                        f'OR slug IN ({marks})', list(labels) * 2))
+            if not tag_ids:
+                return
+            marks = ", ".join('?' * len(tag_ids))
+            rows = db.execute(
+                    'SELECT data, content FROM entries WHERE id IN ('
+                    'SELECT entry_id FROM entry_tags '
+                    f'WHERE tag_id IN ({marks}))', list(tag_ids)).fetchall()
+            for row in rows:
+                item = json.loads(row[0])
+                item['content'] = row[1]
+                item['tags'] = [tag for tag in item.get('tags') or []
+                                if tag['id'] not in tag_ids]
+                self._store_entry(db, item)
+            db.execute(
+                    f'DELETE FROM tags WHERE id IN ({marks})', list(tag_ids))
+
+    def remove_tags_if_exists(config, tag_ids=(), labels=()):
+        """
+        Keep an existing mirror up to date with tags deleted on the server.
+        """
+        mirror = Mirror.create(config)
+        if not mirror.exists():
+            return
+        try:
+            mirror.remove_tags(tag_ids, labels)
+        except sqlite3.Error as error:
+            mirror.log.warning('mirror not updated: %s', error)
+        finally:
+            mirror.close()
+
+    def tag_counts(self):
+        """
+        Tags of the mirror, each with the number of entries having it.
+        """
+        rows = self.connection.execute(
+                'SELECT tags.id, tags.label, tags.slug, '
+                'COUNT(entry_tags.entry_id) FROM tags '
+                'LEFT JOIN entry_tags ON entry_tags.tag_id = tags.id '
+                'GROUP BY tags.id ORDER BY tags.id')
+        return [{'id': row[0], 'label': row[1], 'slug': row[2],
+                 'count': row[3]} for row in rows]
+
+    def tagged_entries(self, tags):
+        """
+        Entries having any of the comma separated `tags`, labels or slugs.
+        """
+        tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        if not tags:
+            return []
+        marks = ", ".join('?' * len(tags))
+        rows = self.connection.execute(
+                'SELECT data FROM entries WHERE id IN ('
+                'SELECT entry_id FROM entry_tags '
+                'JOIN tags ON tags.id = entry_tags.tag_id '
+                f'WHERE tags.label IN ({marks}) OR tags.slug IN ({marks})) '
+                'ORDER BY created_at DESC, id DESC', tags + tags)
+        result = []
+        for row in rows:
+            item = json.loads(row[0])
+            item['content'] = ""
+            result.append(Entry(item))
+        return result
+
+    def search(self, query, limit=None):
+        db = self.connection
+        if not self.fts_enabled:
+            raise MirrorException(
+                    'Full-text search is not available',
+                    'SQLite is built without FTS5 support.')
+        sql = ('SELECT entries.data, snippet(entries_fts, -1, ?, ?, '
+               '\'...\', 12) FROM entries_fts '
+               'JOIN entries ON entries.id = entries_fts.rowid '
+               'WHERE entries_fts MATCH ? ORDER BY entries_fts.rank')
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        try:
+            rows = self.__search(db, sql, query)
+        except sqlite3.OperationalError:
+            rows = self.__search(db, sql, " ".join(
+                '"' + term.replace('"', '""') + '"'
+                for term in query.split()))
+        result = []
+        for row in rows:
+            item = json.loads(row[0])
+            item['content'] = ""
+            result.append((Entry(item), Mirror.SPACES_RE.sub(' ', row[1])))
+        return result
+
+    def get_entry(self, entry_id, content=True):
+        try:
+            entry_id = int(entry_id)
+        except (TypeError, ValueError):
+            raise MirrorException("ENTRY_ID is not a number")
+        columns = 'data, content' if content else 'data, NULL'
+        row = self.connection.execute(
+                f'SELECT {columns} FROM entries WHERE id = ?',
+                (entry_id,)).fetchone()
+        if not row:
+            raise MirrorException(
+                    'Entry not found in local mirror',
+                    f'ID: {entry_id}. Run `wallabag sync` first.')
+        item = json.loads(row[0])
+        item['content'] = row[1] or ""
+        return Entry(item)
+
+    def iter_entries(self, read=None, starred=None, tags=None,
+                     oldest=False, untagged=False, limit=None):
+        where, args = self.__filter(read, starred, tags, untagged)
+        order = 'ASC' if oldest else 'DESC'
+        query = (f'SELECT data FROM entries {where} '
+                 f'ORDER BY created_at {order}, id {order}')
+        if limit:
+            query += ' LIMIT ?'
+            args.append(limit)
+        for row in self.connection.execute(query, args):
+            item = json.loads(row[0])
+            item['content'] = ""
+            yield Entry(item)
+
+    def count(self, read=None, starred=None, tags=None, untagged=False):
+        where, args = self.__filter(read, starred, tags, untagged)
+        return self.connection.execute(
+                f'SELECT COUNT(*) FROM entries {where}', args).fetchone()[0]
+
+    def _store_entry(self, db, item):
+        data = dict(item)
+        content = data.pop('content', None) or ""
+        data.pop('_links', None)
+        db.execute(
+                'INSERT OR REPLACE INTO entries (id, updated_at, created_at, '
+                'is_archived, is_starred, data, content) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', (
+                    item['id'], item.get('updated_at'),
+                    item.get('created_at'), item.get('is_archived'),
+                    item.get('is_starred'), json.dumps(data), content))
+
+        db.execute('DELETE FROM entry_tags WHERE entry_id = ?', (item['id'],))
+        for tag in item.get('tags') or []:
+            db.execute(
+                    'INSERT OR REPLACE INTO tags (id, label, slug) '
+                    'VALUES (?, ?, ?)', (tag['id'], tag['label'], tag['slug']))
+            db.execute(
+                    'INSERT INTO entry_tags (entry_id, tag_id) VALUES (?, ?)',
+                    (item['id'], tag['id']))
+
+        db.execute(
+                'DELETE FROM annotations WHERE entry_id = ?', (item['id'],))
+        db.executemany(
+                'INSERT OR REPLACE INTO annotations '
+                '(id, entry_id, updated_at, data) VALUES (?, ?, ?, ?)', [
+                    (anno['id'], item['id'], anno.get('updated_at'),
+                     json.dumps(anno))
+                    for anno in item.get('annotations') or []])
+
+        if self.fts_enabled:
+            self.__index_entry(db, item, content)
+
+    def __index_entry(self, db, item, content):
+        tags = " ".join(tag['label'] for tag in item.get('tags') or [])
+        annotations = " ".join(
+                f"{anno.get('quote') or ''} {anno.get('text') or ''}"
+                for anno in item.get('annotations') or [])
+        db.execute('DELETE FROM entries_fts WHERE rowid = ?', (item['id'],))
+        db.execute(
+                'INSERT INTO entries_fts (rowid, title, url, tags, '
+                'annotations, content) VALUES (?, ?, ?, ?, ?, ?)', (
+                    item['id'], item.get('title'), item.get('url'), tags,
+                    annotations, Mirror.strip_html(content)))
+
+    def strip_html(content):
+        content = Mirror.HTML_SKIP_RE.sub(' ', content or "")
+        return html.unescape(Mirror.HTML_TAG_RE.sub(' ', content))
+
+    def __init_fts(self):
+        db = self.__connection
+        exists = db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'entries_fts'"
+                ).fetchone()
+        if exists:
+            self.fts_enabled = True
+            return
+        try:
+            with db:
+                db.executescript(Mirror.FTS_SCHEMA)
+                weights = ", ".join(str(w) for w in Mirror.FTS_WEIGHTS)
+                db.execute(
+                        'INSERT INTO entries_fts (entries_fts, rank) '
+                        'VALUES (\'rank\', ?)', (f'bm25({weights})',))
+        except sqlite3.OperationalError:
+            self.log.warning('sqlite is built without fts5')
+            return
+        self.fts_enabled = True
+        with db:
+            for row in db.execute('SELECT data, content FROM entries'):
+                self.__index_entry(db, json.loads(row[0]), row[1])
+
+    def __search(self, db, sql, query):
+        return db.execute(
+                sql, (Fore.YELLOW, Fore.RESET, query)).fetchall()
+
+    def __filter(self, read, starred, tags, untagged):
+        conditions = []
+        args = []
+        if read is not None:
+            conditions.append('is_archived = ?')
+            args.append(1 if read else 0)
+        if starred is not None:
+            conditions.append('is_starred = ?')
+            args.append(1 if starred else 0)
+        if tags:
+            tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+            marks = ", ".join('?' * len(tags))
+            conditions.append(
+                    'id IN (SELECT entry_id FROM entry_tags '
+                    'JOIN tags ON tags.id = entry_tags.tag_id '
+                    f'WHERE tags.label IN ({marks}) OR tags.slug IN ({marks}) '
+                    'GROUP BY entry_id HAVING COUNT(DISTINCT tag_id) >= ?)')
+            args.extend(tags + tags + [len(tags)])
+        if untagged:
+            conditions.append(
+                    'NOT EXISTS (SELECT 1 FROM entry_tags '
+                    'WHERE entry_tags.entry_id = entries.id)')
+        if not conditions:
+            return "", args
+        return 'WHERE ' + ' AND '.join(conditions), args
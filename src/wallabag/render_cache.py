@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import PurePath
+
+from xdg.BaseDirectory import xdg_cache_home as XDG_CACHE_HOME
+
+from wallabag.config import Options, Sections
+
+CACHE_DIRECTORY = os.path.expanduser(XDG_CACHE_HOME)
+CACHE_WALLABAG_DIR = "wallabag-cli"
+RENDER_CACHE_PREFIX = "render-"
+DEFAULT_SIZE = 50
+
+
+class CacheStats():
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def hit(self):
+        with self.lock:
+            self.hits += 1
+
+    def miss(self):
+        with self.lock:
+            self.misses += 1
+
+    def evict(self, count):
+        with self.lock:
+            self.evicted += count
+
+    def reset(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            self.evicted = 0
+
+    def __str__(self):
+        return (f'hits: {self.hits}, misses: {self.misses}, '
+                f'evicted: {self.evicted}')
+
+
+STATS = CacheStats()
+
+
+class RenderCache():
+    """
+    On-disk cache of rendered entries with least recently used eviction,
+    one per server and user.
+
+    A key covers everything the output depends on, so entries are never
+    invalidated explicitly: a changed entry or changed render options
+    produce another key, stale files are evicted once the cache grows
+    over its size limit. The modification time of a file is its last use.
+    """
+
+    SUFFIX = ".txt"
+
+    def __init__(self, path, max_size=DEFAULT_SIZE * 1024 * 1024):
+        self.log = logging.getLogger('wallabag.cache')
+        self.path = PurePath(path)
+        self.max_size = max_size
+
+    def get_path(config):
+        digest = config.get_account_digest()
+        return PurePath(
+                CACHE_DIRECTORY, CACHE_WALLABAG_DIR,
+                RENDER_CACHE_PREFIX + digest)
+
+    def create(config):
+        """
+        Cache configured by the `render_size` option (MB) of the `cache`
+        section, None if it's disabled with zero size.
+        """
+        size = config.getint(
+                Sections.CACHE, Options.RENDER_SIZE, DEFAULT_SIZE)
+        if size <= 0:
+            return None
+        return RenderCache(
+                RenderCache.get_path(config), max_size=size * 1024 * 1024)
+
+    def key(entry, *params):
+        """
+        Key of a rendered entry, None when the entry can't be validated.
+        """
+        if not entry.updated_at:
+            return None
+        annotations = json.dumps(entry.annotations or [], sort_keys=True)
+        source = json.dumps([
+            entry.entry_id, entry.updated_at,
+            hashlib.sha1(annotations.encode('utf-8')).hexdigest(),
+            [str(param) for param in params]])
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        path = self.__file(key)
+        try:
+            with open(path, encoding='utf-8') as file:
+                output = file.read()
+        except OSError:
+            STATS.miss()
+            self.log.debug('render cache miss: %s (%s)', key, STATS)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        STATS.hit()
+        self.log.debug('render cache hit: %s (%s)', key, STATS)
+        return output
+
+    def put(self, key, output):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.path, prefix='.')
+            with os.fdopen(fd, mode='w', encoding='utf-8') as file:
+                file.write(output)
+            os.replace(temp_path, self.__file(key))
+            self.__evict()
+        except OSError:
+            self.log.exception("couldn't write render cache")
+
+    def clear(self):
+        for file in self.__files():
+            os.remove(file.path)
+
+    def __file(self, key):
+        return PurePath(self.path, key + RenderCache.SUFFIX)
+
+    def __files(self):
+        try:
+            return [file for file in os.scandir(self.path)
+                    if file.name.endswith(RenderCache.SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    def __evict(self):
+        files = [(file.stat(), file) for file in self.__files()]
+        size = sum(stat.st_size for stat, _ in files)
+        if size <= self.max_size:
+            return
+        evicted = 0
+        for stat, file in sorted(files, key=lambda item: item[0].st_mtime):
+            if size <= self.max_size:
+                break
+            os.remove(file.path)
+            size -= stat.st_size
+            evicted += 1
+        STATS.evict(evicted)
+        self.log.debug('render cache evicted %d files', evicted)
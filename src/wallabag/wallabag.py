@@ -10,37 +10,17 @@ from pathlib import PurePath
 from colorama import Fore
 
 import click
-import click_repl
-
-from wallabag.commands.add import AddCommand, AddCommandParams
-from wallabag.commands.anno import (
-        AnnoCommand, AnnoSubcommand, AnnoCommandParams)
-from wallabag.commands.delete import DeleteCommand, DeleteCommandParams
-from wallabag.commands.list import ListCommand, ListParams, CountCommand
-from wallabag.commands.show import (
-        ShowCommand, ShowCommandParams, Alignment)
-from wallabag.commands.tags import (
-        TagsCommand, TagsCommandParams, TagsSubcommand)
-from wallabag.commands.export import (
-        ExportCommandParams, ExportCommand)
-from wallabag.commands.open import OpenCommand, OpenCommandParams
-from wallabag.commands.info import InfoCommand, InfoCommandParams
-from wallabag.commands.update import UpdateCommand, UpdateCommandParams
-from wallabag.config import Configs
-from wallabag.configurator import (
-        ClientOption,
-        Configurator,
-        PasswordOption,
-        SecretOption,
-        Validator,
-    )
-from wallabag.commands.update_by_tags import UpdateByTagsCommand
-from wallabag.commands.delete_by_tags import DeleteByTags, DeleteByTagsParams
-from wallabag.format_type import FormatType, ScreenType
+
+from wallabag.commands.bulk import BulkExecutor
+from wallabag.commands.subcommands import AnnoSubcommand, TagsSubcommand
+from wallabag.completion import COMPLETE_COMMAND, KINDS
+from wallabag.format_type import Alignment, FormatType, ScreenType
 from wallabag import wclick
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+CONFIGS_CACHE = 'wallabag.configs'
 spinner_enabled = True
+cached_mode = False
 
 
 def __init_logging(debug, debug_level):
@@ -63,9 +43,11 @@ def __init_logging(debug, debug_level):
 @click.option('--debug-level', default='debug', help='Debug level')
 @click.option('--no-spinner', is_flag=True, default=False,
               help='Disable spinner animation')
+@click.option('--cached', is_flag=True, default=False,
+              help='Read entries from the local mirror (see `sync`)')
 @click.version_option(package_name="wallabag-client")
 @click.pass_context
-def cli(ctx, config, debug21, debug_level, no_spinner):
+def cli(ctx, config, debug21, debug_level, no_spinner, cached):
     __init_logging(debug21, debug_level)
 
     global spinner_enabled
@@ -78,7 +60,16 @@ def cli(ctx, config, debug21, debug_level, no_spinner):
         if "65001" not in codepage:
             subprocess.check_output(['chcp', '65001'], shell=True)
 
-    ctx.obj = Configs(config)
+    from wallabag.config import Configs, ConfigsCache, Options, Sections
+
+    # the daemon and the repl keep their configs between commands
+    if isinstance(ctx.obj, ConfigsCache):
+        ctx.meta[CONFIGS_CACHE] = ctx.obj
+    configs = ctx.meta.get(CONFIGS_CACHE)
+    ctx.obj = configs.load(config) if configs else Configs(config)
+
+    global cached_mode
+    cached_mode = cached or ctx.obj.getboolean(Sections.SYNC, Options.OFFLINE)
 
     logger = logging.getLogger('wallabag')
     logger.info('wallabag started')
@@ -94,6 +85,8 @@ def need_config(func):
 Would you like to create it now? [Y/n]
 """)
             if str.lower(i) in ["y", "yes", ""]:
+                from wallabag.configurator import Configurator
+
                 Configurator(ctx.obj).start()
             else:
                 sys.exit(0)
@@ -131,6 +124,8 @@ def list(ctx, starred, read, all, oldest, trim_output,
 
     Gives a summary of entries in wallabag. Use options to filter the results.
     """
+    from wallabag.commands.list import ListCommand, ListParams, CountCommand
+
     config = ctx.obj
     if all:
         read = None
@@ -138,6 +133,7 @@ def list(ctx, starred, read, all, oldest, trim_output,
 
     params = ListParams(
             quantity, read, starred, oldest, trim_output, tags, untagged)
+    params.cached = cached_mode
     run_command(
             CountCommand(config, params) if count else
             ListCommand(config, params))
@@ -168,10 +164,13 @@ def show(
 
     The ENTRY_ID can be found with `list` command.
     """
+    from wallabag.commands.show import ShowCommand, ShowCommandParams
+
     params = ShowCommandParams(
             entry_id, ScreenType.get(type), color, raw, image_links)
     params.width = width
     params.align = Alignment.get(alignment)
+    params.cached = cached_mode
     run_command(ShowCommand(ctx.obj, params))
 
 
@@ -189,6 +188,8 @@ def read(ctx, entry_id, quiet):
 
     The ENTRY_ID can be found with `list` command.
     """
+    from wallabag.commands.update import UpdateCommand, UpdateCommandParams
+
     params = UpdateCommandParams()
     params.toggle_read = True
     params.quiet = quiet
@@ -209,6 +210,8 @@ def star(ctx, entry_id, quiet):
 
     The ENTRY_ID can be found with `list` command.
     """
+    from wallabag.commands.update import UpdateCommand, UpdateCommandParams
+
     params = UpdateCommandParams()
     params.toggle_star = True
     params.quiet = quiet
@@ -226,12 +229,39 @@ def star(ctx, entry_id, quiet):
               help='return the internal URL of the entry')
 @click.option('-q', '--quiet', default=False, is_flag=True,
               help="Hide the output if no error occurs.")
-@click.argument('url', required=True)
+@click.option('-f', '--from-file', type=click.File('r'),
+              help=("Add URLs from file (- for stdin), one per line: "
+                    "URL[<TAB>TITLE[<TAB>TAGS]]."))
+@click.option('-j', '--jobs', default=BulkExecutor.DEFAULT_JOBS,
+              type=click.IntRange(min=1), show_default=True,
+              help="Number of concurrent requests for --from-file.")
+@click.option('--no-probe', is_flag=True, default=False,
+              help="Don't check whether a URL without scheme is "
+              "reachable over https or http, use https.")
+@click.argument('url', required=False)
 @need_config
 @click.pass_context
-def add(ctx, url, title, read, starred, tags, quiet, return_url):
-    """Add a new entry to wallabag."""
-    params = AddCommandParams(url, title, starred, read, tags, return_url)
+def add(ctx, url, title, read, starred, tags, quiet, return_url,
+        from_file, jobs, no_probe):
+    """
+    Add a new entry to wallabag.
+
+    With --from-file every URL gets a result line:
+    `added|exists|failed<TAB>URL<TAB>ENTRY_ID or error`.
+    """
+    from wallabag.commands.add import (
+            AddBatchCommand, AddBatchParams, AddCommand, AddCommandParams)
+
+    if from_file:
+        params = AddBatchParams(
+                from_file, title, starred, read, tags, jobs, quiet,
+                not no_probe)
+        run_command(AddBatchCommand(ctx.obj, params), quiet)
+        return
+    if not url:
+        raise click.UsageError("Missing argument 'URL' or '--from-file'.")
+    params = AddCommandParams(
+            url, title, starred, read, tags, return_url, not no_probe)
     run_command(AddCommand(ctx.obj, params), quiet)
 
 
@@ -249,6 +279,8 @@ def delete(ctx, entry_id, force, quiet):
 
     The ENTRY_ID can be found with `list` command.
     """
+    from wallabag.commands.delete import DeleteCommand, DeleteCommandParams
+
     params = DeleteCommandParams(entry_id, force, quiet)
     run_command(DeleteCommand(ctx.obj, params))
 
@@ -258,16 +290,22 @@ def delete(ctx, entry_id, force, quiet):
               help="Do not ask before deletion.")
 @click.option('-q', '--quiet', default=False, is_flag=True,
               help="Hide the output if no error occurs.")
+@click.option('-j', '--jobs', default=BulkExecutor.DEFAULT_JOBS,
+              type=click.IntRange(min=1), show_default=True,
+              help="Number of concurrent requests.")
 @click.argument('tags', required=True)
 @need_config
 @click.pass_context
-def delete_by_tags(ctx, tags, force, quiet):
+def delete_by_tags(ctx, tags, force, quiet, jobs):
     """
     Delete entries from wallabag by tags.
 
     The TAGS can be found with `tags -c list` command.
     """
-    params = DeleteByTagsParams(tags, force, quiet)
+    from wallabag.commands.delete_by_tags import (
+            DeleteByTags, DeleteByTagsParams)
+
+    params = DeleteByTagsParams(tags, force, quiet, jobs)
     run_command(DeleteByTags(ctx.obj, params), quiet=quiet)
 
 
@@ -293,6 +331,8 @@ def update(ctx, entry_id, title, toggle_read, toggle_starred,
 
         The ENTRY_ID can be found with `list` command.
     """
+    from wallabag.commands.update import UpdateCommand, UpdateCommandParams
+
     params = UpdateCommandParams()
     params.new_title = title
     params.toggle_read = toggle_read
@@ -313,21 +353,28 @@ def update(ctx, entry_id, title, toggle_read, toggle_starred,
               help="Do not ask before update.")
 @click.option('-q', '--quiet', is_flag=True,
               help="Hide the output if no error occurs.")
+@click.option('-j', '--jobs', default=BulkExecutor.DEFAULT_JOBS,
+              type=click.IntRange(min=1), show_default=True,
+              help="Number of concurrent requests.")
 @click.argument('tags', required=True)
 @need_config
 @click.pass_context
-def update_by_tags(ctx, tags, read, starred, force, quiet):
+def update_by_tags(ctx, tags, read, starred, force, quiet, jobs):
     """
         Set the read or starred status of an existing entries
         selected by tags.
 
         The TAGS can be found with `tags -c list` command.
     """
+    from wallabag.commands.update import UpdateCommandParams
+    from wallabag.commands.update_by_tags import UpdateByTagsCommand
+
     params = UpdateCommandParams(False)
     params.set_read_state = read
     params.set_star_state = starred
     params.force = force
     params.quiet = quiet
+    params.jobs = jobs
     run_command(
             UpdateByTagsCommand(ctx.obj, tags, params), quiet=quiet)
 
@@ -355,14 +402,20 @@ def tags(ctx, command, entry_id, tags, tag_id):
 
     If ENTRY_ID specified, make action related to this entry.
     The ENTRY_ID can be found with `list` command.
+    With `--cached`, tags are listed from the mirror, each followed by
+    the number of entries having it, and removing tags by name previews
+    the entries from the mirror.
 
     add command: Add tags to entry. ENTRY_ID and TAGS should be specified.
 
     remove command: Remove tag from entry. (ENTRY_ID and TAGS) or TAG_ID
     should be specified.
     """
+    from wallabag.commands.tags import TagsCommand, TagsCommandParams
+
     params = TagsCommandParams(entry_id=entry_id, tags=tags, tag_id=tag_id)
     params.configure(TagsSubcommand.get(command))
+    params.cached = cached_mode
     run_command(TagsCommand(ctx.obj, params))
 
 
@@ -385,10 +438,13 @@ def anno(ctx, command, entry_id, anno_id):
     {id}. {quote} ({updated}) [{length}]
     {id}. {quote} ({updated}) [{length}]
     """
+    from wallabag.commands.anno import AnnoCommand, AnnoCommandParams
+
     params = AnnoCommandParams()
     params.entry_id = entry_id
     params.anno_id = anno_id
     params.command = AnnoSubcommand.get(command)
+    params.cached = cached_mode
     run_command(AnnoCommand(ctx.obj, params))
 
 
@@ -400,7 +456,11 @@ def info(ctx, entry_id):
     """
     Show entry information.
     """
-    run_command(InfoCommand(ctx.obj, InfoCommandParams(entry_id)))
+    from wallabag.commands.info import InfoCommand, InfoCommandParams
+
+    params = InfoCommandParams(entry_id)
+    params.cached = cached_mode
+    run_command(InfoCommand(ctx.obj, params))
 
 
 @cli.command(short_help="Open entry in browser.")
@@ -419,29 +479,75 @@ def open(ctx, entry_id, open_original, browser):
 
     Example: open 10 -b w3m
     """
+    from wallabag.commands.open import OpenCommand, OpenCommandParams
+
     run_command(
             OpenCommand(
                 ctx.obj, OpenCommandParams(entry_id, open_original, browser)))
 
 
-@cli.command(short_help="Export entry to file.")
+@cli.command(short_help="Export entries to files.")
 @click.option('-o', '--output', help="Output directory or file name")
 @click.option('-f', '--format', default=FormatType.JSON.name,
               type=click.Choice(FormatType.list(), case_sensitive=False),
               help="Export format")
 @click.option('--filename-with-id/--filename-no-id', default=True,
               is_flag=True, help="Add id to filename")
-@click.argument('entry_id', required=True)
+@click.option('-s/-u', '--starred/--unstarred', default=None,
+              help="Export only starred/unstarred entries.")
+@click.option('-r/-n', '--read/--unread', default=None,
+              help="Export only read/unread entries.")
+@click.option('-g', '--tags',
+              help=("Comma-separated tags list. "
+                    "Export entries that matches ALL tags."))
+@click.option('--untagged', is_flag=True,
+              help="Export entries that have no tags.")
+@click.option('-a', '--all', default=False, is_flag=True,
+              help="Export all entries.")
+@click.option('--oldest', default=False, is_flag=True,
+              help="Export oldest matches first.")
+@click.option('-q', '--quantity', type=click.IntRange(min=1),
+              help="Export at most this number of entries.")
+@click.option('-j', '--jobs', default=BulkExecutor.DEFAULT_JOBS,
+              type=click.IntRange(min=1), show_default=True,
+              help="Number of concurrent exports.")
+@click.option('--quiet', default=False, is_flag=True,
+              help="Hide the progress of every entry.")
+@click.argument('entry_id', required=False)
 @need_config
 @click.pass_context
-def export(ctx, entry_id, format, output, filename_with_id):
+def export(ctx, entry_id, format, output, filename_with_id, starred, read,
+           tags, untagged, all, oldest, quantity, jobs, quiet):
     """
     Export entry to file.
 
     Default output to current directory.
+
+    Without ENTRY_ID the entries matching the filters are exported into
+    the output directory, the same filters as for `list` are available.
+    Entries whose file is newer than their last update are skipped.
     """
+    from wallabag.commands.export import (
+            ExportCommand, ExportCommandParams,
+            ExportListCommand, ExportListParams)
+
     output = PurePath(output) if output else None
     format = FormatType.get(format)
+    filters = (all or tags or untagged or quantity
+               or starred is not None or read is not None)
+    if entry_id and filters:
+        raise click.UsageError("ENTRY_ID can't be used with filters.")
+    if not entry_id:
+        if not filters:
+            raise click.UsageError(
+                    "Missing argument 'ENTRY_ID' or a filter (e.g. --all).")
+        params = ExportListParams(
+                format, output, quantity, read, starred, oldest, tags,
+                untagged, jobs, quiet)
+        params.filename_with_id = filename_with_id
+        params.cached = cached_mode
+        run_command(ExportListCommand(ctx.obj, params))
+        return
     params = ExportCommandParams(entry_id, format, output)
     params.filename_with_id = filename_with_id
     run_command(
@@ -449,6 +555,90 @@ def export(ctx, entry_id, format, output, filename_with_id):
                 ctx.obj, params))
 
 
+@cli.command(short_help="Synchronize the local mirror.")
+@click.option('-f', '--full', is_flag=True,
+              help="Drop the mirror and download all entries again.")
+@need_config
+@click.pass_context
+def sync(ctx, full):
+    """
+    Synchronize the local mirror of entries, tags and annotations.
+
+    Only entries changed since the previous synchronization are fetched.
+    A full synchronization also forgets the saved URLs of entries deleted
+    with another client.
+    Read commands use the mirror when the global `--cached` option is
+    given or `offline = yes` is set in the `[sync]` config section.
+    """
+    from wallabag.commands.sync import SyncCommand, SyncCommandParams
+
+    run_command(SyncCommand(ctx.obj, SyncCommandParams(full)))
+
+
+@cli.command(short_help="Send the changes queued while offline.")
+@click.option('-f', '--force', is_flag=True,
+              help="Apply changes to entries changed on the server since.")
+@click.option('-q', '--quiet', is_flag=True,
+              help="Hide the result lines of the replayed changes.")
+@click.option('-j', '--jobs', default=BulkExecutor.DEFAULT_JOBS,
+              type=click.IntRange(min=1), show_default=True,
+              help="Number of concurrent requests.")
+@need_config
+@click.pass_context
+def flush(ctx, force, quiet, jobs):
+    """
+    Send the changes queued while the server was unreachable.
+
+    `add`, `read`, `star`, `update`, `delete` and `tags` add or remove
+    queue their changes when the server can't be reached. They are sent
+    by this command or after the next command reaching the server.
+    Changes cancelling out are dropped and the tags added to an entry
+    are sent at once. Every change gets a result line:
+    `replayed|conflict|queued|failed<TAB>CHANGE<TAB>error`.
+
+    The changes of an entry updated on the server after they were queued
+    are conflicts: they stay queued unless --force is given. Set
+    `journal = no` in the `[sync]` config section to disable the queue.
+    """
+    from wallabag.commands.flush import FlushCommand, FlushCommandParams
+
+    run_command(FlushCommand(ctx.obj, FlushCommandParams(force, quiet, jobs)))
+
+
+@cli.command(short_help="Full-text search in the local mirror.")
+@click.option('--trim-output/--no-trim-output', default=True, is_flag=True,
+              help="Trim the titles to fit the length of the cli.")
+@click.option('-q', '--quantity', type=click.INT,
+              help="Set the number of entries to show.")
+@click.argument('query', required=True)
+@need_config
+@click.pass_context
+def search(ctx, query, trim_output, quantity):
+    """
+    Search entries by title, url, tags, annotations and content.
+
+    The search works offline over the local mirror, use `sync` command
+    to update it. QUERY supports the SQLite FTS5 syntax, e.g.
+    `python AND (asyncio OR threads)` or `"exact phrase"`.
+    """
+    from wallabag.commands.search import SearchCommand, SearchCommandParams
+
+    params = SearchCommandParams(query, quantity, trim_output)
+    run_command(SearchCommand(ctx.obj, params))
+
+
+@cli.command(name=COMPLETE_COMMAND, hidden=True)
+@click.argument('kind', type=click.Choice(KINDS))
+@click.pass_context
+def complete(ctx, kind):
+    """
+    Print the shell completion candidates of KIND from the local cache.
+    """
+    from wallabag import completion
+
+    sys.exit(completion.main(str(ctx.obj.get_path()), [kind]))
+
+
 @cli.command(short_help="Start configuration.")
 @click.option('-c', '--check', is_flag=True,
               help="Check the config for errors.")
@@ -458,6 +648,14 @@ def export(ctx, entry_id, format, output, filename_with_id):
               help="Change the wallabag client credentials.")
 @click.pass_context
 def config(ctx, check, password, oauth):
+    from wallabag.configurator import (
+            ClientOption,
+            Configurator,
+            PasswordOption,
+            SecretOption,
+            Validator,
+        )
+
     config = ctx.obj
     if check:
         run_command(Validator(config))
@@ -486,6 +684,9 @@ def config(ctx, check, password, oauth):
 
 
 def run_command(command, quiet=False):
+    from wallabag.api.api import Api
+
+    received = Api.received
     if spinner_enabled:
         with wclick.spinner():
             result, output = command.execute()
@@ -494,8 +695,85 @@ def run_command(command, quiet=False):
 
     if not quiet and output:
         click.echo(output)
+    if result and Api.received != received and not command.queued:
+        __flush_journal(command)
     if not result:
         sys.exit(1)
 
 
-click_repl.register_repl(cli)
+def __flush_journal(command):
+    """
+    Send the changes queued while offline once a command reached the
+    server again. Changes in conflict wait for an explicit `flush`.
+    """
+    from wallabag.commands.flush import FlushCommand, FlushCommandParams
+    from wallabag.journal import Journal
+
+    config = getattr(command, 'config', None)
+    if isinstance(command, FlushCommand) or not config:
+        return
+    journal = Journal.create(config)
+    if not journal or not journal.pending():
+        return
+    if all(change.conflict or change.is_empty()
+           for change in Journal.coalesce(journal.read()[0])):
+        return
+    click.echo('Sending the changes queued while offline:', err=True)
+    result, output = FlushCommand(config, FlushCommandParams(
+            quiet=True, skip_conflicts=True)).execute()
+    if output:
+        click.echo(output, err=True)
+
+
+@cli.command(short_help="Start an interactive shell.")
+@click.pass_context
+def repl(ctx):
+    """
+    Start an interactive shell. All subcommands are available in it.
+
+    The config, the access token, the connections and the entries and
+    tags fetched in the last minutes are kept between commands. Commands
+    changing entries or tags drop the fetched ones.
+
+    If stdin is not a TTY, commands are read from stdin without a prompt.
+    """
+    import click_repl
+
+    from wallabag.api.api import RESPONSES
+    from wallabag.config import ConfigsCache
+
+    ctx.meta[CONFIGS_CACHE] = ConfigsCache()
+    RESPONSES.enabled = True
+    try:
+        click_repl.repl(ctx)
+    finally:
+        RESPONSES.enabled = False
+        RESPONSES.clear()
+
+
+@cli.command(short_help="Serve commands from a background process.")
+@click.option('--stop', is_flag=True, help="Stop the running daemon.")
+def daemon(stop):
+    """
+    Run the commands of other `wallabag` calls in this process.
+
+    The HTTP connections, the access token and the config stay loaded
+    between commands, so scripts calling wallabag in a loop don't pay
+    the startup cost on every call. Without a running daemon commands
+    run in their own process. Stop it with Ctrl-C or `daemon --stop`.
+    """
+    from wallabag.client import Client
+    from wallabag.daemon import Daemon
+
+    if stop:
+        if not Client().stop():
+            wclick.echo("The daemon is not running.")
+            sys.exit(1)
+        return
+    try:
+        Daemon().serve()
+    except ValueError as error:
+        wclick.echo(str(error))
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
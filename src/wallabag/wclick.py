@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import os
+
 import click
-from yaspin import yaspin
 
 
 SPINNER = None
+# set by the daemon to the size of its client's terminal, () if none
+TERMINAL_SIZE = None
 
 
 def spinner():
     global SPINNER
     if not SPINNER:
+        from yaspin import yaspin
+
         SPINNER = yaspin(color="yellow")
     return SPINNER
 
@@ -19,6 +24,18 @@ def stop_spinner():
     pass
 
 
+def progress(text):
+    spinner().text = text
+
+
+def terminal_size():
+    if TERMINAL_SIZE is None:
+        return os.get_terminal_size()
+    if not TERMINAL_SIZE:
+        raise OSError('not a terminal')
+    return os.terminal_size(TERMINAL_SIZE)
+
+
 def confirm(msg):
     spinner().stop()
     result = click.confirm(msg)
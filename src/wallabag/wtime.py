@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Dates of the API: ISO-8601 parsing, local time and "time ago" formatting.
+"""
+
+import datetime
+import functools
+
+ISO_FORMATS = ('%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f%z')
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+UNITS = (
+        (365 * 24 * 60 * 60, 'a year', 'years'),
+        (30 * 24 * 60 * 60, 'a month', 'months'),
+        (24 * 60 * 60, 'a day', 'days'),
+        (60 * 60, 'an hour', 'hours'),
+        (60, 'a minute', 'minutes'),
+        (1, 'a second', 'seconds'))
+
+
+@functools.lru_cache(maxsize=4096)
+def parse(value):
+    """
+    Timezone aware datetime of an ISO-8601 string, as sent by wallabag
+    (`2020-11-04T11:37:45+0000`). Naive values are taken as UTC.
+    """
+    try:
+        date = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        for format in ISO_FORMATS:
+            try:
+                date = datetime.datetime.strptime(value, format)
+                break
+            except ValueError:
+                pass
+        else:
+            raise ValueError(f'Invalid date: {value}')
+    if not date.tzinfo:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return date
+
+
+def utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def local(date):
+    return date.astimezone()
+
+
+def format_datetime(date):
+    """
+    Date in the local timezone: `Nov 4, 2020, 11:37:45 AM`.
+    """
+    date = local(date)
+    hour = date.hour % 12 or 12
+    return (f'{MONTHS[date.month - 1]} {date.day}, {date.year}, '
+            f'{hour}:{date:%M:%S} {"AM" if date.hour < 12 else "PM"}')
+
+
+def naturaltime(date, now=None):
+    """
+    Time from `date` to `now` in words: `5 minutes ago`, `a day ago`.
+    """
+    delta = ((now or utcnow()) - date).total_seconds()
+    suffix = 'ago' if delta >= 0 else 'from now'
+    seconds = int(abs(delta))
+    if not seconds:
+        return 'now'
+    for size, one, many in UNITS:
+        if seconds >= size:
+            count = seconds // size
+            return f'{one if count == 1 else f"{count} {many}"} {suffix}'
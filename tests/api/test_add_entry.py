@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import threading
+import time
+
 import pytest
 
-from wallabag.api.api import ApiMethod, ValueException
+from wallabag.api.api import (
+        Api, ApiMethod, PROBES, RequestException, Response, ValueException)
 from wallabag.api.add_entry import AddEntry, Params
 from wallabag.config import Configs
 
@@ -24,6 +28,7 @@ class TestAddEntry():
                 client = 100
                 secret = 100
                 """)
+        PROBES.clear()
 
     @pytest.mark.parametrize('entry_id', [10, "10"])
     def test_api_url(self, entry_id):
@@ -83,3 +88,84 @@ class TestAddEntry():
 
         data = api._get_data()
         assert AddEntry.ApiParams.TAGS.value in data
+
+    @pytest.mark.parametrize('values', [
+        ({'https://site', 'http://site'}, 'https://site/page'),
+        ({'http://site'}, 'http://site/page'),
+        (set(), 'https://site/page')])
+    def test_probe_scheme(self, monkeypatch, values):
+        probed = []
+        lock = threading.Lock()
+
+        def _is_valid_url(self, url):
+            with lock:
+                probed.append(url)
+            return url.startswith(tuple(values[0]))
+
+        monkeypatch.setattr(AddEntry, '_is_valid_url', _is_valid_url)
+
+        api = AddEntry(self.config, 'site/page', {})
+        assert api._validate_url('site/page') == values[1]
+        # a reachable https site doesn't wait for the http probe
+        for _ in range(100):
+            if len(probed) == 2:
+                break
+            time.sleep(0.01)
+        assert sorted(probed) == ['http://site/page', 'https://site/page']
+
+        del probed[:]
+        assert api._validate_url('site/other') == values[1].replace(
+                'page', 'other')
+        assert probed == []
+
+    def test_probe_preferred_failure(self, monkeypatch):
+        def _is_valid_url(self, url):
+            if url.startswith('https://'):
+                time.sleep(0.2)
+                return False
+            return True
+
+        monkeypatch.setattr(AddEntry, '_is_valid_url', _is_valid_url)
+
+        api = AddEntry(self.config, 'site', {})
+        # the http answer waits for the https failure
+        assert api._validate_url('site') == 'http://site'
+
+    def test_no_probe(self, monkeypatch):
+        def _is_valid_url(self, url):
+            raise AssertionError('probed')
+
+        monkeypatch.setattr(AddEntry, '_is_valid_url', _is_valid_url)
+
+        api = AddEntry(self.config, 'site', {}, probe=False)
+        assert api._validate_url('site') == 'https://site'
+        api = AddEntry(self.config, 'http://site', {})
+        assert api._validate_url('http://site') == 'http://site'
+
+        self.config.config.read_string("""
+                [http]
+                probe = no
+                """)
+        api = AddEntry(self.config, 'site', {})
+        assert api._validate_url('site') == 'https://site'
+
+    @pytest.mark.parametrize('values', [
+        (200, None, True),
+        (404, None, False),
+        (405, 200, True),
+        (405, 404, False)])
+    def test_is_valid_url(self, monkeypatch, values):
+        def request(status):
+            def _request(self, request):
+                assert request.timeout == 5
+                response = Response(status, None)
+                if response.has_error():
+                    raise RequestException(response=response)
+                return response
+            return _request
+
+        monkeypatch.setattr(Api, '_request_head', request(values[0]))
+        monkeypatch.setattr(Api, '_request_get', request(values[1]))
+
+        api = AddEntry(self.config, 'https://site', {})
+        assert api._is_valid_url('https://site') == values[2]
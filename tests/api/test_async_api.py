@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+
+import pytest
+
+from wallabag.api.api import Api, RequestException
+from wallabag.api.async_api import AsyncClient
+from wallabag.api.delete_entry import DeleteEntry
+from wallabag.api.entry_exists import EntryExists
+from wallabag.api.get_entry import GetEntry
+from wallabag.api.update_entry import Params, UpdateEntry
+from wallabag.config import Configs
+
+web = pytest.importorskip('aiohttp.web')
+
+
+def get_authorization_header(self):
+    return {'Authorization': "Bearer a1b2"}
+
+
+def json_response(data):
+    # content type as sent by wallabag, without charset
+    return web.Response(
+            body=json.dumps(data).encode('utf-8'),
+            headers={'Content-Type': 'application/json'})
+
+
+class MockServer():
+
+    def __init__(self):
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    async def entry(self, request):
+        self.requests.append((
+            request.method, request.path,
+            request.headers.get('Authorization'),
+            dict(await request.post())))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        entry_id = int(request.match_info['entry_id'])
+        if entry_id == 404:
+            return web.Response(status=404)
+        return json_response({
+            "id": entry_id, "title": "title", "content": "content",
+            "url": "url", "is_archived": 0, "is_starred": 0})
+
+    async def exists(self, request):
+        self.requests.append((
+            request.method, request.path, None,
+            request.query.getall('urls[]')))
+        return json_response(
+                {url: None for url in request.query.getall('urls[]')})
+
+    async def run(self, test):
+        app = web.Application()
+        app.router.add_route('*', '/api/entries/exists', self.exists)
+        app.router.add_route('*', '/api/entries/{entry_id}', self.entry)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await test(f'http://127.0.0.1:{port}')
+        finally:
+            await runner.cleanup()
+
+
+class TestAsyncClient():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.server = MockServer()
+
+    def run(self, test, limit=None):
+        async def client_test(serverurl):
+            self.config.config.read_string(f"""
+                    [api]
+                    serverurl = {serverurl}
+                    """)
+            async with AsyncClient(self.config, limit) as client:
+                return await test(client)
+        return asyncio.run(self.server.run(client_test))
+
+    def test_requests(self, monkeypatch):
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
+
+        responses = self.run(lambda client: client.gather([
+            GetEntry(self.config, 1),
+            UpdateEntry(self.config, 2, {Params.TITLE: 'new title'}),
+            DeleteEntry(self.config, 3),
+            EntryExists(self.config, urls=['http://one', 'http://two'])]))
+
+        assert [response.response['id'] for response in responses[:3]] == [
+                1, 2, 3]
+        assert responses[3].response == {
+                'http://one': None, 'http://two': None}
+        exists = [request for request in self.server.requests
+                  if request[1] == '/api/entries/exists']
+        assert exists == [('GET', '/api/entries/exists', None,
+                           ['http://one', 'http://two'])]
+        assert sorted([request for request in self.server.requests
+                       if request not in exists]) == [
+            ('DELETE', '/api/entries/3', 'Bearer a1b2', {}),
+            ('GET', '/api/entries/1', 'Bearer a1b2', {}),
+            ('PATCH', '/api/entries/2', 'Bearer a1b2',
+             {'title': 'new title'})]
+
+    def test_error(self, monkeypatch):
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
+
+        async def test(client):
+            with pytest.raises(RequestException) as error:
+                await client.request(GetEntry(self.config, 404))
+            return error.value
+
+        error = self.run(test)
+        assert str(error) == 'Error: 404: API was not found.'
+
+    def test_connection_limit(self, monkeypatch):
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
+
+        responses = self.run(lambda client: client.gather(
+                [GetEntry(self.config, entry_id)
+                 for entry_id in range(1, 21)]), limit=3)
+
+        assert len(responses) == 20
+        assert 1 < self.server.max_active <= 3
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from wallabag.api.api import Response, ValueException
+from wallabag.api.entry_exists import EntryExists
+from wallabag.config import Configs
+
+
+class TestEntryExists():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string("""
+                [api]
+                serverurl = url
+                username = user
+                password = pass
+                [oauth2]
+                client = 100
+                secret = 100
+                """)
+
+    def test_params(self):
+        params = EntryExists(self.config, 'http://one')._get_params()
+        assert params == {'url': 'http://one', 'return_id': 1}
+
+        params = EntryExists(
+                self.config, urls=['http://one', 'http://two'])._get_params()
+        assert params == {
+                'urls[]': ['http://one', 'http://two'], 'return_id': 1}
+
+    def test_empty_url(self):
+        with pytest.raises(ValueException):
+            EntryExists(self.config)._get_params()
+
+    def test_chunks(self, monkeypatch):
+        monkeypatch.setattr(EntryExists, 'MAX_URLS', 3)
+        urls = [f'http://url/{index}' for index in range(7)]
+
+        chunks = list(EntryExists.chunks(urls))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert sum(chunks, []) == urls
+
+    def test_chunks_by_length(self):
+        urls = ['http://url/' + 'x' * 2000 for _ in range(5)]
+
+        chunks = list(EntryExists.chunks(urls))
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    def test_check(self, monkeypatch):
+        requests = []
+
+        def request(self):
+            requests.append(self.urls)
+            return Response(200, json.dumps(
+                    {url: 7 if url.endswith('saved') else None
+                     for url in self.urls}))
+
+        monkeypatch.setattr(EntryExists, 'request', request)
+        monkeypatch.setattr(EntryExists, 'MAX_URLS', 2)
+
+        result = EntryExists.check(
+                self.config, ['http://new', 'http://saved', 'http://other'])
+        assert result == {
+                'http://new': None, 'http://saved': 7, 'http://other': None}
+        assert requests == [['http://new', 'http://saved'], ['http://other']]
@@ -1,11 +1,40 @@
 # -*- coding: utf-8 -*-
 
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
 import pytest
 
-from wallabag.api.api import ApiMethod, ValueException
+from wallabag.api.api import (
+        Api, ApiMethod, RequestException, STREAM_CHUNK_SIZE, ValueException)
 from wallabag.api.export_entry import ExportEntry
+from wallabag.api.session import HttpSession
 from wallabag.config import Configs
 
+BODY = bytes(range(256)) * 1024
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path != '/api/entries/10/export.epub':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/epub+zip')
+        self.send_header(
+                'Content-Disposition', 'attachment; filename="title.epub"')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
 
 class TestExportEntry():
 
@@ -33,3 +62,31 @@ class TestExportEntry():
 
         with pytest.raises(ValueException):
             api._get_api_url()
+
+    def test_request_to(self, monkeypatch):
+        server = HTTPServer(('127.0.0.1', 0), ExportHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.config.config.set(
+                'api', 'serverurl', f'http://127.0.0.1:{server.server_port}')
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', lambda self: {})
+        HttpSession.close()
+        progress = []
+
+        try:
+            output = io.BytesIO()
+            response = ExportEntry(self.config, 10, 'epub').request_to(
+                    output, lambda received, total: progress.append(
+                        (received, total)))
+            with pytest.raises(RequestException):
+                ExportEntry(self.config, 11, 'epub').request_to(output)
+        finally:
+            HttpSession.close()
+            server.shutdown()
+            server.server_close()
+
+        assert output.getvalue() == BODY
+        assert response.content is None
+        assert response.filename == 'title.epub'
+        assert len(progress) == len(BODY) // STREAM_CHUNK_SIZE
+        assert progress[-1] == (len(BODY), len(BODY))
@@ -1,12 +1,35 @@
 # -*- coding: utf-8 -*-
 
+import json
+
 import pytest
 
-from wallabag.api.api import ApiMethod
+from wallabag.api.api import Api, ApiMethod, Response
 from wallabag.api.get_list_entries import GetListEntries, Params
 from wallabag.config import Configs
 
 
+def get_authorization_header(self):
+    return {'Authorization': "Bearer a1b2"}
+
+
+def make_request_pages(total, requested):
+    def _make_request(self, request):
+        page = request.api_params[GetListEntries.ApiParams.PAGE.value]
+        per_page = request.api_params[GetListEntries.ApiParams.PER_PAGE.value]
+        requested.append(page)
+        start = (page - 1) * per_page + 1
+        items = [
+            {"id": i, "title": f"title {i}", "content": "", "url": "url",
+             "is_archived": 0, "is_starred": 0}
+            for i in range(start, min(start + per_page, total + 1))]
+        pages = -(-total // per_page)
+        return Response(200, json.dumps({
+            "page": page, "limit": per_page, "pages": pages,
+            "total": total, "_embedded": {"items": items}}))
+    return _make_request
+
+
 class TestGetEntriesList():
 
     def setup_method(self, method):
@@ -108,3 +131,60 @@ class TestGetEntriesList():
                     GetListEntries.ApiParams.ORDER.value)
         else:
             assert GetListEntries.ApiParams.ORDER.value not in params
+
+    @pytest.mark.parametrize('page', [(2, 2), (None, None), (0, None)])
+    def test_param_page(self, page):
+        api = GetListEntries(self.config, {
+            Params.COUNT: 1,
+            Params.PAGE: page[0]
+        })
+
+        params = api._get_params()
+        assert params.get(GetListEntries.ApiParams.PAGE.value) == page[1]
+
+    @pytest.mark.parametrize('prefetch', [True, False])
+    def test_iter_entries(self, monkeypatch, prefetch):
+        requested = []
+        monkeypatch.setattr(
+                GetListEntries, '_make_request',
+                make_request_pages(25, requested))
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
+
+        api = GetListEntries(self.config, {Params.TAGS: 'tag'})
+        entries = list(api.iter_entries(page_size=10, prefetch=prefetch))
+
+        assert [e.entry_id for e in entries] == list(range(1, 26))
+        assert requested == [1, 2, 3]
+
+    def test_iter_pages_stops_early(self, monkeypatch):
+        requested = []
+        monkeypatch.setattr(
+                GetListEntries, '_make_request',
+                make_request_pages(100, requested))
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
+
+        api = GetListEntries(self.config, {})
+        pages = api.iter_pages(page_size=10)
+        assert next(pages)['page'] == 1
+        assert next(pages)['page'] == 2
+        pages.close()
+        assert requested == [1, 2]
+
+    def test_iter_pages_next_link(self, monkeypatch):
+        requested = []
+
+        def request(self):
+            page = self.params[Params.PAGE]
+            requested.append(page)
+            links = {"next": {"href": "url"}} if page < 3 else {}
+            return Response(200, json.dumps({
+                "page": page, "_links": links,
+                "_embedded": {"items": []}}))
+
+        monkeypatch.setattr(GetListEntries, 'request', request)
+
+        api = GetListEntries(self.config, {})
+        assert len(list(api.iter_pages())) == 3
+        assert requested == [1, 2, 3]
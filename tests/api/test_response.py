@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag import jsonlib
+from wallabag.api.api import Error, Response
+
+
+class TestResponse():
+
+    @pytest.fixture(params=['json', 'orjson'])
+    def backend(self, request, monkeypatch):
+        if request.param == 'json':
+            monkeypatch.setattr(jsonlib, 'orjson', None)
+        elif not jsonlib.orjson:
+            pytest.skip('orjson is not installed')
+
+    def test_json_from_bytes(self, backend):
+        content = '{"title": "ünïcode"}'.encode('utf-8')
+        response = Response(200, None, content)
+
+        assert response.response == {"title": "ünïcode"}
+        assert response.content is content
+        assert not response.has_error()
+
+    def test_json_from_text(self, backend):
+        response = Response(200, '{"id": 1}')
+
+        assert response.response == {"id": 1}
+        assert response.content == b'{"id": 1}'
+
+    def test_invalid_json(self, backend):
+        response = Response(200, None, b'<html>')
+
+        assert response.response == '<html>'
+        assert response.error_text
+        assert response.error == Error.OK
+
+    def test_binary(self):
+        response = Response(
+                200, None, b'%PDF', 'application/pdf',
+                'attachment; filename="title.pdf"')
+
+        assert response.response is None
+        assert response.content == b'%PDF'
+        assert response.filename == 'title.pdf'
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.api.api import Api, Response, RESPONSES
+from wallabag.api.get_entry import GetEntry
+from wallabag.api.get_api_version import ApiVersion
+from wallabag.api.get_tags import GetTags
+from wallabag.api.update_entry import UpdateEntry, Params
+from wallabag.config import Configs
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    sent = []
+
+    def make_request(self, request):
+        sent.append((request.type.name, request.url))
+        return Response(200, '{"id": 1}')
+
+    monkeypatch.setattr(Api, '_Api__make_request', make_request)
+    monkeypatch.setattr(
+            Api, '_get_authorization_header',
+            lambda self: {'Authorization': 'Bearer token'})
+    RESPONSES.enabled = True
+    yield sent
+    RESPONSES.enabled = False
+    RESPONSES.clear()
+
+
+class TestResponseCache():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string("""
+                [api]
+                serverurl = https://server
+                """)
+
+    def test_cached(self, requests):
+        first = GetEntry(self.config, 1).request()
+        assert GetEntry(self.config, 1).request() is first
+        GetEntry(self.config, 2).request()
+        GetTags(self.config).request()
+        GetTags(self.config).request()
+
+        assert requests == [
+                ('GET', 'https://server/api/entries/1'),
+                ('GET', 'https://server/api/entries/2'),
+                ('GET', 'https://server/api/tags')]
+
+    def test_disabled(self, requests):
+        RESPONSES.enabled = False
+        GetEntry(self.config, 1).request()
+        GetEntry(self.config, 1).request()
+
+        assert len(requests) == 2
+
+    def test_not_cacheable(self, requests):
+        ApiVersion(self.config).request()
+        ApiVersion(self.config).request()
+
+        assert len(requests) == 2
+
+    def test_cleared_by_change(self, requests):
+        GetEntry(self.config, 1).request()
+        UpdateEntry(self.config, 1, {Params.READ: True}).request()
+        GetEntry(self.config, 1).request()
+
+        assert [verb for verb, url in requests] == ['GET', 'PATCH', 'GET']
+
+    def test_cleared_by_failed_change(self, requests, monkeypatch):
+        GetEntry(self.config, 1).request()
+
+        def make_request(self, request):
+            raise ValueError('failed')
+
+        monkeypatch.setattr(Api, '_Api__make_request', make_request)
+        with pytest.raises(ValueError):
+            UpdateEntry(self.config, 1, {Params.READ: True}).request()
+        assert not RESPONSES.responses
+
+    def test_expired(self, requests, monkeypatch):
+        monkeypatch.setattr(RESPONSES, 'ttl', 0)
+        GetEntry(self.config, 1).request()
+        GetEntry(self.config, 1).request()
+
+        assert len(requests) == 2
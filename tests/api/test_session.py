@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from wallabag.api.api import ConnectionException, RequestException
+from wallabag.api.session import HttpSession, STATS
+from wallabag.api.get_api_version import ApiVersion
+from wallabag.config import Configs
+
+
+class VersionHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'"2.4.0"'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpSession():
+
+    def setup_method(self, method):
+        self.server = HTTPServer(('127.0.0.1', 0), VersionHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string(f"""
+                [api]
+                serverurl = http://127.0.0.1:{self.server.server_port}
+                [http]
+                pool_size = 4
+                retries = 1
+                """)
+        HttpSession.close()
+        STATS.reset()
+
+    def teardown_method(self, method):
+        HttpSession.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_session_is_shared(self):
+        assert HttpSession.get(self.config) is HttpSession.get(self.config)
+
+    def test_pool_settings(self):
+        adapter = HttpSession.get(self.config).get_adapter('https://')
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 1
+
+    def test_probe_session(self):
+        session = HttpSession.probe(self.config)
+        assert session is HttpSession.probe(self.config)
+        assert session is not HttpSession.get(self.config)
+        assert session.get_adapter('https://').max_retries.total == 0
+
+    def test_connection_reused(self):
+        for _ in range(3):
+            response = ApiVersion(self.config).request()
+            assert response.response == '2.4.0'
+
+        assert STATS.requests == 3
+        assert STATS.opened == 1
+        assert STATS.reused() == 2
+
+    def test_missing_scheme(self):
+        self.config.config.set('api', 'serverurl', 'server')
+        with pytest.raises(RequestException) as error:
+            ApiVersion(self.config).request()
+        assert not isinstance(error.value, ConnectionException)
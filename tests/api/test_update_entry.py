@@ -2,7 +2,7 @@
 
 import pytest
 
-from wallabag.api.api import ApiMethod, ValueException
+from wallabag.api.api import Api, ApiMethod, ValueException, Verbs
 from wallabag.api.update_entry import UpdateEntry, Params
 from wallabag.config import Configs
 
@@ -61,3 +61,18 @@ class TestUpdateEntry():
         data = api._get_data()
         assert UpdateEntry.ApiParams.TITLE.value not in data
         assert data[UpdateEntry.ApiParams.ARCHIVE.value] == 1
+
+    def test_prepare(self, monkeypatch):
+        def _make_request(self, request):
+            raise AssertionError('request sent')
+
+        monkeypatch.setattr(Api, '_Api__make_request', _make_request)
+        monkeypatch.setattr(
+                Api, '_get_authorization_header',
+                lambda self: {'Authorization': "Bearer a1b2"})
+
+        request = UpdateEntry(self.config, 2, {Params.STAR: True}).prepare()
+        assert request.type == Verbs.PATCH
+        assert request.url == 'url/api/entries/2'
+        assert request.headers == {'Authorization': "Bearer a1b2"}
+        assert request.data == {'starred': 1}
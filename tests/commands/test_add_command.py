@@ -1,15 +1,22 @@
 # -*- coding: utf-8 -*-
 
+import io
+import json
+
 import pytest
 
+from click.testing import CliRunner
 from colorama import Fore
 
 from tags import tags_test
-from wallabag.api.add_entry import AddEntry
-from wallabag.api.api import Api, Response
+from wallabag.api.add_entry import AddEntry, Params as AddEntryParams
+from wallabag.api.api import Api, RequestException, Response
 from wallabag.api.entry_exists import EntryExists
-from wallabag.commands.add import AddCommand, AddCommandParams
+from wallabag.commands.add import (
+        AddBatchCommand, AddBatchParams, AddCommand, AddCommandParams)
 from wallabag.config import Configs
+from wallabag.known_urls import KnownUrls
+from wallabag import wallabag, wclick
 
 
 def get_authorization_header(self):
@@ -30,6 +37,11 @@ class TestAddCommand():
                 secret = 100
                 """)
 
+    @pytest.fixture(autouse=True)
+    def known_urls(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+                KnownUrls, 'get_path', lambda config: tmp_path / 'known')
+
     def test_entry_existed_url(self, monkeypatch):
         make_request_runned = False
         url = "http://test/url"
@@ -159,3 +171,112 @@ class TestAddCommand():
             assert not make_request_runned
             assert not result[0]
             assert result[1] == "tags value is empty"
+
+    def test_add_batch(self, monkeypatch):
+        output = []
+        added = []
+
+        def entry_exists(self):
+            return Response(200, json.dumps(
+                    {url: 7 if url == 'http://saved' else None
+                     for url in self.urls}))
+
+        def add_entry(self):
+            if self.url == 'http://broken':
+                raise RequestException(response=Response(404, None))
+            added.append((self.url, self.params[AddEntryParams.TITLE],
+                          self.params[AddEntryParams.TAGS]))
+            return Response(200, json.dumps({
+                "id": len(added) + 10, "title": "title", "content": "",
+                "url": self.url, "is_archived": 0, "is_starred": 0}))
+
+        def echo(msg, *args, **kwargs):
+            output.append(msg)
+
+        monkeypatch.setattr(EntryExists, 'request', entry_exists)
+        monkeypatch.setattr(AddEntry, 'request', add_entry)
+        monkeypatch.setattr(wclick, 'echo', echo)
+
+        source = io.StringIO(
+                "# reading list\n"
+                "http://new\tcustom title\tt1, t2\n"
+                "\n"
+                "http://saved\n"
+                "http://new\n"
+                "http://broken\n")
+        params = AddBatchParams(source, title='default', tags='t3', jobs=2)
+        result, summary = AddBatchCommand(self.config, params).execute()
+
+        assert not result
+        assert summary == (
+                'Added: 1, exists: 1, failed: 1, duplicates: 1')
+        assert added == [('http://new', 'custom title', 't1,t2')]
+        assert output == [
+                'added\thttp://new\t11',
+                'exists\thttp://saved\t7',
+                'failed\thttp://broken\tError: 404: API was not found.']
+
+    def test_add_batch_known_urls(self, monkeypatch):
+        checked = []
+        known = KnownUrls(KnownUrls.get_path(self.config))
+        known.add('http://saved', 7)
+        known.save()
+
+        def entry_exists(self):
+            checked.extend(self.urls)
+            return Response(200, json.dumps({url: None for url in self.urls}))
+
+        def add_entry(self):
+            return Response(200, json.dumps({
+                "id": 11, "title": "title", "content": "", "url": self.url,
+                "is_archived": 0, "is_starred": 0}))
+
+        monkeypatch.setattr(EntryExists, 'request', entry_exists)
+        monkeypatch.setattr(AddEntry, 'request', add_entry)
+        monkeypatch.setattr(wclick, 'echo', lambda *args, **kwargs: None)
+
+        params = AddBatchParams(io.StringIO("http://saved\nhttp://new\n"))
+        result, summary = AddBatchCommand(self.config, params).execute()
+        assert result
+        assert summary == 'Added: 1, exists: 1, failed: 0, duplicates: 0'
+        assert checked == ['http://new']
+
+        params = AddBatchParams(io.StringIO("http://saved\nhttp://new\n"))
+        result, summary = AddBatchCommand(self.config, params).execute()
+        assert summary == 'Added: 0, exists: 2, failed: 0, duplicates: 0'
+        assert checked == ['http://new']
+
+    def test_add_known_url(self, monkeypatch):
+        requests = 0
+
+        def entry_exists(self):
+            nonlocal requests
+            requests += 1
+            return Response(200, '{"exists": 3}')
+
+        monkeypatch.setattr(EntryExists, 'request', entry_exists)
+
+        for _ in range(2):
+            result = AddCommand(self.config, AddCommandParams('url')).execute()
+            assert result == (True, "The url was already saved.")
+        assert requests == 1
+
+    def test_add_batch_cli(self, monkeypatch):
+        command = None
+
+        def run_command(cmd, quiet=False):
+            nonlocal command
+            command = cmd
+
+        monkeypatch.setattr(wallabag, 'run_command', run_command)
+        monkeypatch.setattr(Configs, 'is_valid', lambda self: True)
+
+        result = CliRunner().invoke(
+                wallabag.cli, ['add', '-j', '8', '--from-file', '-'],
+                input='http://one\nhttp://two\n', catch_exceptions=False)
+        assert result.exit_code == 0
+        assert isinstance(command, AddBatchCommand)
+        assert command.params.jobs == 8
+
+        result = CliRunner().invoke(wallabag.cli, ['add'])
+        assert result.exit_code == 2
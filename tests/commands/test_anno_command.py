@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 
-import delorean
-import humanize
-
+from wallabag import wtime
 from wallabag.config import Configs
 from wallabag.api.api import Response
 from wallabag.api.get_entry import GetEntry
@@ -48,8 +46,8 @@ class TestAnno():
         params.entry_id = 1
         result = AnnoCommand(self.config, params).execute()
         assert result[0]
-        past = delorean.utcnow() - delorean.parse('2020-10-28T10:50:51+0000')
-        assert result[1] == f'1. quote ({humanize.naturaltime(past)}) [7]'
+        past = wtime.naturaltime(wtime.parse('2020-10-28T10:50:51+0000'))
+        assert result[1] == f'1. quote ({past}) [7]'
 
     def test_remove_annotation(self, monkeypatch):
 
@@ -96,10 +94,10 @@ class TestAnno():
         params.command = AnnoSubcommand.SHOW
         result = AnnoCommand(self.config, params).execute()
         assert result[0]
-        past = delorean.utcnow() - delorean.parse('2020-10-28T10:50:51+0000')
+        past = wtime.naturaltime(wtime.parse('2020-10-28T10:50:51+0000'))
         assert result[1] == (
-                f'1. quote ({humanize.naturaltime(past)}):\n\n\tcontent\n\n'
-                f'2. another quote ({humanize.naturaltime(past)}):'
+                f'1. quote ({past}):\n\n\tcontent\n\n'
+                f'2. another quote ({past}):'
                 '\n\n\tanother content\n')
 
     def test_show_annotations_by_id(self, monkeypatch):
@@ -134,9 +132,9 @@ class TestAnno():
         params.command = AnnoSubcommand.SHOW
         result = AnnoCommand(self.config, params).execute()
         assert result[0]
-        past = delorean.utcnow() - delorean.parse('2020-10-28T10:50:51+0000')
+        past = wtime.naturaltime(wtime.parse('2020-10-28T10:50:51+0000'))
         assert result[1] == (
-                f'2. another quote ({humanize.naturaltime(past)}):'
+                f'2. another quote ({past}):'
                 '\n\n\tanother content\n')
 
     def test_show_empty_params(self):
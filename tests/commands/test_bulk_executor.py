@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import pytest
+
+from wallabag.api.api import RequestException, Response
+from wallabag.commands.bulk import BulkExecutor
+from wallabag.entry import Entry
+from wallabag import wclick
+
+
+def make_entries(count):
+    return [Entry({
+        "id": i, "title": f"title {i}", "content": "", "url": "url",
+        "is_archived": 0, "is_starred": 0}) for i in range(1, count + 1)]
+
+
+class TestBulkExecutor():
+
+    def test_all_succeeded(self):
+        result = BulkExecutor(4, quiet=True).run(
+                make_entries(10), lambda entry: None, 'Test')
+        assert result.succeeded == list(range(1, 11))
+        assert not result.failed
+        assert result.summary('Done') == 'Done: 10, failed: 0'
+
+    def test_partial_failure(self):
+        def action(entry):
+            if entry.entry_id % 2 == 0:
+                raise RequestException(response=Response(404, None))
+
+        result = BulkExecutor(3, quiet=True).run(
+                make_entries(5), action, 'Test')
+        assert result.succeeded == [1, 3, 5]
+        assert [entry_id for entry_id, _ in result.failed] == [2, 4]
+        assert result.summary('Done') == (
+                'Done: 3, failed: 2\nFailed IDs: 2, 4')
+
+    @pytest.mark.parametrize('values', [
+        (None, 1), (Response(500, None), 3), (Response(503, None), 1),
+        (Response(404, None), 1)])
+    def test_retry(self, values):
+        calls = 0
+
+        def action(entry):
+            nonlocal calls
+            calls += 1
+            if values[0]:
+                raise RequestException(response=values[0])
+            raise RequestException('Connection error')
+
+        result = BulkExecutor(1, quiet=True, backoff=0).run(
+                make_entries(1), action, 'Test')
+        assert calls == values[1]
+        assert result.failed
+
+    @pytest.mark.parametrize('deleting', [True, False])
+    def test_retried_delete_not_found(self, deleting):
+        responses = [Response(500, None), Response(404, None)]
+
+        def action(entry):
+            raise RequestException(response=responses.pop(0))
+
+        result = BulkExecutor(1, quiet=True, backoff=0).run(
+                make_entries(1), action, 'Test', deleting=deleting)
+        assert bool(result.failed) != deleting
+
+    def test_ordered_progress(self, monkeypatch):
+        output = []
+
+        def echo(msg, *args, **kwargs):
+            output.append(msg)
+
+        def action(entry):
+            time.sleep(0.01 * (5 - entry.entry_id))
+
+        monkeypatch.setattr(wclick, 'echo', echo)
+
+        BulkExecutor(5).run(make_entries(5), action, 'Test')
+        assert [line.split('\t')[0] for line in output] == [
+                f'Test: title {i}' for i in range(1, 6)]
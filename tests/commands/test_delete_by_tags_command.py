@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import click
+import pytest
 
 from colorama import Back
 
@@ -9,6 +10,7 @@ from wallabag.api.api import Response
 from wallabag.api.delete_entry import DeleteEntry
 from wallabag.api.get_list_entries import GetListEntries
 from wallabag.commands.delete_by_tags import DeleteByTags, DeleteByTagsParams
+from wallabag.known_urls import KnownUrls
 
 
 class TestDeleteByTags():
@@ -25,6 +27,11 @@ class TestDeleteByTags():
                 secret = 100
                 """)
 
+    @pytest.fixture(autouse=True)
+    def known_urls(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+                KnownUrls, 'get_path', lambda config: tmp_path / 'known')
+
     def test_remove_entries(self, monkeypatch):
         confirm_runned = False
 
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import click
+import pytest
 from colorama import Back
 
 from wallabag.api.api import Response
@@ -8,6 +9,7 @@ from wallabag.api.delete_entry import DeleteEntry
 from wallabag.api.get_entry import GetEntry
 from wallabag.commands.delete import DeleteCommand, DeleteCommandParams
 from wallabag.config import Configs
+from wallabag.known_urls import KnownUrls
 
 
 class TestDeleteCommand():
@@ -24,6 +26,11 @@ class TestDeleteCommand():
                 secret = 100
                 """)
 
+    @pytest.fixture(autouse=True)
+    def known_urls(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+                KnownUrls, 'get_path', lambda config: tmp_path / 'known')
+
     def test_not_confirmed_deletion(self, monkeypatch):
         def click_confirm(message):
             return False
@@ -82,7 +89,12 @@ class TestDeleteCommand():
         monkeypatch.setattr(DeleteEntry, 'request', request_delete)
         monkeypatch.setattr(click, 'confirm', click_confirm)
 
+        known = KnownUrls(KnownUrls.get_path(self.config))
+        known.add('url', 1)
+        known.save()
+
         params = DeleteCommandParams(1)
         result, output = DeleteCommand(self.config, params).execute()
         assert result
         assert output == 'Entry successfully deleted.'
+        assert KnownUrls(KnownUrls.get_path(self.config)).get('url') is None
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import os
 import pytest
 import re
@@ -8,11 +9,15 @@ from pathlib import PurePath, Path
 from click.testing import CliRunner
 from wallabag.config import Configs
 from wallabag.commands.export import (
-        ExportCommand, ExportCommandParams, FormatType)
-from wallabag.api.api import Response
+        ExportCommand, ExportCommandParams, ExportListCommand,
+        ExportListParams, FormatType)
+from wallabag.api.api import RequestException, Response
 from wallabag.api.export_entry import ExportEntry
 from wallabag.api.get_entry import GetEntry
-from wallabag import wallabag
+from wallabag.api.get_list_entries import (
+        GetListEntries, Params as ListEntriesParams)
+from wallabag.mirror import Mirror
+from wallabag import wallabag, wclick
 
 
 def config__is_valid(self):
@@ -37,10 +42,11 @@ class TestExport():
 
     def test_export(self, monkeypatch, tmp_path):
 
-        def export_entry(self):
-            return Response(200, None, b'123', 'application/epub')
+        def export_entry(self, file, progress=None):
+            file.write(b'123')
+            return Response(200, None, None, 'application/epub')
 
-        monkeypatch.setattr(ExportEntry, 'request', export_entry)
+        monkeypatch.setattr(ExportEntry, 'request_to', export_entry)
 
         params = ExportCommandParams(
                     10, FormatType.get(
@@ -50,19 +56,41 @@ class TestExport():
                 self.config, params).execute()
         assert result
         assert msg == f'Exported to: {tmp_path}/file.epub'
+        assert os.listdir(tmp_path) == ['file.epub']
+        assert (tmp_path / 'file.epub').read_bytes() == b'123'
+        umask = os.umask(0o022)
+        os.umask(umask)
+        assert (tmp_path / 'file.epub').stat().st_mode & 0o777 == (
+                0o666 & ~umask)
+
+    def test_export_failed(self, monkeypatch, tmp_path):
+
+        def export_entry(self, file, progress=None):
+            file.write(b'12')
+            raise RequestException('Connection error')
+
+        monkeypatch.setattr(ExportEntry, 'request_to', export_entry)
+
+        params = ExportCommandParams(
+                    10, FormatType.get(
+                        'epub'), PurePath(f'{tmp_path}/file.epub'))
+        result, msg = ExportCommand(self.config, params).execute()
+        assert not result
+        assert msg == 'Error: Connection error'
+        assert os.listdir(tmp_path) == []
 
     def test_empty_output(self, monkeypatch, tmpdir):
 
-        def export_entry(self):
-            return Response(
-                    200, None, b'123', 'application/epub')
+        def export_entry(self, file, progress=None):
+            file.write(b'123')
+            return Response(200, None, None, 'application/epub')
 
         def get_entry(self):
             return Response(
                     200, '{"id": 10, "title": "title", "content": "content",\
                             "url": "url", "is_archived": 0, "is_starred": 1}')
 
-        monkeypatch.setattr(ExportEntry, 'request', export_entry)
+        monkeypatch.setattr(ExportEntry, 'request_to', export_entry)
         monkeypatch.setattr(GetEntry, 'request', get_entry)
 
         result, msg = ExportCommand(
@@ -73,16 +101,16 @@ class TestExport():
 
     def test_non_existed_directory(self, monkeypatch, tmpdir):
 
-        def export_entry(self):
-            return Response(
-                    200, None, b'123', 'application/epub')
+        def export_entry(self, file, progress=None):
+            file.write(b'123')
+            return Response(200, None, None, 'application/epub')
 
         def get_entry(self):
             return Response(
                     200, '{"id": 10, "title": "title", "content": "content",\
                             "url": "url", "is_archived": 0, "is_starred": 1}')
 
-        monkeypatch.setattr(ExportEntry, 'request', export_entry)
+        monkeypatch.setattr(ExportEntry, 'request_to', export_entry)
         monkeypatch.setattr(GetEntry, 'request', get_entry)
 
         tmpdir = tmpdir + '/new_dir/'
@@ -94,12 +122,13 @@ class TestExport():
 
     def test_empty_output_cdisposition(self, monkeypatch):
 
-        def export_entry(self):
+        def export_entry(self, file, progress=None):
+            file.write(b'123')
             return Response(
-                    200, None, b'123', 'application/epub',
+                    200, None, None, 'application/epub',
                     'attachment; filename="file.epub"')
 
-        monkeypatch.setattr(ExportEntry, 'request', export_entry)
+        monkeypatch.setattr(ExportEntry, 'request_to', export_entry)
 
         result, msg = ExportCommand(
                 self.config, ExportCommandParams(
@@ -192,3 +221,99 @@ class TestExport():
                 catch_exceptions=False)
         assert command_runned
         assert result.exit_code == 0
+
+    def test_export_list(self, monkeypatch, tmp_path):
+        exported = []
+        output = []
+
+        def getlist_request(self):
+            assert self.params[ListEntriesParams.TAGS] == 'tag'
+            return Response(200, json.dumps({"_embedded": {"items": [
+                {"id": entry_id, "title": f"title/{entry_id}",
+                 "content": "content", "url": "url", "is_archived": 0,
+                 "is_starred": 0, "updated_at": "2020-11-11T05:02:11+0000"}
+                for entry_id in (1, 2, 3)]}}))
+
+        def export_entry(self, file, progress=None):
+            if self.entry_id == 3:
+                raise RequestException(response=Response(404, None))
+            exported.append(self.entry_id)
+            file.write(b'123')
+            return Response(200, None, None, 'application/epub')
+
+        monkeypatch.setattr(GetListEntries, 'request', getlist_request)
+        monkeypatch.setattr(ExportEntry, 'request_to', export_entry)
+        monkeypatch.setattr(
+                wclick, 'echo', lambda msg, *args, **kwargs: output.append(
+                    msg.split('\t')[0]))
+        (tmp_path / '2. title-2.epub').write_bytes(b'old')
+
+        params = ExportListParams(
+                FormatType.get('epub'), PurePath(tmp_path), tags='tag')
+        result, msg = ExportListCommand(self.config, params).execute()
+        assert not result
+        assert msg == (
+                'Exported: 1, skipped: 1, failed: 1\nFailed IDs: 3')
+        assert exported == [1]
+        assert sorted(os.listdir(tmp_path)) == [
+                '1. title-1.epub', '2. title-2.epub']
+        assert (tmp_path / '2. title-2.epub').read_bytes() == b'old'
+        assert output == [f'Exporting entry: title/{entry_id}'
+                          for entry_id in (1, 2, 3)]
+
+    def test_export_list_cached(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+                Mirror, 'get_path', lambda config: tmp_path / 'mirror')
+        mirror = Mirror.create(self.config)
+        mirror.store_entries([
+            {"id": entry_id, "title": f"T{entry_id}", "url": "url",
+             "content": f"<p>content {entry_id}</p>", "is_archived": 0,
+             "is_starred": 0, "created_at": "2020-11-11T05:02:11+0000",
+             "updated_at": "2020-11-11T05:02:11.250+00:00"}
+            for entry_id in (1, 2)])
+        mirror.close()
+        output = tmp_path / 'out'
+        output.mkdir()
+        (output / '2. T2.html').write_text('old')
+
+        params = ExportListParams(
+                FormatType.get('html'), PurePath(output), quantity=10)
+        params.cached = True
+        params.quiet = True
+        result, msg = ExportListCommand(self.config, params).execute()
+        assert result, msg
+        assert msg.startswith('Exported: 1, skipped: 1')
+        assert 'content 1' in (output / '1. T1.html').read_text()
+        assert (output / '2. T2.html').read_text() == 'old'
+
+    def test_export_list_output_file(self, tmp_path):
+        params = ExportListParams(
+                FormatType.get('epub'), PurePath(f'{tmp_path}/file.epub'))
+        result, msg = ExportListCommand(self.config, params).execute()
+        assert not result
+        assert msg == 'Output should be a directory'
+
+    def test_command_export_list(self, monkeypatch):
+        command = None
+
+        def run_command(cmd, quiet=False):
+            nonlocal command
+            command = cmd
+
+        monkeypatch.setattr(wallabag, 'run_command', run_command)
+        monkeypatch.setattr(Configs, 'is_valid', config__is_valid)
+
+        result = self.runner.invoke(
+                wallabag.cli,
+                ['export', '-f', 'epub', '-g', 'tag', '-s', '-j', '8'],
+                catch_exceptions=False)
+        assert result.exit_code == 0
+        assert isinstance(command, ExportListCommand)
+        assert command.params.tags == 'tag'
+        assert command.params.filter_starred
+        assert command.params.jobs == 8
+
+        result = self.runner.invoke(wallabag.cli, ['export'])
+        assert result.exit_code == 2
+        result = self.runner.invoke(wallabag.cli, ['export', '1', '--all'])
+        assert result.exit_code == 2
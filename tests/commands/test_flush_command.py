@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from wallabag.api.add_entry import AddEntry
+from wallabag.api.add_tag_to_entry import AddTagToEntry, Params as TagParams
+from wallabag.api.api import (
+        Api, ConnectionException, RequestException, Response)
+from wallabag.api.delete_entry import DeleteEntry
+from wallabag.api.delete_tags_by_label import DeleteTagsByLabel
+from wallabag.api.entry_exists import EntryExists
+from wallabag.api.get_entry import GetEntry
+from wallabag.api.update_entry import UpdateEntry, Params as UpdateParams
+from wallabag.commands.add import AddCommand, AddCommandParams
+from wallabag.commands.delete import DeleteCommand, DeleteCommandParams
+from wallabag.commands.flush import FlushCommand, FlushCommandParams
+from wallabag.commands.subcommands import TagsSubcommand
+from wallabag.commands.tags import TagsCommand, TagsCommandParams
+from wallabag.commands.update import UpdateCommand, UpdateCommandParams
+from wallabag.config import Configs
+from wallabag.journal import Journal
+from wallabag.known_urls import KnownUrls
+from wallabag.mirror import Mirror
+from wallabag.wallabag import cli
+
+
+def make_item(entry_id, updated_at="2020-11-04T11:37:45+0000", **kwargs):
+    item = {
+        "id": entry_id, "title": f"title {entry_id}", "content": "content",
+        "url": "url", "is_archived": 0, "is_starred": 0, "tags": [],
+        "created_at": "2020-11-04T11:37:45+0000", "updated_at": updated_at}
+    item.update(kwargs)
+    return item
+
+
+def offline(self):
+    raise ConnectionException()
+
+
+class TestFlush():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string("""
+                [api]
+                serverurl = url
+                username = user
+                password = pass
+                [oauth2]
+                client = 100
+                secret = 100
+                """)
+
+    @pytest.fixture(autouse=True)
+    def paths(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+                Journal, 'get_path', lambda config: tmp_path / 'journal')
+        monkeypatch.setattr(
+                Mirror, 'get_path', lambda config: tmp_path / 'mirror')
+        monkeypatch.setattr(
+                KnownUrls, 'get_path', lambda config: tmp_path / 'known')
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        """
+        Entries on the server by ID, the requests made are recorded.
+        """
+        entries = {}
+        self.requests = []
+
+        def changed(entry_id):
+            # the server stamps every change
+            entries[entry_id]['updated_at'] = (
+                    f'2020-12-01T00:00:{len(self.requests):02d}+0000')
+            return Response(200, json.dumps(entries[entry_id]))
+
+        def get_entry(api):
+            if int(api.entry_id) not in entries:
+                raise RequestException(response=Response(404, None))
+            return Response(200, json.dumps(entries[int(api.entry_id)]))
+
+        def update_entry(api):
+            self.requests.append(('update', api.entry_id, api.params))
+            if api.params[UpdateParams.STAR] is not None:
+                entries[api.entry_id]['is_starred'] = int(
+                        api.params[UpdateParams.STAR])
+            return changed(api.entry_id)
+
+        def add_tags(api):
+            self.requests.append((
+                'tags', api.params[TagParams.ENTRY_ID],
+                api.params[TagParams.TAGS]))
+            return changed(api.params[TagParams.ENTRY_ID])
+
+        def delete_entry(api):
+            self.requests.append(('delete', api.entry_id))
+            return Response(200, json.dumps(entries[api.entry_id]))
+
+        monkeypatch.setattr(GetEntry, 'request', get_entry)
+        monkeypatch.setattr(UpdateEntry, 'request', update_entry)
+        monkeypatch.setattr(AddTagToEntry, 'request', add_tags)
+        monkeypatch.setattr(DeleteEntry, 'request', delete_entry)
+        return entries
+
+    def journal(self):
+        return Journal(Journal.get_path(self.config))
+
+    def test_update_queued(self, monkeypatch):
+        monkeypatch.setattr(GetEntry, 'request', offline)
+        params = UpdateCommandParams()
+        params.toggle_read = True
+        result, output = UpdateCommand(self.config, '1', params).execute()
+        assert result
+        assert output.startswith('The server is unreachable, queued: update')
+
+        records = self.journal().read()[0]
+        assert len(records) == 1
+        assert records[0]['entry_id'] == 1
+        assert records[0]['toggle_read']
+        assert records[0]['updated_at'] is None
+
+    def test_base_version_from_mirror(self, monkeypatch):
+        mirror = Mirror.create(self.config)
+        mirror.store_entries([make_item(1, updated_at='mirrored')])
+        mirror.close()
+        monkeypatch.setattr(AddTagToEntry, 'request', offline)
+        params = TagsCommandParams(entry_id=1, tags='a,b')
+        params.configure(TagsSubcommand.ADD)
+        assert TagsCommand(self.config, params).execute()[0]
+        record = self.journal().read()[0][0]
+        assert (record['op'], record['tags']) == (Journal.ADD_TAGS, 'a,b')
+        assert record['updated_at'] == 'mirrored'
+
+    def test_add_queued(self, monkeypatch):
+        monkeypatch.setattr(EntryExists, 'request', offline)
+        params = AddCommandParams('http://url', tags='a')
+        assert AddCommand(self.config, params).execute()[0]
+        record = self.journal().read()[0][0]
+        assert (record['url'], record['tags']) == ('http://url', 'a')
+
+    def test_delete_confirmed_offline(self, monkeypatch):
+        messages = []
+
+        def confirm(message):
+            messages.append(message)
+            return True
+
+        monkeypatch.setattr(GetEntry, 'request', offline)
+        monkeypatch.setattr(click, 'confirm', confirm)
+        result = DeleteCommand(self.config, DeleteCommandParams(3)).execute()
+        assert result[0]
+        assert '\tID: 3\n' in messages[0]
+        assert self.journal().read()[0][0]['op'] == Journal.DELETE
+
+    def test_journal_disabled(self, monkeypatch):
+        self.config.config.read_string("""
+                [sync]
+                journal = no
+                """)
+        monkeypatch.setattr(GetEntry, 'request', offline)
+        params = UpdateCommandParams()
+        params.toggle_star = True
+        result, output = UpdateCommand(self.config, 1, params).execute()
+        assert not result
+        assert output == 'Error: Connection error'
+
+    def test_nothing_queued(self):
+        assert FlushCommand(self.config).execute() == (
+                True, 'No queued changes.')
+
+    def test_replay(self, server):
+        server[1] = make_item(1, is_archived=1)
+        server[2] = make_item(2)
+        journal = self.journal()
+        journal.append(Journal.UPDATE, entry_id=1, toggle_read=True)
+        journal.append(Journal.UPDATE, entry_id=1, toggle_star=True)
+        journal.append(Journal.UPDATE, entry_id=1, toggle_read=True)
+        journal.append(Journal.UPDATE, entry_id=2, toggle_read=True)
+        journal.append(Journal.ADD_TAGS, entry_id=2, tags='a')
+        journal.append(Journal.UPDATE, entry_id=2, toggle_read=True)
+        journal.append(Journal.ADD_TAGS, entry_id=2, tags='b,a')
+        journal.append(Journal.DELETE, entry_id=3)
+
+        result, output = FlushCommand(
+                self.config, FlushCommandParams(quiet=True)).execute()
+        assert not result
+        assert output.startswith(
+                'Replayed: 2, cancelled out: 0, conflicts: 0, '
+                'still queued: 0, failed: 1')
+        assert sorted(self.requests, key=str) == sorted([
+            ('update', 1, {UpdateParams.TITLE: None, UpdateParams.STAR: True,
+                           UpdateParams.READ: None}),
+            ('tags', 2, 'a,b')], key=str)
+        assert not journal.pending()
+
+    def test_cancelled_out(self, server):
+        journal = self.journal()
+        journal.append(Journal.UPDATE, entry_id=1, toggle_star=True)
+        journal.append(Journal.UPDATE, entry_id=1, toggle_star=True)
+        result, output = FlushCommand(self.config).execute()
+        assert result
+        assert 'cancelled out: 1' in output
+        assert not self.requests
+        assert not journal.pending()
+
+    def test_conflict(self, server, capsys):
+        server[1] = make_item(1, updated_at='2020-11-05T10:00:00+0000')
+        journal = self.journal()
+        journal.append(Journal.UPDATE, entry_id=1, starred=True,
+                       updated_at='2020-11-04T11:37:45+0000')
+
+        result, output = FlushCommand(self.config).execute()
+        assert not result
+        assert 'conflicts: 1' in output
+        assert capsys.readouterr().out.startswith(
+                'conflict\tupdate entry 1: starred\t')
+        assert not self.requests
+        assert len(journal.read()[0]) == 1
+
+        params = FlushCommandParams(force=True)
+        assert FlushCommand(self.config, params).execute()[0]
+        assert len(self.requests) == 1
+        assert not journal.pending()
+
+    def test_conflict_skipped(self, server, capsys):
+        server[1] = make_item(1, updated_at='2020-11-05T10:00:00+0000')
+        server[2] = make_item(2)
+        journal = self.journal()
+        journal.append(Journal.UPDATE, entry_id=1, starred=True,
+                       updated_at='2020-11-04T11:37:45+0000')
+        FlushCommand(self.config).execute()
+        assert journal.read()[0][0]['conflict']
+        journal.append(Journal.ADD_TAGS, entry_id=1, tags='a')
+        journal.append(Journal.ADD_TAGS, entry_id=2, tags='b')
+        capsys.readouterr()
+
+        params = FlushCommandParams(quiet=True, skip_conflicts=True)
+        result, output = FlushCommand(self.config, params).execute()
+        assert 'Replayed: 1, cancelled out: 0, conflicts: 1' in output
+        assert capsys.readouterr().out == ''
+        assert self.requests == [('tags', 2, 'b')]
+        assert [r['op'] for r in journal.read()[0]] == [
+            Journal.UPDATE, Journal.ADD_TAGS]
+
+    def test_changed_after_queued(self, server):
+        server[1] = make_item(1, updated_at='2999-01-01T00:00:00+0000')
+        self.journal().append(Journal.DELETE, entry_id=1)
+        result, output = FlushCommand(self.config).execute()
+        assert 'conflicts: 1' in output
+
+    def test_partly_replayed(self, monkeypatch, server):
+        server[1] = make_item(1)
+        journal = self.journal()
+        journal.append(Journal.UPDATE, entry_id=1, toggle_star=True)
+        journal.append(Journal.ADD_TAGS, entry_id=1, tags='a')
+        add_tags = AddTagToEntry.request
+        monkeypatch.setattr(AddTagToEntry, 'request', offline)
+
+        result, output = FlushCommand(
+                self.config, FlushCommandParams(quiet=True)).execute()
+        assert 'still queued: 1' in output
+        records = journal.read()[0]
+        assert [(r['op'], r['tags']) for r in records] == [
+            (Journal.ADD_TAGS, 'a')]
+        assert records[0]['updated_at'] == server[1]['updated_at']
+
+        monkeypatch.setattr(AddTagToEntry, 'request', add_tags)
+        params = FlushCommandParams(force=True, quiet=True)
+        assert FlushCommand(self.config, params).execute()[0]
+        assert [request[0] for request in self.requests] == ['update', 'tags']
+        assert server[1]['is_starred'] == 1
+        assert not journal.pending()
+
+    def test_tag_deletion_in_order(self, monkeypatch, server):
+        server[1] = make_item(1)
+        server[2] = make_item(2)
+
+        def delete_tags(api):
+            self.requests.append(('delete', api.tags))
+            return Response(200, '[]')
+
+        monkeypatch.setattr(DeleteTagsByLabel, 'request', delete_tags)
+        journal = self.journal()
+        journal.append(Journal.ADD_TAGS, entry_id=1, tags='old')
+        journal.append(Journal.ADD_TAGS, entry_id=2, tags='b')
+        journal.append(Journal.DELETE_TAGS, labels=['old'])
+        journal.append(Journal.ADD_TAGS, entry_id=1, tags='new')
+        journal.append(Journal.DELETE_TAGS, labels=['b'])
+
+        result, output = FlushCommand(
+                self.config, FlushCommandParams(jobs=4, quiet=True)).execute()
+        assert result, output
+        assert self.requests[2:] == [
+            ('delete', 'old'), ('tags', 1, 'new'), ('delete', 'b')]
+        assert sorted(self.requests[:2]) == [('tags', 1, 'old'),
+                                             ('tags', 2, 'b')]
+
+    def test_still_offline(self, monkeypatch):
+        monkeypatch.setattr(EntryExists, 'request', offline)
+        journal = self.journal()
+        journal.append(Journal.ADD, url='http://url', tags='a')
+        result, output = FlushCommand(
+                self.config, FlushCommandParams(jobs=1)).execute()
+        assert not result
+        assert 'still queued: 1' in output
+        assert len(journal.read()[0]) == 1
+
+    def test_add_replayed(self, monkeypatch):
+        added = []
+
+        def add(api):
+            added.append((api.url, api.params))
+            return Response(200, json.dumps(make_item(5)))
+
+        monkeypatch.setattr(EntryExists, 'request', lambda self: Response(
+                200, '{"exists": false}'))
+        monkeypatch.setattr(AddEntry, 'request', add)
+        journal = self.journal()
+        journal.append(Journal.ADD, url='http://url', tags='a')
+        journal.append(Journal.ADD, url='http://url', tags='b')
+        assert FlushCommand(self.config).execute()[0]
+        assert len(added) == 1
+        assert '"a,b"' in json.dumps(
+                {k.value: v for k, v in added[0][1].items()})
+        assert KnownUrls(KnownUrls.get_path(self.config)).get(
+                'http://url') == 5
+
+    def test_flushed_when_online(self, monkeypatch, server, tmp_path):
+        path = tmp_path / 'config.ini'
+        path.write_text("""
+[api]
+serverurl = url
+username = user
+password = pass
+[oauth2]
+client = 100
+secret = 100
+""")
+        server[1] = make_item(1)
+        get_entry = GetEntry.request
+
+        def request(api):
+            Api.received += 1
+            return get_entry(api)
+
+        monkeypatch.setattr(GetEntry, 'request', request)
+        self.journal().append(Journal.UPDATE, entry_id=1, starred=True)
+
+        result = CliRunner().invoke(
+                cli, ['--no-spinner', '--config', str(path), 'info', '1'])
+        assert result.exit_code == 0, result.output
+        assert 'Replayed: 1' in result.output
+        assert not self.journal().pending()
+
+    def test_conflicts_not_flushed(self, monkeypatch, server, tmp_path):
+        path = tmp_path / 'config.ini'
+        path.write_text("""
+[api]
+serverurl = url
+username = user
+password = pass
+[oauth2]
+client = 100
+secret = 100
+""")
+        server[1] = make_item(1)
+        get_entry = GetEntry.request
+
+        def request(api):
+            Api.received += 1
+            return get_entry(api)
+
+        monkeypatch.setattr(GetEntry, 'request', request)
+        self.journal().append(
+                Journal.UPDATE, entry_id=1, starred=True, conflict=True)
+
+        result = CliRunner().invoke(
+                cli, ['--no-spinner', '--config', str(path), 'info', '1'])
+        assert result.exit_code == 0, result.output
+        assert 'queued while offline' not in result.output
+        assert not self.requests
+        assert self.journal().pending()
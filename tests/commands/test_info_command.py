@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import time
+
+import pytest
 from colorama import Fore
 
 from wallabag.commands.info import InfoCommand, InfoCommandParams
@@ -8,6 +11,15 @@ from wallabag.api.api import Response
 from wallabag.api.get_entry import GetEntry
 
 
+@pytest.fixture(autouse=True)
+def utc(monkeypatch):
+    monkeypatch.setenv('TZ', 'UTC')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
 class TestInfoCommand():
 
     def setup_method(self, method):
@@ -57,7 +69,7 @@ class TestInfoCommand():
                 f'{self.f_c}Is read{self.f_rst}: False\n'
                 f'{self.f_c}Is starred{self.f_rst}: True\n'
                 f'{self.f_c}Created at{self.f_rst}: '
-                'Apr 11, 2020, 11:37:45 AM\n'
+                'Nov 4, 2020, 11:37:45 AM\n'
                 f'{self.f_c}Published by{self.f_rst}: Publisher Name\n'
                 f'{self.f_c}Reading time{self.f_rst}: 9 min\n'
                 f'{self.f_c}Preview picture{self.f_rst}: '
@@ -105,7 +117,7 @@ class TestInfoCommand():
                 f'{self.f_c}Is read{self.f_rst}: False\n'
                 f'{self.f_c}Is starred{self.f_rst}: True\n'
                 f'{self.f_c}Created at{self.f_rst}: '
-                'Apr 11, 2020, 11:37:45 AM\n'
+                'Nov 4, 2020, 11:37:45 AM\n'
                 f'{self.f_c}Reading time{self.f_rst}: 9 min\n')
 
     def test_no_id(self):
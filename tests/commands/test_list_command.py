@@ -124,29 +124,36 @@ class TestListCommand():
 
     def test_list_count(self, monkeypatch):
 
-        def list_entries(self):
+        def _make_request(self, request):
+            assert request.api_params[
+                    GetListEntries.ApiParams.PER_PAGE.value] == 1
             text = '''
-            { "_embedded": { "items": [
+            { "page": 1, "limit": 1, "pages": 42, "total": 42,
+            "_embedded": { "items": [
                 { "id": 1, "title": "title", "content": "content",
-                "url": "url", "is_archived": 0, "is_starred": 1},
-                { "id": 2, "title": "title", "content": "content",
                 "url": "url", "is_archived": 0, "is_starred": 1}
             ] } }
             '''
             return Response(200, text)
 
-        monkeypatch.setattr(GetListEntries, 'request', list_entries)
+        monkeypatch.setattr(GetListEntries, '_make_request', _make_request)
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
 
         command = CountCommand(self.config)
         result, entries = command.execute()
         assert result
-        assert entries == 2
+        assert entries == 42
 
     def test_list_count_untagged(self, monkeypatch):
+        requested_pages = []
 
-        def list_entries(self):
+        def _make_request(self, request):
+            page = request.api_params[GetListEntries.ApiParams.PAGE.value]
+            requested_pages.append(page)
             text = '''
-            { "_embedded": { "items": [
+            { "page": %s, "limit": 2, "pages": 2, "total": 4,
+            "_embedded": { "items": [
                 { "id": 1, "title": "title", "content": "content",
                 "url": "url", "is_archived": 0, "is_starred": 1},
                 { "id": 2, "title": "title", "content": "content",
@@ -155,15 +162,44 @@ class TestListCommand():
                         {"id":7,"label":"tag","slug":"tag"},
                         {"id":13,"label":"tag2","slug":"tag2"}]}
                 ]}}
-            '''
+            ''' % page
             return Response(200, text)
 
-        monkeypatch.setattr(GetListEntries, 'request', list_entries)
+        monkeypatch.setattr(GetListEntries, '_make_request', _make_request)
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
 
         command = CountCommand(self.config, ListParams(untagged=True))
         result, entries = command.execute()
         assert result
-        assert entries == 1
+        assert entries == 2
+        assert requested_pages == [1, 2]
+
+    def test_list_quantity_over_pages(self, monkeypatch):
+        requested = []
+
+        def _make_request(self, request):
+            page = request.api_params[GetListEntries.ApiParams.PAGE.value]
+            requested.append(page)
+            items = ",".join(
+                '{"id": %d, "title": "title", "content": "content",'
+                '"url": "url", "is_archived": 0, "is_starred": 1}' % i
+                for i in range(page * 100 - 99, page * 100 + 1))
+            text = (
+                '{"page": %d, "pages": 5, "total": 500, '
+                '"_embedded": {"items": [%s]}}' % (page, items))
+            return Response(200, text)
+
+        monkeypatch.setattr(GetListEntries, '_make_request', _make_request)
+        monkeypatch.setattr(
+                Api, '_get_authorization_header', get_authorization_header)
+
+        command = ListCommand(self.config, ListParams(quantity=150))
+        result, entries = command.execute()
+        assert result
+        assert len(entries.split('\n')) == 152
+        assert requested[:2] == [1, 2]
+        assert 5 not in requested
 
     @pytest.mark.parametrize('tags', tags_test)
     def test_tags_param(self, monkeypatch, tags):
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from colorama import Fore
+
+from wallabag.commands.search import SearchCommand, SearchCommandParams
+from wallabag.config import Configs
+from wallabag.mirror import Mirror
+
+
+class TestSearchCommand():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+
+    @pytest.fixture(autouse=True)
+    def mirror(self, monkeypatch, tmp_path):
+        path = tmp_path / "mirror.sqlite"
+        monkeypatch.setattr(Mirror, 'get_path', lambda config: path)
+        mirror = Mirror.create(self.config)
+        mirror.store_entries([
+            {"id": 1, "title": "First", "url": "url", "content": "<p>a b</p>",
+             "is_archived": 0, "is_starred": 0},
+            {"id": 2, "title": "Second", "url": "url", "is_archived": 1,
+             "is_starred": 1, "content": "<p>needle in a haystack</p>"}])
+        mirror.close()
+
+    def test_search(self):
+        result, output = SearchCommand(
+                self.config, SearchCommandParams('needle', 10)).execute()
+        assert result
+        lines = output.split('\n')
+        assert len(lines) == 4
+        assert lines[1].startswith('2') and lines[1].endswith('Second')
+        assert lines[2].strip() == (
+                f'{Fore.YELLOW}needle{Fore.RESET} in a haystack')
+
+    def test_nothing_found(self):
+        result, output = SearchCommand(
+                self.config, SearchCommandParams('nothing', 10)).execute()
+        assert result
+        assert not output
+
+    @pytest.mark.parametrize('query', [None, '', '  '])
+    def test_empty_query(self, query):
+        result, output = SearchCommand(
+                self.config, SearchCommandParams(query)).execute()
+        assert not result
+        assert output == 'Search query is empty'
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import json
+import os
+
 import pytest
 
 from colorama import Fore, Back
@@ -10,7 +13,9 @@ from wallabag.api.get_entry import GetEntry
 from wallabag.commands.show import (
         ShowCommand, ShowCommandParams, Alignment)
 from wallabag.config import Configs
+from wallabag.export.export_cli import ExportCli
 from wallabag.format_type import ScreenType
+from wallabag.render_cache import RenderCache
 from wallabag import wallabag
 
 
@@ -220,6 +225,101 @@ class TestShowCommand():
                 f'{Fore.BLUE}he{Back.CYAN}ader text'
                 f'{Fore.RESET}\ncontent\n\nend {Back.RESET} [1]anno')
 
+    def test_entry_html_content_with_two_annotations(self, monkeypatch):
+        def request(self):
+            return Response(
+                200, ('{"id": 1, "title": "title", "content":'
+                      '"<p>first second third</p>",'
+                      '"url": "url", "is_archived": 0, "is_starred": 1,'
+                      '"annotations":[{'
+                      '"id": 1, "text": "content", "quote": "quote",'
+                      '"ranges": [{"start": "/p", "startOffset": "0",'
+                      '"end": "/p", "endOffset": "5"}]}, {'
+                      '"id": 2, "text": "content", "quote": "quote",'
+                      '"ranges": [{"start": "/p", "startOffset": "13",'
+                      '"end": "/p", "endOffset": "18"}]}]}'))
+
+        monkeypatch.setattr(GetEntry, 'request', request)
+
+        params = ShowCommandParams(1, colors=False)
+        params.width = '100%'
+        result, output = ShowCommand(self.config, params).execute()
+        assert result
+        assert output == (
+                f'title\n{"="*ShowCommand.FAILWIDTH}\n\n\n'
+                f'{Back.CYAN}first{Back.RESET} [1] second '
+                f'{Back.CYAN}third{Back.RESET} [2]')
+
+    @pytest.mark.parametrize('values', [
+        ('<p>one <b>two</b> three</p>', '/p', '5', '/p', '11',
+         f'one t{Back.CYAN}wo thr{Back.RESET} [1]ee'),
+        ('<p>one two<script>x()</script></p>', '/p', '0', '/p/script', '1',
+         f'{Back.CYAN}one two{Back.RESET}')])
+    def test_entry_html_annotation_in_child(self, monkeypatch, values):
+        def request(self):
+            return Response(200, json.dumps({
+                "id": 1, "title": "title", "content": values[0],
+                "url": "url", "is_archived": 0, "is_starred": 1,
+                "annotations": [{
+                    "id": 1, "text": "content", "quote": "quote",
+                    "ranges": [{
+                        "start": values[1], "startOffset": values[2],
+                        "end": values[3], "endOffset": values[4]}]}]}))
+
+        monkeypatch.setattr(GetEntry, 'request', request)
+
+        params = ShowCommandParams(1, colors=False)
+        params.width = '100%'
+        result, output = ShowCommand(self.config, params).execute()
+        assert result
+        assert output == (
+                f'title\n{"="*ShowCommand.FAILWIDTH}\n\n\n{values[5]}')
+
+    def test_entry_html_nested_markup(self, monkeypatch):
+        def request(self):
+            return Response(
+                200, ('{"id": 1, "title": "title", "content":'
+                      '"<h2>a <i>b</i></h2><p><strong>bold</strong> text'
+                      '<script>skip()</script></p><hr/>end",'
+                      '"url": "url", "is_archived": 0, "is_starred": 1}'))
+
+        monkeypatch.setattr(GetEntry, 'request', request)
+
+        params = ShowCommandParams(1, colors=True, raw=True)
+        result, output = ShowCommand(self.config, params).execute()
+        width = int(ShowCommand.FAILWIDTH * 80 / 100)
+        assert result
+        assert output == (
+                f'title\n{"="*width}\n\n\n'
+                f'{Fore.BLUE}a b{Fore.RESET}\n\n'
+                f'{Fore.RED}bold{Fore.RESET} text\n\n{"-"*width}end')
+
+    def test_rendered_output_cached(self, monkeypatch, tmp_path):
+        rendered = 0
+
+        def request(self):
+            return Response(
+                    200, '{"id": 1, "title": "title", "content": "content",\
+                            "updated_at": "2020-11-01T11:37:45+0000",\
+                            "url": "url", "is_archived": 0, "is_starred": 1}')
+
+        def run(self):
+            nonlocal rendered
+            rendered += 1
+            return 'title\ncontent'
+
+        monkeypatch.setattr(GetEntry, 'request', request)
+        monkeypatch.setattr(ExportCli, 'run', run)
+        monkeypatch.setattr(RenderCache, 'get_path', lambda config: tmp_path)
+
+        for width in ('100%', '100%', '50%'):
+            params = ShowCommandParams(1)
+            params.width = width
+            result, output = ShowCommand(self.config, params).execute()
+            assert result
+        assert rendered == 2
+        assert len(os.listdir(tmp_path)) == 2
+
     @pytest.mark.parametrize('values', [
         ('50%', " "*25, "="*int(ShowCommand.FAILWIDTH/2)),
         ('200', "", "="*ShowCommand.FAILWIDTH),
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+from wallabag.api.api import ConnectionException, Response
+from wallabag.api.get_list_entries import GetListEntries, Params
+from wallabag.api.get_tags import GetTags
+from wallabag.commands.info import InfoCommand, InfoCommandParams
+from wallabag.commands.list import ListCommand, CountCommand, ListParams
+from wallabag.commands.sync import SyncCommand, SyncCommandParams
+from wallabag.config import Configs
+from wallabag.known_urls import KnownUrls
+from wallabag.mirror import Mirror
+
+
+def make_item(entry_id, title="title"):
+    return {
+        "id": entry_id, "title": f"{title} {entry_id}", "content": "content",
+        "url": "url", "is_archived": 0, "is_starred": 1,
+        "created_at": "2020-11-04T11:37:45+0000",
+        "updated_at": "2020-11-04T11:37:45+0000",
+        "tags": [{"id": 7, "label": "tag", "slug": "tag"}]}
+
+
+class TestSyncCommand():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string("""
+                [api]
+                serverurl = url
+                username = user
+                password = pass
+                [oauth2]
+                client = 100
+                secret = 100
+                """)
+
+    def prepare(self, monkeypatch, tmp_path, pages):
+        api_requests = self.requests = []
+        path = tmp_path / "mirror.sqlite"
+
+        def list_request(self):
+            page = self.params[Params.PAGE]
+            api_requests.append(dict(self.params))
+            return Response(200, json.dumps({
+                "page": page, "pages": len(pages),
+                "_embedded": {"items": pages[page - 1]}}))
+
+        def tags_request(self):
+            return Response(
+                    200, '[{"id": 7, "label": "tag", "slug": "tag"}]')
+
+        monkeypatch.setattr(GetListEntries, 'request', list_request)
+        monkeypatch.setattr(GetTags, 'request', tags_request)
+        monkeypatch.setattr(Mirror, 'get_path', lambda config: path)
+        monkeypatch.setattr(
+                KnownUrls, 'get_path', lambda config: tmp_path / 'known')
+
+    def test_sync(self, monkeypatch, tmp_path):
+        self.prepare(monkeypatch, tmp_path, [
+            [make_item(1), make_item(2)], [make_item(3)]])
+
+        result, output = SyncCommand(self.config).execute()
+        assert result
+        assert output == 'Synchronized entries: 3'
+        assert self.requests[0][Params.SINCE] is None
+        assert self.requests[0][Params.FULL_DETAIL]
+        assert Mirror.create(self.config).count() == 3
+
+    def test_incremental_sync(self, monkeypatch, tmp_path):
+        self.prepare(monkeypatch, tmp_path, [[make_item(1)]])
+        SyncCommand(self.config).execute()
+        last_sync = Mirror.create(self.config).get_last_sync()
+
+        self.prepare(monkeypatch, tmp_path, [[make_item(1, "new")]])
+        result, output = SyncCommand(self.config).execute()
+        assert result
+        assert self.requests[0][Params.SINCE] == last_sync
+        assert Mirror.create(self.config).get_entry(1).title == "new 1"
+
+        result, output = SyncCommand(
+                self.config, SyncCommandParams(full=True)).execute()
+        assert self.requests[1][Params.SINCE] is None
+
+    def test_full_sync_forgets_deleted(self, monkeypatch, tmp_path):
+        self.prepare(monkeypatch, tmp_path, [[make_item(1)]])
+        known = KnownUrls.create(self.config)
+        known.add('http://one', 1)
+        known.add('http://two', 2)
+        known.save()
+
+        SyncCommand(self.config).execute()
+        assert KnownUrls.create(self.config).get('http://two') == 2
+
+        SyncCommand(self.config, SyncCommandParams(full=True)).execute()
+        known = KnownUrls.create(self.config)
+        assert known.get('http://one') == 1
+        assert known.get('http://two') is None
+
+    def test_failed_full_sync(self, monkeypatch, tmp_path):
+        self.prepare(monkeypatch, tmp_path, [[make_item(1), make_item(2)]])
+        SyncCommand(self.config).execute()
+
+        def offline(self):
+            raise ConnectionException()
+
+        monkeypatch.setattr(GetTags, 'request', offline)
+        result, output = SyncCommand(
+                self.config, SyncCommandParams(full=True)).execute()
+        assert not result
+        assert Mirror.create(self.config).count() == 2
+        assert sorted(os.listdir(tmp_path)) == ['mirror.sqlite']
+
+    def test_cached_commands(self, monkeypatch, tmp_path):
+        self.prepare(monkeypatch, tmp_path, [[make_item(1), make_item(2)]])
+        SyncCommand(self.config).execute()
+
+        def fail(self):
+            raise AssertionError("network request in cached mode")
+
+        monkeypatch.setattr(GetListEntries, 'request', fail)
+
+        params = ListParams(quantity=10, tags='tag')
+        params.cached = True
+        result, output = ListCommand(self.config, params).execute()
+        assert result
+        assert len(output.split('\n')) == 4
+
+        result, output = CountCommand(self.config, params).execute()
+        assert output == 2
+
+        params = InfoCommandParams(2)
+        params.cached = True
+        result, output = InfoCommand(self.config, params).execute()
+        assert result
+        assert 'title 2' in output
+
+        params = InfoCommandParams(5)
+        params.cached = True
+        result, output = InfoCommand(self.config, params).execute()
+        assert not result
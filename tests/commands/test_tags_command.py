@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import json
+
 import pytest
 import click
 
@@ -14,15 +16,23 @@ from wallabag.api.delete_tag_by_id import DeleteTagsById
 from wallabag.api.delete_tags_by_label import DeleteTagsByLabel
 from wallabag.api.delete_tag_from_entry import DeleteTagFromEntry
 from wallabag.api.get_entry import GetEntry
-from wallabag.api.get_list_entries import GetListEntries
+from wallabag.api.get_list_entries import (
+        GetListEntries, Params as ListParams)
 from wallabag.api.get_tags import GetTags
 from wallabag.api.get_tags_for_entry import GetTagsForEntry
 from wallabag.commands.tags import (
         TagsCommand, TagsCommandParams, TagsSubcommand)
+from wallabag.mirror import Mirror
 
 
 class TestTags():
 
+    @pytest.fixture(autouse=True)
+    def mirror_path(self, monkeypatch, tmp_path):
+        path = tmp_path / 'mirror.sqlite'
+        monkeypatch.setattr(Mirror, 'get_path', lambda config: path)
+        return path
+
     def setup_method(self, method):
         self.config = Configs("/tmp/config")
         self.config.config.read_string("""
@@ -256,3 +266,108 @@ class TestTags():
         result = TagsCommand(self.config, params).execute()
         assert confirm_runned
         assert result[0]
+
+
+class TestTagIndex():
+
+    ENTRY = ('{"id": 1, "title": "title", "content": "content", '
+             '"url": "url", "is_archived": 0, "is_starred": 0, '
+             '"tags": [{"id": 7, "label": "tag", "slug": "tag"}, '
+             '{"id": 13, "label": "tag2", "slug": "tag2"}], '
+             '"created_at": "2020-11-04T11:37:45+0000"}')
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string("""
+                [api]
+                serverurl = url
+                username = user
+                password = pass
+                [oauth2]
+                client = 100
+                secret = 100
+                """)
+
+    @pytest.fixture
+    def mirror(self, monkeypatch, tmp_path):
+        path = tmp_path / 'mirror.sqlite'
+        monkeypatch.setattr(Mirror, 'get_path', lambda config: path)
+        mirror = Mirror.create(self.config)
+        mirror.store_entries([
+            {"id": 1, "title": "title", "content": "content",
+             "created_at": "2020-11-04T11:37:45+0000",
+             "tags": [{"id": 7, "label": "tag", "slug": "tag"}]},
+            {"id": 2, "title": "title 2", "content": "content",
+             "created_at": "2020-11-05T11:37:45+0000",
+             "tags": [{"id": 7, "label": "tag", "slug": "tag"},
+                      {"id": 13, "label": "tag2", "slug": "tag2"}]}])
+        mirror.set_last_sync(1000)
+        yield mirror
+        mirror.close()
+
+    def test_list_with_counts(self, monkeypatch, mirror):
+        def request(self):
+            raise AssertionError('requested in cached mode')
+
+        monkeypatch.setattr(GetTags, 'request', request)
+        params = TagsCommandParams()
+        params.cached = True
+        result = TagsCommand(self.config, params).execute()
+        assert result == (True, '7. tag (2)\n13. tag2 (1)')
+
+    def test_list_entry_tags_cached(self, mirror):
+        params = TagsCommandParams(entry_id=2)
+        params.cached = True
+        result = TagsCommand(self.config, params).execute()
+        assert result == (True, '7. tag\n13. tag2')
+
+    def test_list_entry_tags_not_synced(self, monkeypatch, mirror):
+        monkeypatch.setattr(
+                GetTagsForEntry, 'request', lambda self: Response(
+                    200, '[{"id": 21, "label": "new", "slug": "new"}]'))
+        params = TagsCommandParams(entry_id=5)
+        params.cached = True
+        result = TagsCommand(self.config, params).execute()
+        assert result == (True, '21. new')
+
+    @pytest.mark.parametrize('cached', [True, False])
+    def test_remove_preview(self, monkeypatch, mirror, cached):
+        requested = []
+
+        def getlist_request(self):
+            assert not cached, 'requested in cached mode'
+            assert self.params.get(ListParams.SINCE) is None
+            requested.append(self.params[ListParams.TAGS])
+            return Response(200, json.dumps({
+                "page": 1, "pages": 1, "_embedded": {"items": [
+                    {"id": 3, "title": "server", "content": "content",
+                     "url": "url", "is_archived": 0, "is_starred": 0}]}}))
+
+        def confirm(msg):
+            titles = '\n\ttitle 2\n\ttitle' if cached else '\n\tserver'
+            assert msg.endswith(f'\n{titles}\n\nContinue?')
+            return True
+
+        monkeypatch.setattr(GetListEntries, 'request', getlist_request)
+        monkeypatch.setattr(
+                DeleteTagsByLabel, 'request', lambda self: Response(200, '[]'))
+        monkeypatch.setattr(click, 'confirm', confirm)
+
+        params = TagsCommandParams(tags='tag,tag2')
+        params.configure(TagsSubcommand.REMOVE)
+        params.cached = cached
+        assert TagsCommand(self.config, params).execute()[0]
+        assert requested == ([] if cached else ['tag', 'tag2'])
+        # the mirror isn't synchronized, only the deleted tags go
+        assert mirror.get_last_sync() == 1000
+        assert mirror.tag_counts() == []
+        assert mirror.get_entry(2).tags == []
+
+    def test_add_updates_index(self, monkeypatch, mirror):
+        monkeypatch.setattr(
+                AddTagToEntry, 'request',
+                lambda self: Response(200, TestTagIndex.ENTRY))
+        params = TagsCommandParams(entry_id=1, tags='tag2')
+        params.configure(TagsSubcommand.ADD)
+        assert TagsCommand(self.config, params).execute()[0]
+        assert [t['count'] for t in mirror.tag_counts()] == [2, 2]
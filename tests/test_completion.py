@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import subprocess
+import time
+
+import pytest
+
+from wallabag import completion
+from wallabag.api.api import Response
+from wallabag.api.get_list_entries import GetListEntries
+from wallabag.api.get_tags import GetTags
+from wallabag.completion import Completion
+from wallabag.entry import Entry
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def started(monkeypatch):
+    started = []
+    monkeypatch.setattr(
+            subprocess, 'Popen', lambda args, **kwargs: started.append(args))
+    return started
+
+
+def write_cache(cache, age=0, ttl=3600):
+    os.makedirs(os.path.dirname(cache.path), exist_ok=True)
+    with open(cache.path, 'w') as file:
+        json.dump({
+            'time': time.time() - age, 'ttl': ttl,
+            'tags': ['python', 'to:read'],
+            'entries': [[2, 'Second'], [1, 'A: title']]}, file)
+
+
+class TestCompletion():
+
+    def test_candidates(self, started):
+        cache = Completion('/tmp/config.ini')
+        write_cache(cache)
+
+        assert cache.candidates('tags') == ['python', 'to\\:read']
+        assert cache.candidates('entries') == ['2:Second', '1:A\\: title']
+        assert not started
+
+    def test_cache_per_config(self):
+        assert Completion('/tmp/a.ini').path != Completion('/tmp/b.ini').path
+        assert Completion('a.ini').config_path == os.path.abspath('a.ini')
+
+    def test_missing_cache(self, started):
+        cache = Completion('/tmp/config.ini')
+
+        assert cache.candidates('tags') == []
+        assert started[0][-2:] == ['wallabag.completion', '/tmp/config.ini']
+
+    def test_outdated_cache(self, started):
+        cache = Completion('/tmp/config.ini')
+        write_cache(cache, age=100, ttl=10)
+
+        assert cache.candidates('tags') == ['python', 'to\\:read']
+        assert len(started) == 1
+
+        # a refresh is running or failed recently
+        cache.candidates('tags')
+        assert len(started) == 1
+
+        os.utime(cache.lock_path, (0, 0))
+        cache.candidates('tags')
+        assert len(started) == 2
+
+    def test_refresh(self, monkeypatch, tmp_path):
+        config_path = tmp_path / 'config.ini'
+        config_path.write_text('[cache]\ncompletion_ttl = 60\n')
+        monkeypatch.setattr(GetTags, 'request', lambda self: Response(
+                200, '[{"id": 1, "label": "b"}, {"id": 2, "label": "a"}]'))
+
+        def iter_entries(self):
+            for entry_id in range(completion.ENTRIES + 10, 0, -1):
+                yield Entry({'id': entry_id, 'title': f'Title\n {entry_id}'})
+
+        monkeypatch.setattr(GetListEntries, 'iter_entries', iter_entries)
+        cache = Completion(str(config_path))
+        os.makedirs(os.path.dirname(cache.path))
+        open(cache.lock_path, 'w').close()
+        cache.refresh()
+
+        data = cache.load()
+        assert data['ttl'] == 60
+        assert data['tags'] == ['a', 'b']
+        assert len(data['entries']) == completion.ENTRIES
+        assert data['entries'][0] == [completion.ENTRIES + 10, 'Title 510']
+        assert not os.path.exists(cache.lock_path)
+
+    def test_main(self, capsys, started):
+        write_cache(Completion('/tmp/config.ini'))
+
+        assert completion.main('/tmp/config.ini', ['tags']) == 0
+        assert capsys.readouterr().out == 'python\nto\\:read\n'
+        assert completion.main('/tmp/config.ini', ['other']) == 2
@@ -4,7 +4,7 @@ import pathlib
 
 import pytest
 
-from wallabag.config import Configs, Options, Sections
+from wallabag.config import Configs, ConfigsCache, Options, Sections
 
 from xdg.BaseDirectory import xdg_config_home as XDG_CONFIG_HOME
 
@@ -145,3 +145,84 @@ class TestConfigs():
 
         assert encrypted != password
         assert plain == password
+
+    def test_account_digest(self):
+        digest = self.configs.get_account_digest()
+        self.configs.set(Sections.API, Options.USERNAME, 'user')
+        assert self.configs.get_account_digest() != digest
+        assert len(self.configs.get_account_digest()) == 16
+
+    def test_token_sidecar(self):
+        token = {Options.ACCESS_TOKEN: 'abba', Options.EXPIRES: 500.0}
+        self.configs.save_token(token)
+        try:
+            assert self.configs.load_token() == token
+            with open(self.path) as file:
+                assert file.read() == ''
+        finally:
+            os.remove(self.configs.get_token_path())
+
+    def test_refresh_token_encrypted(self):
+        token = {Options.ACCESS_TOKEN: 'abba', Options.EXPIRES: 500.0,
+                 Options.REFRESH_TOKEN: 'refresh'}
+        self.configs.save_token(token)
+        try:
+            with open(self.configs.get_token_path()) as file:
+                assert '"refresh"' not in file.read()
+            assert self.configs.load_token() == token
+        finally:
+            os.remove(self.configs.get_token_path())
+
+    def test_plain_refresh_token_dropped(self):
+        with open(self.configs.get_token_path(), 'w') as file:
+            file.write('{"access_token": "abba", "refresh_token": "r"}')
+        try:
+            assert self.configs.load_token() == {
+                    Options.ACCESS_TOKEN: 'abba',
+                    Options.REFRESH_TOKEN: None}
+        finally:
+            os.remove(self.configs.get_token_path())
+
+    def test_remove_token(self):
+        self.configs.config.read_string("""
+                [token]
+                access_token = abba
+                """)
+        self.configs.save_token({Options.ACCESS_TOKEN: 'abba'})
+        self.configs.remove_token()
+        self.configs.remove_token()
+
+        assert not os.path.exists(self.configs.get_token_path())
+        assert not self.configs.config.has_section(Sections.TOKEN)
+
+    def test_token_from_config(self):
+        self.configs.config.read_string("""
+                [token]
+                access_token = abba
+                expires = 500
+                """)
+        assert self.configs.load_token() == {
+                Options.ACCESS_TOKEN: 'abba', Options.EXPIRES: 500.0}
+
+
+class TestConfigsCache():
+
+    def test_reused_until_changed(self, tmp_path):
+        path = tmp_path / 'config.ini'
+        path.write_text('[api]\nserverurl = url\n')
+        cache = ConfigsCache()
+        config = cache.load(str(path))
+        assert cache.load(str(path)) is config
+        assert config.get(Sections.API, Options.SERVERURL) == 'url'
+
+        path.write_text('[api]\nserverurl = other\n')
+        os.utime(path, ns=(0, 0))
+        config = cache.load(str(path))
+        assert cache.load(str(path)) is config
+        assert config.get(Sections.API, Options.SERVERURL) == 'other'
+
+    def test_relative_path(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        cache = ConfigsCache()
+        assert cache.load('config.ini') is cache.load(
+                str(tmp_path / 'config.ini'))
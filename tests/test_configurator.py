@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import os
 import tempfile
 
@@ -11,7 +12,7 @@ from wallabag.api.api_token import ApiToken
 from wallabag.config import Configs, Options, Sections
 from wallabag.configurator import (
         ClientOption, Configurator, PasswordOption, SecretOption,
-        ServerurlOption, UsernameOption, Validator)
+        ServerurlOption, TokenConfigurator, UsernameOption, Validator)
 
 
 def is_minimum_version(response):
@@ -161,3 +162,84 @@ class TestConfigurator():
         assert len(options) == 2
         assert isinstance(options[0], ClientOption)
         assert isinstance(options[1], SecretOption)
+
+
+class TestTokenConfigurator():
+
+    def setup_method(self, method):
+        TokenConfigurator.clear()
+        self.requests = []
+
+    def teardown_method(self, method):
+        TokenConfigurator.clear()
+
+    def token_request(self, expires_in=3600, fail_refresh=False):
+        def request(api):
+            self.requests.append(api.refresh_token)
+            if api.refresh_token and fail_refresh:
+                raise RequestException(response=Response(
+                    400, '{"error": "invalid_grant"}'))
+            return Response(200, json.dumps({
+                'access_token': f'token{len(self.requests)}',
+                'refresh_token': f'refresh{len(self.requests)}',
+                'expires_in': expires_in}))
+        return request
+
+    def make_configs(self, tmp_path):
+        configs = Configs(str(tmp_path / 'config.ini'))
+        configs.config.read_string("""
+                [oauth2]
+                client = 100
+                secret = 100
+                """)
+        return configs
+
+    def test_token_is_cached(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(ApiToken, 'request', self.token_request())
+        configs = self.make_configs(tmp_path)
+
+        for _ in range(10):
+            assert TokenConfigurator(configs).get_token() == 'token1'
+
+        assert self.requests == [None]
+        assert not os.path.exists(configs.get_path())
+        assert configs.load_token()[Options.REFRESH_TOKEN] == 'refresh1'
+
+    def test_token_loaded_from_sidecar(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(ApiToken, 'request', self.token_request())
+        TokenConfigurator(self.make_configs(tmp_path)).get_token()
+        TokenConfigurator.clear()
+
+        configs = self.make_configs(tmp_path)
+        assert TokenConfigurator(configs).get_token() == 'token1'
+        assert self.requests == [None]
+
+    def test_token_removed_on_configuration(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(ApiToken, 'request', self.token_request())
+        monkeypatch.setattr(UsernameOption, 'setup', lambda self, c: True)
+        configs = self.make_configs(tmp_path)
+        TokenConfigurator(configs).get_token()
+
+        Configurator(configs).start([UsernameOption()])
+
+        assert not os.path.exists(configs.get_token_path())
+        assert TokenConfigurator(configs).get_token() == 'token2'
+        assert self.requests == [None, None]
+
+    def test_refresh_before_expiration(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+                ApiToken, 'request', self.token_request(expires_in=30))
+        configs = self.make_configs(tmp_path)
+
+        assert TokenConfigurator(configs).get_token() == 'token1'
+        assert TokenConfigurator(configs).get_token() == 'token2'
+        assert self.requests == [None, 'refresh1']
+
+    def test_refresh_rejected(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(ApiToken, 'request', self.token_request(
+            expires_in=30, fail_refresh=True))
+        configs = self.make_configs(tmp_path)
+
+        TokenConfigurator(configs).get_token()
+        assert TokenConfigurator(configs).get_token() == 'token3'
+        assert self.requests == [None, 'refresh1', None]
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+import os
+import stat
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from wallabag import wallabag, wclick
+from wallabag.api.api import Response
+from wallabag.api.delete_entry import DeleteEntry
+from wallabag.api.get_entry import GetEntry
+from wallabag.client import Client, find_command, get_option
+from wallabag.config import Configs
+from wallabag.daemon import Daemon
+
+ENTRY = ('{"id": 1, "title": "title", "content": "content", '
+         '"url": "url", "is_archived": 0, "is_starred": 1, "tags": [], '
+         '"created_at": "2020-11-04T11:37:45+0000", "annotations": []}')
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / 'config.ini'
+    path.write_text("""
+[api]
+serverurl = url
+username = user
+password = pass
+[oauth2]
+client = 100
+secret = 100
+""")
+    return str(path)
+
+
+@pytest.fixture
+def get_entry(monkeypatch):
+    monkeypatch.setattr(GetEntry, 'request', lambda self: Response(200, ENTRY))
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = Daemon(str(tmp_path / 'daemon.sock'))
+    thread = threading.Thread(target=daemon.serve)
+    thread.start()
+    while not os.path.exists(daemon.path):
+        time.sleep(0.01)
+    yield daemon
+    Client(daemon.path).stop()
+    thread.join()
+
+
+class TestClient():
+
+    @pytest.mark.parametrize('args, expected', [
+        (['info', '1'], True),
+        (['--config', 'repl', 'list'], True),
+        (['--cached', 'list', '-q', '3'], True),
+        ([], True),
+        (['repl'], False),
+        (['config', '-c'], False),
+        (['open', '1'], False),
+        (['--config=path', 'daemon'], False),
+        (['--debug21', 'list'], False),
+        (['_complete', 'tags'], False)])
+    def test_is_remote(self, args, expected):
+        assert Client.is_remote(args) == expected
+
+    def test_find_command(self):
+        assert find_command(['--config', 'list', 'info', '1']) == 2
+        assert find_command(['--no-spinner', 'list']) == 1
+        assert find_command(['--version']) is None
+
+    def test_get_option(self):
+        assert get_option(['--config', 'path'], '--config') == 'path'
+        assert get_option(['--config=path'], '--config') == 'path'
+        assert get_option(['--cached'], '--config') is None
+
+    def test_no_daemon(self, tmp_path):
+        assert Client(str(tmp_path / 'none.sock')).run(['list']) is None
+        assert not Client(str(tmp_path / 'none.sock')).stop()
+
+    def test_disabled(self, daemon, monkeypatch):
+        monkeypatch.setenv('WALLABAG_NO_DAEMON', '1')
+        assert Client(daemon.path).run(['info', '1']) is None
+
+    def test_run(self, daemon, config_path, get_entry, capsys):
+        client = Client(daemon.path)
+        assert client.run(['--config', config_path, 'info', '1']) == 0
+        assert 'Title: title' in capsys.readouterr().out
+
+        assert client.run(['--config', config_path, 'info']) == 2
+        assert "Missing argument 'ENTRY_ID'" in capsys.readouterr().err
+
+    def test_stop(self, daemon):
+        assert Client(daemon.path).stop()
+        while os.path.exists(daemon.path):
+            time.sleep(0.01)
+
+
+class TestDaemon():
+
+    def test_execute(self, tmp_path, config_path, get_entry):
+        result = Daemon().execute(
+                ['--config', config_path, 'info', '1'], str(tmp_path))
+        assert result['code'] == 0
+        assert 'Title: title' in result['stdout']
+        assert result['stderr'] == ''
+
+    def test_execute_in_cwd(self, tmp_path, config_path, get_entry):
+        cwd = os.getcwd()
+        result = Daemon().execute(
+                ['--config', 'config.ini', 'info', '1'], str(tmp_path))
+        assert os.getcwd() == cwd
+        assert result['code'] == 0
+
+    def test_interactive_fallback(self, monkeypatch, tmp_path, config_path,
+                                  get_entry):
+        def delete(self):
+            raise AssertionError('deleted without confirmation')
+
+        monkeypatch.setattr(DeleteEntry, 'request', delete)
+        result = Daemon().execute(
+                ['--config', config_path, 'delete', '1'], str(tmp_path))
+        assert result == {'fallback': True}
+
+    def test_stale_socket(self, tmp_path):
+        path = tmp_path / 'daemon.sock'
+        path.write_text('')
+        daemon = Daemon(str(path))
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        try:
+            while not daemon.running:
+                time.sleep(0.01)
+            with pytest.raises(ValueError):
+                Daemon(str(path)).serve()
+        finally:
+            Client(str(path)).stop()
+            thread.join()
+
+    def test_private_socket(self, tmp_path):
+        directory = tmp_path / 'wallabag-cli'
+        directory.mkdir(mode=0o755)
+        directory.chmod(0o755)
+        path = directory / 'daemon.sock'
+        daemon = Daemon(str(path))
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        try:
+            while not daemon.running:
+                time.sleep(0.01)
+            assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        finally:
+            Client(str(path)).stop()
+            thread.join()
+
+    def test_foreign_directory(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(os, 'getuid', lambda: os.stat(tmp_path).st_uid + 1)
+        with pytest.raises(ValueError, match='not owned'):
+            Daemon(str(tmp_path / 'daemon.sock')).serve()
+
+
+class TestTerminalSize():
+
+    def test_client_terminal(self, monkeypatch):
+        monkeypatch.setattr(wclick, 'TERMINAL_SIZE', (100, 40))
+        assert wclick.terminal_size().columns == 100
+        assert wclick.terminal_size().lines == 40
+
+    def test_no_terminal(self, monkeypatch):
+        monkeypatch.setattr(wclick, 'TERMINAL_SIZE', ())
+        with pytest.raises(OSError):
+            wclick.terminal_size()
+
+
+def test_inherited_configs(config_path, get_entry):
+    # click_repl runs every line with the Configs of the repl command
+    result = CliRunner().invoke(
+            wallabag.cli, ['--no-spinner', '--config', config_path, 'info',
+                           '1'], obj=Configs(config_path))
+    assert result.exit_code == 0, result.output
+    assert 'title' in result.output
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.entry import Entry
+
+
+def make_item(**fields):
+    item = {
+        "id": 1, "title": "  a\n long   title ", "content": "content",
+        "url": "url", "is_archived": 1, "is_starred": 0}
+    item.update(fields)
+    return item
+
+
+class TestEntry():
+
+    def test_fields(self):
+        entry = Entry(make_item(
+            tags=[{"id": 2, "label": "b"}, {"id": 1, "label": "a"}],
+            updated_at="2020-11-11T05:02:11+0000"))
+
+        assert entry.entry_id == 1
+        assert entry.title == "a long title"
+        assert entry.read
+        assert not entry.starred
+        assert entry.updated_at == "2020-11-11T05:02:11+0000"
+        assert entry.get_tags_string() == "a b"
+        assert entry.annotations == []
+
+    def test_defaults_not_shared(self):
+        first = Entry(make_item())
+        first.tags.append({"id": 1, "label": "a"})
+
+        assert Entry(make_item()).tags == []
+
+    def test_lazy_fields(self):
+        item = make_item(created_at="2020-11-04T11:37:45+0000")
+        entry = Entry(item)
+        item["title"] = "changed"
+
+        assert entry.title == "changed"
+        created_at = entry.created_at
+        assert created_at.day == 4
+        assert created_at.utcoffset().total_seconds() == 0
+        assert entry.created_at is created_at
+        assert Entry(make_item()).created_at is None
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            Entry(make_item()).extra = 1
+
+    def test_create_list(self):
+        entries = Entry.create_list(make_item(id=i) for i in range(3))
+
+        assert not isinstance(entries, list)
+        assert [entry.entry_id for entry in entries] == [0, 1, 2]
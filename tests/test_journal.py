@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.config import Configs
+from wallabag.entry import Entry
+from wallabag.journal import Journal, JournalException
+
+
+def record(operation, **fields):
+    return dict(fields, op=operation, time=1000)
+
+
+class TestJournal():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string("""
+                [api]
+                serverurl = url
+                username = user
+                """)
+
+    def test_append_read(self, tmp_path):
+        journal = Journal(tmp_path / 'journal')
+        assert not journal.pending()
+        assert journal.read() == ([], 0)
+
+        journal.append(Journal.UPDATE, entry_id=1, toggle_read=True)
+        journal.append(Journal.DELETE, entry_id=2)
+        assert journal.pending()
+        records, size = Journal(tmp_path / 'journal').read()
+        assert [(r['op'], r['entry_id']) for r in records] == [
+            ('update', 1), ('delete', 2)]
+        assert size == (tmp_path / 'journal').stat().st_size
+
+    def test_incomplete_line(self, tmp_path):
+        path = tmp_path / 'journal'
+        journal = Journal(path)
+        journal.append(Journal.DELETE, entry_id=1)
+        with open(path, 'a') as file:
+            file.write('garbage\n{"op": "del')
+        records, size = journal.read()
+        assert [r['entry_id'] for r in records] == [1]
+        assert path.read_bytes()[size:] == b'{"op": "del'
+
+    def test_replace_keeps_appended(self, tmp_path):
+        journal = Journal(tmp_path / 'journal')
+        journal.append(Journal.DELETE, entry_id=1)
+        kept = journal.append(Journal.DELETE, entry_id=2)
+        records, size = journal.read()
+        journal.append(Journal.DELETE, entry_id=3)
+
+        journal.replace([kept], size)
+        assert [r['entry_id'] for r in journal.read()[0]] == [2, 3]
+
+    def test_lock(self, tmp_path):
+        journal = Journal(tmp_path / 'journal')
+        with journal.lock():
+            with pytest.raises(JournalException):
+                with Journal(tmp_path / 'journal').lock():
+                    pass
+        with journal.lock():
+            pass
+
+    def test_path_per_account(self):
+        other = Configs("/tmp/config")
+        other.config.read_string("""
+                [api]
+                serverurl = url
+                username = other
+                """)
+        assert Journal.get_path(self.config) != Journal.get_path(other)
+
+    def test_disabled(self):
+        assert Journal.create(self.config)
+        self.config.config.read_string("""
+                [sync]
+                journal = no
+                """)
+        assert Journal.create(self.config) is None
+
+
+class TestCoalesce():
+
+    @pytest.mark.parametrize('toggles, expected', [
+        (1, (None, True)), (2, (None, False)), (3, (None, True))])
+    def test_toggles_cancel_out(self, toggles, expected):
+        changes = Journal.coalesce(
+                [record(Journal.UPDATE, entry_id=1, toggle_read=True)]
+                * toggles)
+        assert len(changes) == 1
+        assert (changes[0].read, changes[0].toggle_read) == expected
+        assert changes[0].is_empty() == (not expected[1])
+
+    def test_toggle_after_set(self):
+        change = Journal.coalesce([
+            record(Journal.UPDATE, entry_id=1, starred=True),
+            record(Journal.UPDATE, entry_id=1, toggle_star=True)])[0]
+        assert (change.starred, change.toggle_star) == (False, False)
+        assert not change.is_empty()
+
+    def test_tags_merged(self):
+        changes = Journal.coalesce([
+            record(Journal.ADD_TAGS, entry_id=1, tags='a,b',
+                   updated_at='first'),
+            record(Journal.ADD_TAGS, entry_id=2, tags='c'),
+            record(Journal.REMOVE_TAG, entry_id=1, tag='b'),
+            record(Journal.ADD_TAGS, entry_id=1, tags='b, d',
+                   updated_at='second'),
+            record(Journal.REMOVE_TAG, entry_id=1, tag='e')])
+        assert [c.entry_id for c in changes] == [1, 2]
+        assert changes[0].tags == ['a', 'b', 'd']
+        assert changes[0].removed_tags == ['e']
+        assert changes[0].updated_at == 'first'
+        assert len(changes[0].records) == 4
+        assert str(changes[0]) == 'update entry 1: +a,b,d -e'
+
+    def test_delete_supersedes(self):
+        change = Journal.coalesce([
+            record(Journal.UPDATE, entry_id=1, title='title'),
+            record(Journal.DELETE, entry_id=1)])[0]
+        assert change.deleted
+        assert str(change) == 'delete entry 1'
+
+    def test_add_and_tag_deletions(self):
+        changes = Journal.coalesce([
+            record(Journal.ADD, url='url', tags='a', read=False),
+            record(Journal.DELETE_TAGS, labels=['x']),
+            record(Journal.ADD, url='url', title='title', tags='b'),
+            record(Journal.DELETE_TAG, tag_id=7),
+            record(Journal.DELETE_TAGS, labels=['y', 'x'])])
+        assert [str(c) for c in changes] == [
+            'add url', 'delete tags x', 'add url', 'delete tag 7',
+            'delete tags y,x']
+        assert changes[0].tags == ['a']
+        assert changes[0].read is False
+        assert changes[2].title == 'title'
+
+    def test_entry_changes_around_tag_deletion(self):
+        changes = Journal.coalesce([
+            record(Journal.ADD_TAGS, entry_id=1, tags='a'),
+            record(Journal.ADD_TAGS, entry_id=2, tags='b'),
+            record(Journal.DELETE_TAGS, labels=['a']),
+            record(Journal.ADD_TAGS, entry_id=1, tags='a')])
+        assert [str(c) for c in changes] == [
+            'update entry 1: +a', 'update entry 2: +b', 'delete tags a',
+            'update entry 1: +a']
+
+    def test_remaining(self):
+        change = Journal.coalesce([
+            record(Journal.UPDATE, entry_id=1, toggle_read=True),
+            record(Journal.ADD_TAGS, entry_id=1, tags='a,b'),
+            record(Journal.REMOVE_TAG, entry_id=1, tag='c')])[0]
+        change.resolve(Entry({'id': 1, 'is_archived': 1,
+                              'updated_at': 'server'}))
+        assert (change.read, change.toggle_read) == (False, False)
+        records = change.remaining()
+        assert [r['op'] for r in records] == [
+            Journal.UPDATE, Journal.REMOVE_TAG, Journal.ADD_TAGS]
+        assert all(r['updated_at'] == 'server' for r in records)
+
+        again = Journal.coalesce(records)[0]
+        assert (again.read, again.toggle_read) == (False, False)
+        assert (again.tags, again.removed_tags) == (['a', 'b'], ['c'])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+from wallabag.config import Configs
+from wallabag.known_urls import KnownUrls
+
+
+class TestKnownUrls():
+
+    def setup_method(self, method):
+        self.config = Configs("/tmp/config")
+        self.config.config.read_string("""
+                [api]
+                serverurl = url
+                username = user
+                """)
+
+    def test_add_get_forget(self, tmp_path):
+        path = tmp_path / 'known'
+        known = KnownUrls(path)
+        assert known.get('http://one') is None
+        known.add('http://one', 1)
+        known.add('http://two', 2)
+        known.save()
+
+        known = KnownUrls(path)
+        assert known.get('http://one') == 1
+        assert known.get('http://two') == 2
+        assert 'http://one' not in path.read_text()
+
+        known.forget(['1'])
+        known.save()
+        assert KnownUrls(path).get('http://one') is None
+        assert KnownUrls(path).get('http://two') == 2
+
+    def test_path_per_account(self):
+        other = Configs("/tmp/config")
+        other.config.read_string("""
+                [api]
+                serverurl = url
+                username = other
+                """)
+        assert KnownUrls.get_path(self.config) != KnownUrls.get_path(other)
+
+    def test_disabled(self):
+        assert KnownUrls.create(self.config)
+        self.config.config.read_string("""
+                [cache]
+                known_urls = no
+                """)
+        assert KnownUrls.create(self.config) is None
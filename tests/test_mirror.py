@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wallabag.config import Configs
+from wallabag.mirror import Mirror, MirrorException
+
+
+def make_config(username):
+    config = Configs("/tmp/config")
+    config.config.read_string(f"""
+            [api]
+            serverurl = url
+            username = {username}
+            """)
+    return config
+
+
+def make_item(entry_id, tags=(), annotations=0, **kwargs):
+    item = {
+        "id": entry_id, "title": f"title {entry_id}",
+        "content": f"<p>content {entry_id}</p>", "url": "url",
+        "is_archived": 0, "is_starred": 0,
+        "created_at": f"2020-11-{entry_id:02d}T11:37:45+0000",
+        "updated_at": f"2020-11-{entry_id:02d}T11:37:45+0000",
+        "tags": [{"id": i, "label": t, "slug": t}
+                 for i, t in enumerate(tags)],
+        "annotations": [{
+            "id": entry_id * 100 + i, "text": "text", "quote": "quote",
+            "updated_at": "2020-10-28T10:50:51+0000"}
+            for i in range(annotations)]
+    }
+    item.update(kwargs)
+    return item
+
+
+class TestMirror():
+
+    def setup_method(self, method):
+        self.mirror = None
+
+    def teardown_method(self, method):
+        if self.mirror:
+            self.mirror.close()
+
+    @pytest.fixture
+    def mirror(self, tmp_path):
+        self.mirror = Mirror(tmp_path / "mirror.sqlite")
+        self.mirror.store_entries([
+            make_item(1, tags=['tag1']),
+            make_item(2, tags=['tag1', 'tag2'], is_archived=1),
+            make_item(3, is_starred=1, annotations=2),
+            make_item(4, title="Python asyncio", content=(
+                "<style>p {color: red}</style><p>Event loops &amp; "
+                "coroutines in <b>python</b></p>")),
+        ])
+        return self.mirror
+
+    def test_get_entry(self, mirror):
+        entry = mirror.get_entry(3)
+        assert entry.entry_id == 3
+        assert entry.content == "<p>content 3</p>"
+        assert entry.starred
+        assert len(entry.annotations) == 2
+
+    def test_get_entry_without_content(self, mirror):
+        entry = mirror.get_entry(3, content=False)
+        assert entry.content == ""
+        assert entry.updated_at == "2020-11-03T11:37:45+0000"
+
+    @pytest.mark.parametrize('entry_id', [10, 'abc', None])
+    def test_get_entry_missing(self, mirror, entry_id):
+        with pytest.raises(MirrorException):
+            mirror.get_entry(entry_id)
+
+    @pytest.mark.parametrize('values', [
+        ({}, [4, 3, 2, 1]),
+        ({'oldest': True}, [1, 2, 3, 4]),
+        ({'read': True}, [2]),
+        ({'read': False}, [4, 3, 1]),
+        ({'starred': True}, [3]),
+        ({'tags': 'tag1'}, [2, 1]),
+        ({'tags': 'tag1,tag2'}, [2]),
+        ({'untagged': True}, [4, 3]),
+        ({'limit': 2}, [4, 3]),
+    ])
+    def test_iter_entries(self, mirror, values):
+        entries = mirror.iter_entries(**values[0])
+        assert [e.entry_id for e in entries] == values[1]
+
+    @pytest.mark.parametrize('values', [
+        ({}, 4), ({'read': True}, 1), ({'starred': False}, 3),
+        ({'tags': 'tag2'}, 1), ({'untagged': True}, 2)])
+    def test_count(self, mirror, values):
+        assert mirror.count(**values[0]) == values[1]
+
+    def test_update_entry(self, mirror):
+        mirror.store_entries([make_item(1, title="new title")])
+        assert mirror.get_entry(1).title == "new title"
+        assert not mirror.get_entry(1).tags
+        assert mirror.count(tags='tag1') == 1
+
+    @pytest.mark.parametrize('values', [
+        ('coroutines', [4]), ('asyncio', [4]), ('red', []),
+        ('tag1', [2, 1]), ('quote', [3]), ('content', [1, 2, 3]),
+        ('python NOT java', [4]), ('"event loops"', [4]), ('event-loop', []),
+        ('"unbalanced', [])])
+    def test_search(self, mirror, values):
+        results = mirror.search(values[0])
+        assert sorted(e.entry_id for e, _ in results) == sorted(values[1])
+
+    def test_search_ranking(self, mirror):
+        mirror.store_entries([
+            make_item(5, content="<p>python python python</p>")])
+        results = mirror.search('python')
+        assert [e.entry_id for e, _ in results] == [4, 5]
+        assert 'python' in results[1][1]
+
+    def test_search_index_updated(self, mirror):
+        mirror.store_entries([make_item(4, title="Rust")])
+        assert not mirror.search('asyncio')
+        assert mirror.search('rust')[0][0].entry_id == 4
+
+    def test_last_sync(self, mirror):
+        assert mirror.get_last_sync() is None
+        mirror.set_last_sync(1000.5)
+        assert mirror.get_last_sync() == 1000
+        mirror.clear()
+        assert mirror.get_last_sync() is None
+        assert mirror.count() == 0
+
+    def test_tag_counts(self, mirror):
+        assert mirror.tag_counts() == [
+            {'id': 0, 'label': 'tag1', 'slug': 'tag1', 'count': 2},
+            {'id': 1, 'label': 'tag2', 'slug': 'tag2', 'count': 1}]
+
+    @pytest.mark.parametrize('values', [
+        ('tag1', [2, 1]), ('tag2', [2]), ('tag1,tag2', [2, 1]),
+        ('tag3', []), (' , ', [])])
+    def test_tagged_entries(self, mirror, values):
+        entries = mirror.tagged_entries(values[0])
+        assert [e.entry_id for e in entries] == values[1]
+
+    @pytest.mark.parametrize('removed', [
+        {'tag_ids': [0]}, {'labels': ['tag1']}])
+    def test_remove_tags(self, mirror, removed):
+        mirror.remove_tags(**removed)
+        assert [t['label'] for t in mirror.tag_counts()] == ['tag2']
+        assert mirror.count(tags='tag1') == 0
+        entry = mirror.get_entry(2)
+        assert [t['label'] for t in entry.tags] == ['tag2']
+        assert entry.content == "<p>content 2</p>"
+        assert not mirror.search('tag1')
+
+    def test_path_per_account(self):
+        assert Mirror.get_path(make_config('user')) != Mirror.get_path(
+                make_config('other'))
+        assert Mirror.get_path(make_config('user')) == Mirror.get_path(
+                make_config('user'))
+
+    def test_broken_mirror_not_updated(self, monkeypatch, tmp_path):
+        path = tmp_path / 'mirror.sqlite'
+        path.write_bytes(b'not a database' * 100)
+        monkeypatch.setattr(Mirror, 'get_path', lambda config: path)
+        config = make_config('user')
+        Mirror.store_if_exists(config, [make_item(1)])
+        Mirror.remove_tags_if_exists(config, labels=['tag1'])
+        assert Mirror.get_if_exists(config, 1) is None
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from wallabag.config import Configs
+from wallabag.entry import Entry
+from wallabag.render_cache import RenderCache, STATS
+
+
+def make_entry(updated_at="2020-11-01T11:37:45+0000", annotations=()):
+    return Entry({
+        "id": 1, "title": "title", "content": "content", "url": "url",
+        "is_archived": 0, "is_starred": 0, "updated_at": updated_at,
+        "annotations": list(annotations)})
+
+
+class TestRenderCache():
+
+    def setup_method(self, method):
+        STATS.reset()
+
+    def test_key_depends_on_entry_and_params(self):
+        key = RenderCache.key(make_entry(), 'TERM', 80)
+
+        assert key == RenderCache.key(make_entry(), 'TERM', 80)
+        assert key != RenderCache.key(make_entry(), 'TERM', 100)
+        assert key != RenderCache.key(
+                make_entry(updated_at="2020-11-02T11:37:45+0000"), 'TERM', 80)
+        assert key != RenderCache.key(
+                make_entry(annotations=[{"id": 1}]), 'TERM', 80)
+
+    def test_key_without_updated_at(self):
+        assert RenderCache.key(make_entry(updated_at=None), 'TERM') is None
+
+    def test_get_put(self, tmp_path):
+        cache = RenderCache(tmp_path)
+
+        assert cache.get('key') is None
+        cache.put('key', 'rendered')
+        assert cache.get('key') == 'rendered'
+        assert (STATS.hits, STATS.misses) == (1, 1)
+
+    def test_evict_least_recently_used(self, tmp_path):
+        cache = RenderCache(tmp_path, max_size=35)
+        for index, key in enumerate(('first', 'second', 'third')):
+            cache.put(key, '0123456789')
+            os.utime(tmp_path / f'{key}.txt', (index, index))
+        os.utime(tmp_path / 'first.txt', (10, 10))
+
+        cache.put('fourth', '0123456789')
+
+        assert cache.get('first') == '0123456789'
+        assert cache.get('second') is None
+        assert cache.get('third') == '0123456789'
+        assert cache.get('fourth') == '0123456789'
+        assert STATS.evicted == 1
+
+    def test_disabled(self, tmp_path):
+        class Config():
+            def getint(self, section, name, fallback=0):
+                return 0
+
+        assert RenderCache.create(Config()) is None
+
+    def test_path_per_account(self):
+        paths = []
+        for username in ('user', 'other'):
+            config = Configs("/tmp/config")
+            config.config.read_string(f"""
+                    [api]
+                    serverurl = url
+                    username = {username}
+                    """)
+            paths.append(RenderCache.create(config).path)
+        assert paths[0] != paths[1]
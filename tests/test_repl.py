@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from wallabag.api.api import Api, Response, RESPONSES
+from wallabag.render_cache import RenderCache
+from wallabag.wallabag import cli
+
+ENTRY = ('{"id": 1, "title": "title", "content": "content", '
+         '"url": "url", "is_archived": 0, "is_starred": 1, "tags": [], '
+         '"created_at": "2020-11-04T11:37:45+0000", "annotations": []}')
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / 'config.ini'
+    path.write_text("""
+[api]
+serverurl = https://server
+username = user
+password = pass
+[oauth2]
+client = 100
+secret = 100
+""")
+    (tmp_path / 'config.token').write_text(json.dumps(
+            {'access_token': 'token', 'expires': 99999999999}))
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def render_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+            RenderCache, 'get_path', lambda config: tmp_path / 'render')
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    sent = []
+
+    def make_request(self, request):
+        sent.append((request.type.name, self.config))
+        return Response(200, ENTRY)
+
+    monkeypatch.setattr(Api, '_Api__make_request', make_request)
+    return sent
+
+
+def test_state_kept_between_commands(config_path, requests):
+    result = CliRunner().invoke(
+            cli, ['--no-spinner', '--config', config_path, 'repl'],
+            input='info 1\nshow 1\ninfo 1\nread 1 -q\ninfo 1\n')
+
+    assert result.exit_code == 0
+    assert result.output.count('Title: title') == 3
+    # info and show share the entry, read changes it
+    assert [verb for verb, config in requests] == ['GET', 'PATCH', 'GET']
+    assert len(set(id(config) for verb, config in requests)) == 1
+    assert not RESPONSES.enabled
+    assert not RESPONSES.responses
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = (
+        'bs4', 'click_repl', 'Crypto', 'delorean', 'humanize', 'lxml',
+        'markdownify', 'packaging', 'prompt_toolkit', 'requests',
+        'tabulate', 'yaspin')
+
+
+def loaded_modules(code):
+    result = subprocess.run(
+            [sys.executable, '-c',
+             f"import sys; {code}; print(' '.join(sys.modules))"],
+            env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+            capture_output=True, text=True, check=True)
+    return {name.split('.')[0] for name in result.stdout.split()}
+
+
+def test_cli_import_is_lazy():
+    modules = loaded_modules('import wallabag.wallabag')
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def test_help_does_not_load_commands():
+    modules = loaded_modules(
+            "from click.testing import CliRunner; "
+            "from wallabag.wallabag import cli; "
+            "CliRunner().invoke(cli, ['--help'])")
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def test_client_import_is_minimal():
+    modules = loaded_modules('import wallabag.client')
+    assert not modules.intersection(HEAVY_MODULES + ('click', 'colorama'))
+
+
+def test_completion_import_is_minimal():
+    modules = loaded_modules('import wallabag.completion')
+    assert not modules.intersection(HEAVY_MODULES + ('click', 'colorama'))
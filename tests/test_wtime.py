@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import time
+
+import pytest
+
+from wallabag import wtime
+
+UTC = datetime.timezone.utc
+
+
+@pytest.fixture
+def utc(monkeypatch):
+    monkeypatch.setenv('TZ', 'UTC')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class TestParse():
+
+    @pytest.mark.parametrize('value', [
+        '2020-11-04T11:37:45+0000',
+        '2020-11-04T11:37:45+00:00',
+        '2020-11-04T11:37:45.000000+0000',
+        '2020-11-04T11:37:45',
+        '2020-11-04T12:37:45+0100'])
+    def test_formats(self, value):
+        assert wtime.parse(value) == datetime.datetime(
+                2020, 11, 4, 11, 37, 45, tzinfo=UTC)
+
+    def test_aware(self):
+        assert wtime.parse('2020-11-04T11:37:45').tzinfo is UTC
+
+    def test_cached(self):
+        value = '2020-10-28T10:50:51+0000'
+        assert wtime.parse(value) is wtime.parse(value)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            wtime.parse('yesterday')
+
+
+class TestFormat():
+
+    @pytest.mark.parametrize('value, expected', [
+        ('2020-11-04T11:37:45+0000', 'Nov 4, 2020, 11:37:45 AM'),
+        ('2020-11-04T00:05:00+0000', 'Nov 4, 2020, 12:05:00 AM'),
+        ('2020-12-31T23:59:59+0000', 'Dec 31, 2020, 11:59:59 PM')])
+    def test_format_datetime(self, utc, value, expected):
+        assert wtime.format_datetime(wtime.parse(value)) == expected
+
+    def test_local_timezone(self, monkeypatch):
+        monkeypatch.setenv('TZ', 'Europe/Berlin')
+        time.tzset()
+        try:
+            assert wtime.format_datetime(wtime.parse(
+                    '2020-11-04T11:37:45+0000')) == 'Nov 4, 2020, 12:37:45 PM'
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+
+class TestNaturaltime():
+    now = datetime.datetime(2020, 11, 4, 12, 0, 0, tzinfo=UTC)
+
+    @pytest.mark.parametrize('seconds, expected', [
+        (0, 'now'),
+        (1, 'a second ago'),
+        (30, '30 seconds ago'),
+        (60, 'a minute ago'),
+        (5 * 60 + 10, '5 minutes ago'),
+        (2 * 60 * 60, '2 hours ago'),
+        (24 * 60 * 60, 'a day ago'),
+        (10 * 24 * 60 * 60, '10 days ago'),
+        (65 * 24 * 60 * 60, '2 months ago'),
+        (400 * 24 * 60 * 60, 'a year ago'),
+        (-3 * 60 * 60, '3 hours from now')])
+    def test_naturaltime(self, seconds, expected):
+        date = self.now - datetime.timedelta(seconds=seconds)
+        assert wtime.naturaltime(date, self.now) == expected